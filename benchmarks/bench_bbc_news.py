@@ -0,0 +1,83 @@
+"""Sequential vs concurrent article fetching for ``fetch_latest_news``.
+
+Serves recorded BBC article pages (``--fixtures DIR`` of ``*.html`` files,
+or generated pages when omitted) from the stand-in server with a simulated
+per-request latency. Run with ``python -m benchmarks.bench_bbc_news``.
+"""
+import os
+
+os.environ.setdefault("HTTP_CACHE_ENABLED", "0")
+
+import argparse
+import time
+from pathlib import Path
+
+from benchmarks.standin_server import StandinRoute, StandinServer
+from src.tools.bbc_news import DEADLINE, _article_content, _fetch_news_results, split_failures
+from src.tools.http import http_client
+
+
+def synthetic_article(index: int, paragraphs: int = 40) -> bytes:
+    body = "".join(
+        f"<p>Paragraph {i} of article {index}: lorem ipsum dolor sit amet.</p>"
+        for i in range(paragraphs)
+    )
+    return (
+        f"<html><head><title>Article {index}</title></head>"
+        f"<body><nav><a href='/'>Home</a></nav><article>{body}</article></body></html>"
+    ).encode()
+
+
+def load_fixtures(directory: Path | None, count: int) -> list[bytes]:
+    if directory is None:
+        return [synthetic_article(i) for i in range(count)]
+    pages = [path.read_bytes() for path in sorted(directory.glob("*.html"))]
+    if not pages:
+        raise SystemExit(f"No *.html fixtures found in {directory}")
+    return [pages[i % len(pages)] for i in range(count)]
+
+
+def sequential(articles: list[dict[str, str]]) -> int:
+    fetched = 0
+    for news_dict in articles:
+        response = http_client.get(news_dict["news_link"])
+        _article_content(news_dict["news_link"], response.content)
+        fetched += 1
+    return fetched
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--articles", type=int, default=30)
+    parser.add_argument("--latency", type=float, default=0.2)
+    parser.add_argument("--deadline", type=float, default=20.0)
+    parser.add_argument("--fixtures", type=Path, default=None)
+    args = parser.parse_args()
+
+    pages = load_fixtures(args.fixtures, args.articles)
+    routes = {f"/news/articles/{i}": StandinRoute(page) for i, page in enumerate(pages)}
+    with StandinServer(routes, latency=args.latency) as server:
+        articles = [
+            {"title": f"Article {i}", "news_link": server.url(path)}
+            for i, path in enumerate(routes)
+        ]
+
+        start = time.perf_counter()
+        fetched = sequential(articles)
+        sequential_seconds = time.perf_counter() - start
+        print(f"sequential:  {fetched} articles in {sequential_seconds:.2f}s")
+
+        start = time.perf_counter()
+        results, failures = split_failures(_fetch_news_results(articles, deadline=args.deadline))
+        concurrent_seconds = time.perf_counter() - start
+        print(
+            f"concurrent:  {len(results)} articles in {concurrent_seconds:.2f}s "
+            f"({failures.count(DEADLINE)} dropped at the deadline, "
+            f"{len(failures) - failures.count(DEADLINE)} failed)"
+        )
+        print(f"speedup:     {sequential_seconds / concurrent_seconds:.1f}x")
+    http_client.close()
+
+
+if __name__ == "__main__":
+    main()
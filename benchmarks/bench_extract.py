@@ -0,0 +1,80 @@
+"""Micro-benchmark for HTML-to-text extraction.
+
+Runs each engine over a corpus of saved pages (``--corpus DIR`` of
+``*.html`` files, e.g. BBC/Yahoo/HF pages saved from a browser, or generated
+pages when omitted) and reports pages/sec and peak Python heap usage.
+Run with ``python -m benchmarks.bench_extract``.
+"""
+import argparse
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable
+
+from bs4 import BeautifulSoup
+
+from src.tools.extract import LXML_AVAILABLE, SITE_RULES, extract_text
+
+
+def synthetic_page(index: int, paragraphs: int = 120) -> bytes:
+    scripts = "<script>" + "var x = 1;" * 2000 + "</script>"
+    nav = "<nav>" + "".join(f"<p><a href='/{i}'>Link {i}</a></p>" for i in range(50)) + "</nav>"
+    body = "".join(
+        f"<p>Paragraph {i} of page {index} with <a href='#'>a link</a> and "
+        f"<b>some bold text</b> to make the tree realistic.</p>"
+        for i in range(paragraphs)
+    )
+    return (
+        f"<html><head><title>Page {index}</title>{scripts}</head><body>{nav}"
+        f"<main><article>{body}</article></main><footer><p>Footer</p></footer></body></html>"
+    ).encode()
+
+
+def load_corpus(directory: Path | None, count: int) -> list[bytes]:
+    if directory is None:
+        return [synthetic_page(i) for i in range(count)]
+    pages = [path.read_bytes() for path in sorted(directory.glob("**/*.html"))]
+    if not pages:
+        raise SystemExit(f"No *.html pages found in {directory}")
+    return pages
+
+
+def baseline(content: bytes) -> str:
+    soup = BeautifulSoup(content, "html.parser")
+    return "\n".join([d.get_text() for d in soup.find_all("p")])
+
+
+def measure(name: str, extract: Callable[[bytes], str], pages: list[bytes], repeat: int) -> None:
+    tracemalloc.start()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for page in pages:
+            extract(page)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    pages_per_second = len(pages) * repeat / elapsed
+    print(f"{name:<28}{pages_per_second:>12.1f}{peak / 1024 / 1024:>16.2f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--corpus", type=Path, default=None)
+    parser.add_argument("--pages", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    pages = load_corpus(args.corpus, args.pages)
+    rules = SITE_RULES["bbc.com"]
+    print(f"{len(pages)} pages, {sum(map(len, pages)) / 1024 / 1024:.1f} MB")
+    print(f"{'engine':<28}{'pages/sec':>12}{'peak heap (MB)':>16}")
+    measure("bs4 html.parser (baseline)", baseline, pages, args.repeat)
+    measure("bs4 fallback + site rules", lambda page: extract_text(page, rules, "bs4"), pages, args.repeat)
+    if LXML_AVAILABLE:
+        measure("lxml streaming + site rules", lambda page: extract_text(page, rules, "lxml"), pages, args.repeat)
+    else:
+        print("lxml is not installed; skipping the streaming engine")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""Compare a fresh connection per request against the shared pooled client.
+
+Run with ``python -m benchmarks.bench_http_pool``.
+"""
+import argparse
+import asyncio
+import time
+
+import httpx
+
+from benchmarks.standin_server import StandinRoute, StandinServer
+from src.tools.constants import HEADERS
+from src.tools.http import HttpClient
+
+
+def _unpooled(urls: list[str]) -> None:
+    for url in urls:
+        httpx.get(url, headers=HEADERS).raise_for_status()
+
+
+def _pooled(client: HttpClient, urls: list[str]) -> None:
+    for url in urls:
+        client.get(url).raise_for_status()
+
+
+def _pooled_concurrent(client: HttpClient, urls: list[str]) -> None:
+    async def fetch_all() -> None:
+        await asyncio.gather(*[client.aget(url) for url in urls])
+
+    client.run(fetch_all())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.005)
+    args = parser.parse_args()
+
+    body = b"<html><body>" + b"<p>paragraph</p>" * 200 + b"</body></html>"
+    routes = {f"/articles/{i}": StandinRoute(body) for i in range(args.requests)}
+    with StandinServer(routes, latency=args.latency) as server:
+        urls = [server.url(path) for path in routes]
+        client = HttpClient(host_limits={}, default_host_limit=16)
+        runs = [
+            ("fresh connection per request", lambda: _unpooled(urls)),
+            ("shared pool, sequential", lambda: _pooled(client, urls)),
+            ("shared pool, concurrent", lambda: _pooled_concurrent(client, urls)),
+        ]
+        print(f"{'mode':<32}{'seconds':>10}{'req/s':>10}{'connections':>14}")
+        for name, run in runs:
+            server.reset_counters()
+            start = time.perf_counter()
+            run()
+            elapsed = time.perf_counter() - start
+            print(
+                f"{name:<32}{elapsed:>10.3f}{len(urls) / elapsed:>10.1f}"
+                f"{server.connections:>14}"
+            )
+        client.close()
+
+
+if __name__ == "__main__":
+    main()
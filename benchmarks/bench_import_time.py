@@ -0,0 +1,91 @@
+"""Import-time report for the agent graph.
+
+Imports ``src.agent.graph`` in a fresh interpreter under ``python -X
+importtime`` and reports the total import time, the slowest modules, and
+whether any of the heavy tool dependencies (which should only load when a
+tool first runs) were imported. Exits non-zero when a heavy dependency is
+imported eagerly or the total exceeds ``--budget-ms``, so it can gate CI.
+Run with ``python -m benchmarks.bench_import_time``.
+"""
+import argparse
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+# Loaded on first use of the tools, never by importing the graph.
+DEFERRED_MODULES = (
+    "yfinance",
+    "pandas",
+    "numpy",
+    "fitz",
+    "pymupdf",
+    "bbc",
+    "bs4",
+    "lxml.etree",
+    "langchain_tavily",
+    "aiohttp",
+)
+
+
+def import_times(module: str) -> dict[str, tuple[int, int]]:
+    """``{module: (self_us, cumulative_us)}`` for one import of ``module`` in a fresh process."""
+    env = {
+        **os.environ,
+        "TAVILY_API_KEY": os.environ.get("TAVILY_API_KEY", "benchmark"),
+        "OPENAI_API_KEY": os.environ.get("OPENAI_API_KEY", "benchmark"),
+        "CACHE_WARMER": "0",
+        "WARM_MODEL_REGISTRY": "",
+    }
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=PROJECT_ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise SystemExit(f"Importing {module} failed:\n{result.stderr[-2000:]}")
+    times: dict[str, tuple[int, int]] = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_us, cumulative_us, name = (part.strip() for part in line[len("import time:"):].split("|"))
+        if self_us.isdigit():
+            times[name] = (int(self_us), int(cumulative_us))
+    return times
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--module", default="src.agent.graph")
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--budget-ms", type=float, default=None)
+    args = parser.parse_args()
+
+    times = import_times(args.module)
+    total_ms = times[args.module][1] / 1000
+    print(f"import {args.module}: {total_ms:.0f} ms, {len(times)} modules\n")
+    print(f"{'module':<60}{'self ms':>10}{'cumulative ms':>15}")
+    slowest = sorted(times.items(), key=lambda item: item[1][0], reverse=True)[: args.top]
+    for name, (self_us, cumulative_us) in slowest:
+        print(f"{name:<60}{self_us / 1000:>10.1f}{cumulative_us / 1000:>15.1f}")
+
+    eager = [name for name in DEFERRED_MODULES if name in times]
+    print()
+    failed = False
+    if eager:
+        failed = True
+        print(f"FAIL: imported eagerly: {', '.join(eager)}")
+    else:
+        print("OK: no heavy tool dependency imported")
+    if args.budget_ms is not None and total_ms > args.budget_ms:
+        failed = True
+        print(f"FAIL: {total_ms:.0f} ms exceeds the {args.budget_ms:.0f} ms budget")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""Offline benchmark for the price-history analytics tool.
+
+Serves synthetic daily OHLCV data (geometric Brownian motion, one stream per
+symbol) through a fake downloader, so the store and the analytics run
+without network access. Reports the latency of a cold call (full download),
+a warm call (served from the local cache) and an incremental call (one new
+trading day), plus the per-symbol loop the LLM would otherwise drive.
+Run with ``python -m benchmarks.bench_price_history``.
+"""
+import argparse
+import tempfile
+import time
+import zlib
+from datetime import date, timedelta
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.tools import price_history
+from src.tools.price_history import PriceHistoryStore, compute_metrics
+
+
+class SyntheticMarket:
+    """Deterministic synthetic price history for any symbol, up to ``today``."""
+
+    def __init__(self, today: date, years: int = 6):
+        self.today = today
+        self.dates = pd.bdate_range(today - timedelta(days=365 * years), today)
+        self.calls = 0
+        self.rows_served = 0
+
+    def history(self, symbol: str) -> pd.DataFrame:
+        rng = np.random.default_rng(zlib.crc32(symbol.encode()))
+        drift, vol = rng.uniform(-0.0002, 0.001), rng.uniform(0.01, 0.03)
+        close = 100 * np.exp(np.cumsum(rng.normal(drift, vol, len(self.dates))))
+        spread = close * rng.uniform(0, 0.01, len(self.dates))
+        return pd.DataFrame(
+            {
+                "open": close - spread / 2,
+                "high": close + spread,
+                "low": close - spread,
+                "close": close,
+                "volume": rng.integers(1_000_000, 50_000_000, len(self.dates)).astype(float),
+            },
+            index=self.dates,
+        )
+
+    def download(self, symbols: list[str], start: date) -> dict[str, pd.DataFrame]:
+        self.calls += 1
+        frames = {}
+        for symbol in symbols:
+            history = self.history(symbol)
+            history = history[(history.index >= pd.Timestamp(start)) & (history.index <= pd.Timestamp(self.today))]
+            self.rows_served += len(history)
+            frames[symbol] = history
+        return frames
+
+
+def timed(label: str, market: SyntheticMarket, call) -> dict:
+    calls, rows = market.calls, market.rows_served
+    start = time.perf_counter()
+    result = call()
+    elapsed = time.perf_counter() - start
+    print(
+        f"{label:<34}{elapsed * 1000:>10.1f}{market.calls - calls:>12}{market.rows_served - rows:>12}"
+    )
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--symbols", type=int, default=20)
+    parser.add_argument("--period", default="1y")
+    args = parser.parse_args()
+
+    symbols = [f"SYM{i:02d}" for i in range(args.symbols)]
+    today = date.today()
+    market = SyntheticMarket(today - timedelta(days=1))
+    with tempfile.TemporaryDirectory() as directory:
+        store = PriceHistoryStore(Path(directory), downloader=market.download)
+        price_history.price_history_store = store
+        tool_args = {"symbols": symbols, "period": args.period}
+
+        print(f"{len(symbols)} symbols, period {args.period}")
+        print(f"{'call':<34}{'ms':>10}{'downloads':>12}{'rows':>12}")
+        timed("cold (batch download)", market, lambda: price_history.analyze_price_history.invoke(tool_args))
+        timed("warm (local cache)", market, lambda: price_history.analyze_price_history.invoke(tool_args))
+
+        market.today = today
+        market.dates = pd.bdate_range(market.dates[0], today)
+        for path in Path(directory).glob("*.npz"):
+            # Age the cache so the next call refreshes it.
+            with np.load(path) as stored:
+                arrays = dict(stored)
+            arrays["updated_at"] = np.float64(0)
+            np.savez(path, **arrays)
+        result = timed("incremental (new trading day)", market, lambda: price_history.analyze_price_history.invoke(tool_args))
+
+        def per_symbol() -> None:
+            for symbol in symbols:
+                start = price_history.period_start(args.period)
+                history, _ = store.closes([symbol], start - timedelta(days=price_history.SMA_LOOKBACK_DAYS))
+                compute_metrics(history[history.index >= pd.Timestamp(start)], history)
+
+        timed("one call per symbol (warm)", market, per_symbol)
+        print()
+        print(result["metrics"])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""Offline benchmark of the deep-research section loop: two-step versus single-call iterations.
+
+Runs the section subgraph against a simulated chat model (fixed latency plus
+a per-token cost) and the fake search backend, with the same number of
+tool rounds in both modes, and reports wall time, model calls and input
+tokens per section.
+Run with ``python -m benchmarks.bench_research_loop``.
+"""
+import argparse
+import asyncio
+import os
+import time
+
+os.environ.setdefault("TOOL_RESULT_CACHE", "off")
+
+from benchmarks.fake_chat_model import SimulatedChatModel  # noqa: E402
+from benchmarks.fake_search import FakeSearchBackend  # noqa: E402
+from src.agent.config import Configuration  # noqa: E402
+from src.agent.deep_research.graph import deep_researcher_build  # noqa: E402
+from src.agent.models import model_registry  # noqa: E402
+from src.tools.web_search import set_search_backend  # noqa: E402
+
+SECTION = {
+    "index": 1,
+    "name": "Market overview",
+    "description": "How the market for the product has developed.",
+    "research_objectives": ["Size of the market", "Main competitors"],
+    "content_to_use": [],
+}
+
+
+async def run_section(graph, research_loop: str) -> float:
+    start = time.perf_counter()
+    await graph.ainvoke(
+        {
+            "report_topic": "Example topic",
+            "report_high_level_objectives": "Example objectives",
+            "section": SECTION,
+        },
+        {"configurable": {"research_loop": research_loop}, "recursion_limit": 100},
+    )
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sections", type=int, default=3)
+    parser.add_argument("--tool-rounds", type=int, default=3)
+    parser.add_argument("--latency", type=float, default=0.4, help="seconds per model call")
+    args = parser.parse_args()
+
+    configuration = Configuration()
+    model = SimulatedChatModel(latency=args.latency, tool_rounds=args.tool_rounds)
+    model_registry._clients[model_registry.client_key(configuration.model, configuration.model_provider)] = model
+    set_search_backend(FakeSearchBackend(latency=0.3))
+    graph = deep_researcher_build.compile()
+
+    print(f"{args.sections} sections, {args.tool_rounds} tool rounds each, {args.latency:.2f}s per model call")
+    print(f"{'research_loop':<16}{'s/section':>12}{'calls/section':>16}{'input tokens/section':>24}")
+    results = {}
+    for research_loop in ("two_step", "single_call"):
+        elapsed = 0.0
+        calls = tokens = 0
+        for _ in range(args.sections):
+            model.reset()
+            elapsed += asyncio.run(run_section(graph, research_loop))
+            calls += model.stats["calls"]
+            tokens += model.stats["input_tokens"]
+        results[research_loop] = elapsed / args.sections
+        print(
+            f"{research_loop:<16}{elapsed / args.sections:>12.2f}"
+            f"{calls / args.sections:>16.1f}{tokens / args.sections:>24,.0f}"
+        )
+    print(f"single_call saves {1 - results['single_call'] / results['two_step']:.0%} of the section latency")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Benchmark of per-turn context trimming on long threads.
+
+Builds synthetic conversations of 1k+ messages (user questions, tool calls,
+tool outputs of 2-40 KB, answers) and replays the last turns the way
+``call_model`` does: append the new messages, then trim the thread to the
+model's budget. Compares ``trim_messages`` with ``count_tokens_approximately``
+against ``trim_to_budget`` with the per-message token cache, and checks
+that both keep the same messages.
+Run with ``python -m benchmarks.bench_trim_messages``.
+"""
+import argparse
+import random
+import time
+import uuid
+
+from langchain_core.messages import AIMessage, AnyMessage, HumanMessage, ToolMessage
+from langchain_core.messages.utils import count_tokens_approximately, trim_messages
+
+from src.agent.token_budget import MessageTokenCache, trim_to_budget
+
+
+def make_turn(rng: random.Random, turn: int) -> list[AnyMessage]:
+    call_id = f"call_{uuid.uuid4().hex[:12]}"
+    tool_output = " ".join(f"word{rng.randrange(10_000)}" for _ in range(rng.randrange(300, 5000)))
+    return [
+        HumanMessage(content=f"Question {turn}: what changed in the market today?", id=str(uuid.uuid4())),
+        AIMessage(
+            content="",
+            tool_calls=[{"name": "tavily_search", "args": {"query": f"market news {turn}"}, "id": call_id}],
+            id=str(uuid.uuid4()),
+        ),
+        ToolMessage(content=tool_output, tool_call_id=call_id, name="tavily_search", id=str(uuid.uuid4())),
+        AIMessage(content=f"Answer {turn}: " + "lorem ipsum " * rng.randrange(20, 200), id=str(uuid.uuid4())),
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--messages", type=int, nargs="+", default=[1_000, 4_000])
+    parser.add_argument("--turns", type=int, default=20, help="turns replayed and timed")
+    parser.add_argument("--max-tokens", type=int, default=127_000)
+    args = parser.parse_args()
+
+    print(f"{'messages':>10}{'trim_messages ms/turn':>24}{'trim_to_budget ms/turn':>25}{'kept':>8}")
+    for size in args.messages:
+        rng = random.Random(size)
+        thread: list[AnyMessage] = []
+        turn = 0
+        while len(thread) < size:
+            thread.extend(make_turn(rng, turn))
+            turn += 1
+        cache = MessageTokenCache()
+        # Earlier turns have counted the history already.
+        trim_to_budget(thread, max_tokens=args.max_tokens, cache=cache)
+
+        baseline = cached = 0.0
+        kept = 0
+        for _ in range(args.turns):
+            thread.extend(make_turn(rng, turn))
+            turn += 1
+            start = time.perf_counter()
+            expected = trim_messages(
+                thread,
+                strategy="last",
+                token_counter=count_tokens_approximately,
+                max_tokens=args.max_tokens,
+                start_on="human",
+                include_system=True,
+            )
+            baseline += time.perf_counter() - start
+            start = time.perf_counter()
+            result = trim_to_budget(thread, max_tokens=args.max_tokens, cache=cache)
+            cached += time.perf_counter() - start
+            if [m.id for m in result] != [m.id for m in expected]:
+                raise SystemExit(f"FAIL: trim_to_budget kept different messages at {len(thread)} messages")
+            kept = len(result)
+        print(
+            f"{len(thread):>10}{baseline / args.turns * 1000:>24.2f}{cached / args.turns * 1000:>25.2f}{kept:>8}"
+        )
+
+
+if __name__ == "__main__":
+    main()
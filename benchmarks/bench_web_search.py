@@ -0,0 +1,45 @@
+"""Compare one web search per query against the batched multi_web_search tool.
+
+Uses ``FakeSearchBackend`` (fixed latency per search), so no API key or
+network access is needed. Run with ``python -m benchmarks.bench_web_search``.
+"""
+import argparse
+import asyncio
+import time
+
+from benchmarks.fake_search import FakeSearchBackend
+from src.tools import web_search
+from src.tools.web_search import set_search_backend
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--queries", type=int, default=6)
+    parser.add_argument("--latency", type=float, default=0.3)
+    args = parser.parse_args()
+
+    queries = [f"research objective {i}" for i in range(args.queries)]
+    backend = FakeSearchBackend(latency=args.latency)
+
+    async def one_by_one() -> int:
+        results = 0
+        for query in queries:
+            results += len(await backend.search(query, 3))
+        return results
+
+    print(f"{'mode':<30}{'seconds':>10}{'searches':>10}{'results':>10}")
+    start = time.perf_counter()
+    results = asyncio.run(one_by_one())
+    print(f"{'one search per query':<30}{time.perf_counter() - start:>10.2f}{backend.calls:>10}{results:>10}")
+
+    set_search_backend(backend)
+    for name in ("multi_web_search (cold)", "multi_web_search (cached)"):
+        calls = backend.calls
+        start = time.perf_counter()
+        output = web_search.multi_web_search.invoke({"queries": queries})
+        elapsed = time.perf_counter() - start
+        print(f"{name:<30}{elapsed:>10.2f}{backend.calls - calls:>10}{len(output['results']):>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+import asyncio
+import uuid
+from typing import Any, Optional
+
+from langchain_core.callbacks import AsyncCallbackManagerForLLMRun
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.messages.utils import count_tokens_approximately
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_core.runnables import RunnableLambda
+from pydantic import Field
+
+from src.agent.deep_research.pydantics import CompletedSection, ResearchNotes, Source
+
+
+class SimulatedChatModel(BaseChatModel):
+    """Local stand-in for a chat model: canned replies after a latency that
+    grows with the prompt, like a hosted model's time to first token.
+
+    With tools bound it asks for a ``multi_web_search`` on each of its first
+    ``tool_rounds`` calls and then stops; structured output returns a valid
+    instance of the requested schema. ``stats`` (shared by the copies made
+    by ``bind_tools``) counts calls and input tokens.
+
+    Example::
+
+        model_registry._clients[model_registry.client_key(model, provider)] = SimulatedChatModel()
+    """
+
+    latency: float = 0.4
+    seconds_per_1k_input_tokens: float = 0.02
+    tool_rounds: int = 3
+    with_tools: bool = False
+    stats: dict[str, int] = Field(default_factory=lambda: {"calls": 0, "input_tokens": 0, "tool_rounds": 0})
+
+    @property
+    def _llm_type(self) -> str:
+        return "simulated"
+
+    def reset(self) -> None:
+        self.stats.update(calls=0, input_tokens=0, tool_rounds=0)
+
+    async def _respond(self, messages: list[BaseMessage]) -> int:
+        tokens = count_tokens_approximately(messages)
+        self.stats["calls"] += 1
+        self.stats["input_tokens"] += tokens
+        await asyncio.sleep(self.latency + tokens / 1000 * self.seconds_per_1k_input_tokens)
+        return tokens
+
+    async def _agenerate(
+        self,
+        messages: list[BaseMessage],
+        stop: Optional[list[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        tokens = await self._respond(messages)
+        tool_calls = []
+        if self.with_tools and self.stats["tool_rounds"] < self.tool_rounds:
+            self.stats["tool_rounds"] += 1
+            round_ = self.stats["tool_rounds"]
+            tool_calls = [{
+                "name": "multi_web_search",
+                "args": {"queries": [f"research question {round_}a", f"research question {round_}b"]},
+                "id": f"call_{uuid.uuid4().hex[:12]}",
+            }]
+        message = AIMessage(
+            content="Reflection: the evidence so far supports the hypothesis; next, check the counter-arguments. " * 4,
+            tool_calls=tool_calls,
+            usage_metadata={"input_tokens": tokens, "output_tokens": 120, "total_tokens": tokens + 120},
+        )
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _generate(self, messages: list[BaseMessage], stop: Optional[list[str]] = None, run_manager: Any = None, **kwargs: Any) -> ChatResult:
+        raise NotImplementedError("SimulatedChatModel is async only")
+
+    def bind_tools(self, tools: Any, **kwargs: Any) -> "SimulatedChatModel":
+        return self.model_copy(update={"with_tools": True})
+
+    def with_structured_output(self, schema: Any, **kwargs: Any) -> RunnableLambda:
+        async def respond(messages: list[Any]) -> Any:
+            await self._respond([
+                AIMessage(content=m["content"]) if isinstance(m, dict) else m for m in messages
+            ])
+            source = Source(title="Example page", source_name="example.com", url="https://example.com/page/1")
+            if schema is ResearchNotes:
+                return ResearchNotes(
+                    notes=[f"Finding {i}: a figure and the date it was reported." for i in range(3)],
+                    sources=[source],
+                )
+            if schema is CompletedSection:
+                return CompletedSection(section_index=1, section_title="Section", content="Text.", sources=[source])
+            raise ValueError(f"Unsupported schema {schema}")
+
+        return RunnableLambda(respond)
@@ -0,0 +1,38 @@
+import asyncio
+import hashlib
+from typing import Any
+
+
+class FakeSearchBackend:
+    """Local stand-in for Tavily: deterministic results per query after a fixed latency.
+
+    Each query returns ``results_per_query`` pages drawn from a shared pool of
+    ``pool_size`` URLs (with tracking parameters and ``www.`` variations), so
+    related queries overlap the way real search results do.
+
+    Example::
+
+        set_search_backend(FakeSearchBackend(latency=0.3))
+    """
+
+    def __init__(self, latency: float = 0.3, pool_size: int = 12, results_per_query: int = 3):
+        self.latency = latency
+        self.pool_size = pool_size
+        self.results_per_query = results_per_query
+        self.calls = 0
+
+    async def search(self, query: str, max_results: int) -> list[dict[str, Any]]:
+        self.calls += 1
+        await asyncio.sleep(self.latency)
+        seed = int(hashlib.sha256(query.lower().encode()).hexdigest(), 16)
+        results = []
+        for i in range(min(max_results, self.results_per_query)):
+            page = (seed // (self.pool_size ** i)) % self.pool_size
+            prefix = "www." if (seed >> i) & 1 else ""
+            results.append({
+                "title": f"Page {page}",
+                "url": f"https://{prefix}example.com/page/{page}/?utm_source=search{i}",
+                "content": f"Content of page {page} matching '{query}'.",
+                "score": round(1 - i * 0.1, 2),
+            })
+        return results
@@ -0,0 +1,116 @@
+import threading
+import time
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Optional, Union
+
+
+@dataclass
+class StandinRoute:
+    body: bytes
+    status: int = 200
+    content_type: str = "text/html; charset=utf-8"
+    headers: dict[str, str] = field(default_factory=dict)
+
+
+RouteHandler = Callable[[BaseHTTPRequestHandler], StandinRoute]
+
+
+class _QuietServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address) -> None:
+        # Clients abandoning requests (e.g. at a tool deadline) are expected.
+        pass
+
+
+class StandinServer:
+    """In-process HTTP/1.1 keep-alive server standing in for BBC/Yahoo/HF/arXiv.
+
+    Counts accepted TCP connections and requests so that pooling behaviour
+    can be measured offline, and can add a fixed per-request latency to
+    mimic a remote host.
+
+    Example::
+
+        with StandinServer({"/page": StandinRoute(b"<p>hi</p>")}) as server:
+            http_client.get(server.url("/page"))
+            print(server.connections, server.requests)
+    """
+
+    def __init__(
+        self,
+        routes: Optional[dict[str, Union[StandinRoute, RouteHandler]]] = None,
+        latency: float = 0.0,
+    ):
+        self.routes: dict[str, Union[StandinRoute, RouteHandler]] = dict(routes or {})
+        self.latency = latency
+        self.connections = 0
+        self.requests = 0
+        self._lock = threading.Lock()
+        self._server: Optional[_QuietServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def _handler_class(self) -> type[BaseHTTPRequestHandler]:
+        standin = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def setup(self) -> None:
+                super().setup()
+                with standin._lock:
+                    standin.connections += 1
+
+            def do_GET(self) -> None:
+                with standin._lock:
+                    standin.requests += 1
+                if standin.latency:
+                    time.sleep(standin.latency)
+                route = standin.routes.get(self.path.split("?")[0])
+                if route is None:
+                    route = StandinRoute(b"Not Found", status=404, content_type="text/plain")
+                elif callable(route):
+                    route = route(self)
+                self.send_response(route.status)
+                self.send_header("Content-Type", route.content_type)
+                self.send_header("Content-Length", str(len(route.body)))
+                for key, value in route.headers.items():
+                    self.send_header(key, value)
+                self.end_headers()
+                self.wfile.write(route.body)
+
+            def log_message(self, format: str, *args) -> None:
+                return
+
+        return Handler
+
+    def url(self, path: str) -> str:
+        if self._server is None:
+            raise RuntimeError("StandinServer is not running")
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}{path}"
+
+    def start(self) -> "StandinServer":
+        self._server = _QuietServer(("127.0.0.1", 0), self._handler_class())
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def reset_counters(self) -> None:
+        with self._lock:
+            self.connections = 0
+            self.requests = 0
+
+    def __enter__(self) -> "StandinServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
@@ -0,0 +1,156 @@
+import asyncio
+import contextvars
+import json
+from collections import OrderedDict
+from typing import Any, Awaitable, Sequence
+
+from langchain_core.messages import AIMessage, AnyMessage, HumanMessage, ToolMessage
+
+from src.agent.tool_cache import DOCUMENT_HANDLE_PATTERN
+from src.agent.token_budget import MessageTokenCache
+from src.tools.metrics import get_metrics
+
+# Tool outputs longer than this are folded into the summary once their turn is
+# over, and are cut to this length in the transcript that gets summarised.
+TOOL_OUTPUT_FOLD_CHARS = 2_000
+MESSAGE_TRANSCRIPT_CHARS = 4_000
+FOLDED_TOOL_OUTPUT = "[Output folded into the conversation summary.]"
+MAX_PENDING_COMPACTIONS = 1024
+
+
+def history_tokens(messages: Sequence[AnyMessage], cache: MessageTokenCache) -> int:
+    return sum(cache.count(message) for message in messages)
+
+
+def recent_window_start(messages: Sequence[AnyMessage], keep_tokens: int, cache: MessageTokenCache) -> int:
+    """Index of the first message kept verbatim: the most recent ``keep_tokens``,
+    extended back to the start of a user turn, and never less than the latest turn."""
+    start = len(messages)
+    budget = keep_tokens
+    while start > 0:
+        tokens = cache.count(messages[start - 1])
+        if tokens > budget:
+            break
+        budget -= tokens
+        start -= 1
+    while start > 0 and (start == len(messages) or not isinstance(messages[start], HumanMessage)):
+        start -= 1
+    return start
+
+
+def latest_turn_start(messages: Sequence[AnyMessage]) -> int:
+    for index in range(len(messages) - 1, -1, -1):
+        if isinstance(messages[index], HumanMessage):
+            return index
+    return 0
+
+
+def foldable_tool_outputs(messages: Sequence[AnyMessage]) -> list[ToolMessage]:
+    """Bulky tool outputs of the turns before the latest one."""
+    return [
+        message
+        for message in messages[:latest_turn_start(messages)]
+        if isinstance(message, ToolMessage)
+        and isinstance(message.content, str)
+        and len(message.content) > TOOL_OUTPUT_FOLD_CHARS
+    ]
+
+
+def folded(message: ToolMessage) -> ToolMessage:
+    """``message`` with its output replaced by a stub, keeping any document
+    handles so the passages can still be looked up."""
+    handles = list(dict.fromkeys(DOCUMENT_HANDLE_PATTERN.findall(message.content)))
+    content = FOLDED_TOOL_OUTPUT
+    if handles:
+        content += f" Document handles: {', '.join(handles)}"
+    return message.model_copy(update={"content": content})
+
+
+def _clip(text: str, limit: int) -> str:
+    return text if len(text) <= limit else text[:limit] + f" [... {len(text) - limit} more characters]"
+
+
+def transcript(messages: Sequence[AnyMessage], max_chars: int) -> str:
+    """Plain-text rendering of ``messages`` for the summariser, with long
+    contents clipped and, past ``max_chars``, the oldest lines dropped."""
+    lines: list[str] = []
+    for message in messages:
+        if isinstance(message, HumanMessage):
+            lines.append(f"User: {_clip(message.text(), MESSAGE_TRANSCRIPT_CHARS)}")
+        elif isinstance(message, AIMessage):
+            if text := message.text():
+                lines.append(f"Assistant: {_clip(text, MESSAGE_TRANSCRIPT_CHARS)}")
+            for tool_call in message.tool_calls:
+                lines.append(f"Assistant called {tool_call['name']} with {json.dumps(tool_call['args'], default=str)}")
+        elif isinstance(message, ToolMessage):
+            lines.append(f"Tool {message.name or 'result'} returned: {_clip(message.text(), TOOL_OUTPUT_FOLD_CHARS)}")
+    kept: list[str] = []
+    size = 0
+    for line in reversed(lines):
+        size += len(line) + 1
+        if size > max_chars and kept:
+            break
+        kept.append(line)
+    return "\n".join(reversed(kept))
+
+
+class BackgroundCompactions:
+    """Compactions computed once a run has returned, and applied at the start
+    of the thread's next run, so the summary call never delays a reply.
+
+    Pending work lives in this process only. When the next run lands on
+    another replica, the work is simply lost and that run's reply schedules
+    a new one. An update is dropped if the thread was compacted in the
+    meantime, and only touches messages that are still in the state.
+    """
+
+    def __init__(self, max_pending: int = MAX_PENDING_COMPACTIONS):
+        self.max_pending = max_pending
+        self.metrics = get_metrics("compaction")
+        self._pending: OrderedDict[str, tuple[str, asyncio.Task]] = OrderedDict()
+
+    def schedule(self, thread_id: str, summary: str, work: Awaitable[dict[str, Any]]) -> None:
+        """Start ``work`` (the state update of one compaction), computed from ``summary``."""
+        previous = self._pending.pop(thread_id, None)
+        if previous is not None:
+            previous[1].cancel()
+        # A fresh context keeps the summary call out of the finished run's callbacks and stream.
+        task = asyncio.get_running_loop().create_task(work, context=contextvars.Context())
+        self._pending[thread_id] = (summary, task)
+        while len(self._pending) > self.max_pending:
+            _, (_, task) = self._pending.popitem(last=False)
+            task.cancel()
+        self.metrics.incr("scheduled")
+
+    async def take(self, thread_id: str, summary: str, messages: Sequence[AnyMessage]) -> dict[str, Any]:
+        """The pending compaction of ``thread_id`` as a state update, or ``{}`` when
+        there is none or it no longer applies to the current ``summary``."""
+        entry = self._pending.pop(thread_id, None)
+        if entry is None:
+            return {}
+        base_summary, task = entry
+        if not task.done():
+            if task.get_loop() is not asyncio.get_running_loop():
+                self.metrics.incr("dropped")
+                return {}
+            self.metrics.incr("waited")
+            await asyncio.wait({task})
+        if task.cancelled():
+            self.metrics.incr("dropped")
+            return {}
+        if task.exception() is not None:
+            self.metrics.incr("failures")
+            return {}
+        if base_summary != summary:
+            self.metrics.incr("dropped")
+            return {}
+        update = dict(task.result())
+        ids = {message.id for message in messages}
+        update["internal_messages"] = [
+            message for message in update.get("internal_messages", []) if message.id in ids
+        ]
+        self.metrics.incr("applied")
+        return update
+
+
+background_compactions = BackgroundCompactions()
@@ -9,7 +9,9 @@ from src.agent.prompts import (
     report_planner_instructions, 
     report_conclusion_instructions,
     report_intro_instructions,
-    deep_research_system_instruction
+    deep_research_system_instruction,
+    conversation_summary_instructions,
+    research_digest_instructions,
 )
 
 
@@ -17,13 +19,28 @@ from src.agent.prompts import (
 class Configuration:
     model: str = "gpt-4.1-mini"
     model_provider: str = "openai"
+    model_context_window: int = 0
+    model_max_output_tokens: int = 0
+    model_tokenizer: str = ""
+    model_input_price: float = 0.0
+    model_output_price: float = 0.0
     deep_research: bool = False
     max_research_iterations: int = 5
+    research_loop: str = "two_step"
+    max_tool_concurrency: int = 4
+    tool_timeout: float = 60.0
+    tool_routing: str = "keyword"
+    conversation_compaction: str = "summary"
+    compaction_trigger_tokens: int = 32_000
+    compaction_keep_tokens: int = 8_000
+    research_compaction: str = "notes"
     system_prompt: str = system_prompt
     report_planner_instructions: str = report_planner_instructions
     report_conclusion_instructions: str = report_conclusion_instructions
     report_intro_instructions: str = report_intro_instructions
     deep_research_system_instruction: str = deep_research_system_instruction
+    conversation_summary_instructions: str = conversation_summary_instructions
+    research_digest_instructions: str = research_digest_instructions
     
     @classmethod
     def from_runnable_config(cls, config: Optional[RunnableConfig] = None) -> "Configuration":
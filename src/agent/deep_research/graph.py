@@ -1,17 +1,36 @@
+import asyncio
 import json
-from typing import Literal
+from typing import Literal, Sequence
 
 from langgraph.graph import START, END, StateGraph
 from langchain_core.runnables import RunnableConfig
-from langchain.chat_models import init_chat_model
 from langgraph.types import Command
-from langchain_core.messages import AIMessage, ToolMessage
+from langchain_core.messages import AIMessage, AnyMessage, RemoveMessage, ToolMessage
+from langchain_core.tools import BaseTool
 from langgraph.pregel import RetryPolicy
 
 from src.agent.deep_research.state import SectionState, SectionOutputState
 from src.tools import agent_tool_kit
-from src.agent.deep_research.pydantics import CompletedSection, Brief, Section
+from src.agent.deep_research.pydantics import CompletedSection, Brief, ResearchNotes, Section, Source
 from src.agent.config import Configuration
+from src.agent.prompts import reason_and_act_step_name, research_notes_context
+from src.agent.tool_router import CHARS_PER_TOKEN
+from src.tools.metrics import get_metrics
+from src.agent.tool_executor import execute_tool_calls
+from src.agent.tool_router import route_tools
+from src.agent.model_capabilities import (
+    aget_model_capabilities,
+    fit_to_context,
+    record_usage,
+)
+from src.agent.models import (
+    get_chat_model,
+    get_chat_model_with_tools,
+    get_structured_chat_model,
+)
+
+
+metrics = get_metrics("research_compaction")
 
 
 def brief_from_state(state: SectionState) -> str:
@@ -25,18 +44,42 @@ def brief_from_state(state: SectionState) -> str:
     return str(brief)
 
 
+def notes_from_state(state: SectionState) -> str:
+    if not state.notes:
+        return ""
+    sources = {}
+    for source in state.sources:
+        if isinstance(source, dict):
+            source = Source(**source)
+        sources.setdefault(source.url or source.title, source)
+    return research_notes_context.format(
+        notes="\n".join(f"- {note}" for note in state.notes),
+        sources="\n".join(str(source) for source in sources.values()),
+    )
+
+
+def _section_tools(state: SectionState, configuration: Configuration) -> list[BaseTool]:
+    if isinstance(state.section, dict):
+        state.section = Section(**state.section)
+    text = " ".join(
+        [state.section.name, state.section.description, *state.section.research_objectives]
+    )
+    return route_tools(configuration, text, state.messages)
+
+
 def _get_system_instruction(
     state: SectionState, 
     configuration: Configuration,
-    current_step: str
+    current_step: str,
+    tools: Sequence[BaseTool] = agent_tool_kit,
 ) -> str:
     tools_available = [
         {
             "tool_name": tool.name,
             "tool_description": tool.description
-        } for tool in agent_tool_kit
+        } for tool in tools
     ]
-    brief = brief_from_state(state)
+    brief = brief_from_state(state) + notes_from_state(state)
     sys = configuration.deep_research_system_instruction.format(
         current_step=current_step,
         tools_available=json.dumps(tools_available, indent=2),
@@ -48,47 +91,154 @@ def _get_system_instruction(
 async def reasoning_step(state: SectionState, config: RunnableConfig) -> dict:
     configuration = Configuration.from_runnable_config(config)
     
-    llm = init_chat_model(
-        model=configuration.model, 
-        model_provider=configuration.model_provider
-    )
+    llm = get_chat_model(configuration)
+    capabilities = await aget_model_capabilities(configuration)
     sys = _get_system_instruction(
         state=state, 
         configuration=configuration, 
-        current_step="Reflection Step"
+        current_step="Reflection Step",
+        tools=_section_tools(state, configuration),
     )
-    msgs = state.messages
+    msgs, prompt_tokens = fit_to_context(capabilities, sys, state.messages, start_on="ai")
     msg = await llm.ainvoke(
         [{"role": "system", "content": sys}, *msgs]
     )
+    record_usage(configuration, capabilities, msg, prompt_tokens)
     return {"messages": [msg]}
 
 
-async def tool_selection_step(state: SectionState, config: RunnableConfig) -> dict:
+def _tool_exchanges(messages: Sequence[AnyMessage]) -> list[AnyMessage]:
+    """The tool-calling messages and the tool outputs answering them."""
+    return [
+        message for message in messages
+        if isinstance(message, ToolMessage) or (isinstance(message, AIMessage) and message.tool_calls)
+    ]
+
+
+def _without_tool_calls(message: AnyMessage) -> AnyMessage:
+    """Drop a digested message, keeping any reasoning text an AI message carried
+    alongside its tool calls (same id, so it stays where it was)."""
+    if isinstance(message, AIMessage) and message.text().strip():
+        return AIMessage(content=message.text(), id=message.id)
+    return RemoveMessage(id=message.id)
+
+
+def _render_tool_outputs(messages: Sequence[AnyMessage], max_chars: int) -> str:
+    calls = {
+        tool_call["id"]: tool_call
+        for message in messages if isinstance(message, AIMessage)
+        for tool_call in message.tool_calls
+    }
+    outputs = [message for message in messages if isinstance(message, ToolMessage)]
+    limit = max(1, max_chars // max(1, len(outputs)))
+    rendered = []
+    for message in outputs:
+        call = calls.get(message.tool_call_id, {})
+        content = message.text()
+        if len(content) > limit:
+            content = content[:limit] + f" [... {len(content) - limit} more characters]"
+        args = json.dumps(call.get("args", {}), default=str)
+        rendered.append(f"### {call.get('name', message.name)}({args})\n{content}")
+    return "\n\n".join(rendered)
+
+
+async def _digest(state: SectionState, configuration: Configuration) -> dict:
+    if configuration.research_compaction == "off":
+        return {}
+    exchanges = _tool_exchanges(state.messages)
+    if not any(isinstance(message, ToolMessage) for message in exchanges):
+        return {}
+
+    capabilities = await aget_model_capabilities(configuration)
+    structured_llm = get_structured_chat_model(configuration, ResearchNotes)
+    sys = configuration.research_digest_instructions.format(
+        brief=brief_from_state(state),
+        tool_outputs=_render_tool_outputs(
+            exchanges, int(capabilities.prompt_budget() * CHARS_PER_TOKEN)
+        ),
+    )
+    notes = await structured_llm.ainvoke(
+        [{"role": "system", "content": sys}]
+    )
+    if not isinstance(notes, ResearchNotes):
+        raise ValueError(
+            f"Expected ResearchNotes, got {type(notes)}"
+        )
+    metrics.incr("digests")
+    metrics.incr("messages_removed", len(exchanges))
+    metrics.incr("notes", len(notes.notes))
+    return {
+        "notes": notes.notes,
+        "sources": notes.sources,
+        "messages": [_without_tool_calls(message) for message in exchanges],
+    }
+
+
+async def digest_step(state: SectionState, config: RunnableConfig) -> dict:
+    """Replace the tool outputs the reasoning step is reading with notes and sources.
+
+    Runs alongside ``reasoning_step``, which still sees the raw outputs; from
+    the next step on, only the extracted notes are in the prompt, so its size
+    stays roughly flat across research iterations.
+    """
     configuration = Configuration.from_runnable_config(config)
-    
+    return await _digest(state, configuration)
+
+
+async def _select_tools(state: SectionState, configuration: Configuration, current_step: str) -> dict:
     state.iterations += 1
-    if state.iterations > configuration.max_research_iterations:
+    if state.iterations > int(configuration.max_research_iterations):
         msg = AIMessage(
             content="I have spent enough time researching and should move on to completing the section."
         )
-        return {"messages": [msg]}
+        return {"messages": [msg], "iterations": state.iterations}
     
-    llm = init_chat_model(
-        model=configuration.model, 
-        model_provider=configuration.model_provider
-    )
-    llm_with_tools = llm.bind_tools(agent_tool_kit)
+    capabilities = await aget_model_capabilities(configuration)
+    tools = _section_tools(state, configuration)
+    llm_with_tools = get_chat_model_with_tools(configuration, tools)
     sys = _get_system_instruction(
         state=state, 
         configuration=configuration,
-        current_step="Tool Selection Step"
+        current_step=current_step,
+        tools=tools,
     )
-    msgs = state.messages
+    msgs, prompt_tokens = fit_to_context(capabilities, sys, state.messages, tools, start_on="ai")
     msg = await llm_with_tools.ainvoke(
         [{"role": "system", "content": sys}, *msgs]
     )
-    return {"messages": [msg]}
+    record_usage(configuration, capabilities, msg, prompt_tokens)
+    return {"messages": [msg], "iterations": state.iterations}
+
+
+async def tool_selection_step(state: SectionState, config: RunnableConfig) -> dict:
+    configuration = Configuration.from_runnable_config(config)
+    return await _select_tools(state, configuration, "Tool Selection Step")
+
+
+async def reason_and_act_step(state: SectionState, config: RunnableConfig) -> dict:
+    """Reflection and tool selection in one tool-enabled call (``research_loop="single_call"``).
+
+    Halves the model round trips of an iteration compared with
+    ``reasoning_step`` followed by ``tool_selection_step``. The digest of the
+    previous tool outputs runs concurrently with the call.
+    """
+    configuration = Configuration.from_runnable_config(config)
+    selection, digest = await asyncio.gather(
+        _select_tools(state, configuration, reason_and_act_step_name),
+        _digest(state, configuration),
+    )
+    return {
+        **digest,
+        **selection,
+        "messages": [*digest.get("messages", []), *selection["messages"]],
+    }
+
+
+def route_research_loop(state: SectionState, config: RunnableConfig) -> list[str]:
+    configuration = Configuration.from_runnable_config(config)
+    if configuration.research_loop == "single_call":
+        return ["reason_and_act_step"]
+    return ["reasoning_step", "digest_step"]
 
 
 def route_tools_message(state: SectionState) -> str:
@@ -103,42 +253,31 @@ async def tool_node(state: SectionState, config: RunnableConfig) -> dict:
         message = messages[-1]
     else:
         raise ValueError("No message found in input")
-    tools_by_name = {
-        tool.name: tool for tool in agent_tool_kit
-    }
-    outputs = []
-    for tool_call in message.tool_calls:
-        tool_result = tools_by_name[tool_call["name"]].invoke(
-            tool_call["args"]
-        )
-        outputs.append(
-            ToolMessage(
-                content=json.dumps(tool_result),
-                name=tool_call["name"],
-                tool_call_id=tool_call["id"],
-            )
-        )
+    configuration = Configuration.from_runnable_config(config)
+    outputs = await execute_tool_calls(
+        message.tool_calls,
+        agent_tool_kit,
+        max_concurrency=int(configuration.max_tool_concurrency),
+        timeout=float(configuration.tool_timeout),
+    )
     return {"messages": outputs}
 
 
 async def complete_section_step(state: SectionState, config: RunnableConfig) -> Command[Literal["__end__"]]:
     configuration = Configuration.from_runnable_config(config)
-    llm = init_chat_model(
-        model=configuration.model, 
-        model_provider=configuration.model_provider
-    )
-    
-    structured_llm = llm.with_structured_output(
-        schema=CompletedSection
+    structured_llm = get_structured_chat_model(
+        configuration, CompletedSection
     )
     
     sys = _get_system_instruction(
         state=state, 
         configuration=configuration,
-        current_step="Writing Step"
+        current_step="Writing Step",
+        tools=_section_tools(state, configuration),
     )
     
-    msgs = state.messages
+    capabilities = await aget_model_capabilities(configuration)
+    msgs, _ = fit_to_context(capabilities, sys, state.messages, start_on="ai")
     section = await structured_llm.ainvoke(
         [{"role": "system", "content": sys}, *msgs]
     )
@@ -159,16 +298,20 @@ deep_researcher_build = StateGraph(SectionState, output=SectionOutputState, conf
 deep_researcher_build.add_node("reasoning_step", reasoning_step, retry=RetryPolicy())
 deep_researcher_build.add_node("tool_selection_step", tool_selection_step, retry=RetryPolicy())
 deep_researcher_build.add_node("complete_section_step", complete_section_step, retry=RetryPolicy())
+deep_researcher_build.add_node("digest_step", digest_step, retry=RetryPolicy())
+deep_researcher_build.add_node("reason_and_act_step", reason_and_act_step, retry=RetryPolicy())
 deep_researcher_build.add_node("tools", tool_node, retry=RetryPolicy())
 
-deep_researcher_build.add_edge(START, "reasoning_step")
-deep_researcher_build.add_edge("reasoning_step", "tool_selection_step")
-deep_researcher_build.add_conditional_edges(
-    "tool_selection_step", 
-    route_tools_message,
-    {
-        "tools": "tools",
-        "complete_section_step": "complete_section_step"
-    }
-)
-deep_researcher_build.add_edge("tools", "reasoning_step")
\ No newline at end of file
+research_loop_entries = ["reasoning_step", "digest_step", "reason_and_act_step"]
+deep_researcher_build.add_conditional_edges(START, route_research_loop, research_loop_entries)
+deep_researcher_build.add_edge(["reasoning_step", "digest_step"], "tool_selection_step")
+for _step in ("tool_selection_step", "reason_and_act_step"):
+    deep_researcher_build.add_conditional_edges(
+        _step, 
+        route_tools_message,
+        {
+            "tools": "tools",
+            "complete_section_step": "complete_section_step"
+        }
+    )
+deep_researcher_build.add_conditional_edges("tools", route_research_loop, research_loop_entries)
\ No newline at end of file
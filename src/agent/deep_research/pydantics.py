@@ -22,6 +22,11 @@ class Source(BaseModel):
         return f"- [{self.title}]({self.url}) ({self.source_name})"
 
 
+class ResearchNotes(BaseModel):
+    notes: list[str]
+    sources: list[Source]
+
+
 class CompletedSection(BaseModel):
     section_index: int
     section_title: str
@@ -1,11 +1,11 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 from langchain_core.messages import AnyMessage
 from langgraph.graph import add_messages
 from typing_extensions import Annotated
 from operator import add
 
-from src.agent.deep_research.pydantics import CompletedSection, Section
+from src.agent.deep_research.pydantics import CompletedSection, Section, Source
 
 
 @dataclass(kw_only=True)
@@ -17,6 +17,9 @@ class SectionState:
     messages: Annotated[list[AnyMessage], add_messages]
     """The messages in the conversation."""
     iterations: int = 0
+    notes: Annotated[list[str], add] = field(default_factory=list)
+    """Findings extracted from tool outputs that have been removed from ``messages``."""
+    sources: Annotated[list[Source], add] = field(default_factory=list)
     
     
 @dataclass(kw_only=True)
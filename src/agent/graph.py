@@ -1,82 +1,109 @@
+import os
 from datetime import datetime
-from typing import Optional, Literal
-import json
+from typing import Literal
 
-from pydantic import BaseModel
-from langchain.chat_models import init_chat_model
 from langgraph.types import Command
-from langchain_core.language_models import BaseChatModel
 from langgraph.graph import START, END, StateGraph
 from langchain_core.runnables import RunnableConfig
-from langchain_core.messages import ToolMessage, AIMessage
+from langchain_core.messages import AIMessage, AnyMessage, RemoveMessage
 from langgraph.constants import Send
-from langchain_core.messages.utils import (
-    trim_messages,
-    count_tokens_approximately
-)
 from langgraph.pregel import RetryPolicy
 
 from src.agent.state import State, InputState
 from src.tools import agent_tool_kit
+from src.tools.constants import CACHE_WARMER_ENABLED
+from src.tools.warmer import cache_warmer
 from src.agent.config import Configuration
+from src.agent.tool_executor import execute_tool_calls
+from src.agent.tool_router import CHARS_PER_TOKEN, latest_human_text, route_tools
+from src.agent.compaction import (
+    background_compactions,
+    folded,
+    foldable_tool_outputs,
+    history_tokens,
+    recent_window_start,
+    transcript,
+)
+from src.agent.prompts import conversation_summary_context
+from src.tools.metrics import get_metrics
+from src.agent.model_capabilities import (
+    aget_model_capabilities,
+    count_text_tokens,
+    fit_to_context,
+    get_model_capabilities,
+    record_usage,
+    token_cache_for,
+)
+from src.agent.models import (
+    get_chat_model,
+    get_chat_model_with_tools,
+    warm_up_models,
+)
 from src.agent.deep_research.graph import deep_researcher_build
 from src.agent.deep_research.plan_tool import submit_research_report_plan
 from src.agent.deep_research.pydantics import CompletedSection
 
 
+compaction_metrics = get_metrics("compaction")
+
+
 def brief_from_state(state: State) -> str:
     text = f"Research Topic: {state.report_topic}\n"
     text += f"High Level Objectives: {state.report_high_level_objectives}\n"
     return text
 
 
-def model_max_tokens(llm: BaseChatModel) -> Optional[int]:
-    config = llm.model_config
-    if isinstance(config, BaseModel):
-        config_dict = config.model_dump()
-    else:
-        config_dict = config
-    tokens = None
-    for key in ["max_tokens", "str_max_length"]:
-        tokens = config_dict.get(key, None)
-        if tokens:
-            break
-    return tokens
-
-
 async def start_node(state: State, config: RunnableConfig) -> dict:
     last_message = state.messages[-1]
-    return {"internal_messages": [last_message]}
+    update = {}
+    if thread_id := config.get("configurable", {}).get("thread_id"):
+        update = await background_compactions.take(str(thread_id), state.summary, state.internal_messages)
+    return {**update, "internal_messages": [*update.get("internal_messages", []), last_message]}
+
+
+def with_summary(prompt: str, state: State) -> str:
+    if not state.summary:
+        return prompt
+    return prompt + conversation_summary_context.format(summary=state.summary)
+
+
+def needs_compaction(state: State, configuration: Configuration, reply: AnyMessage) -> bool:
+    if configuration.conversation_compaction == "off":
+        return False
+    cache = token_cache_for(get_model_capabilities(configuration))
+    tokens = history_tokens(state.internal_messages, cache) + cache.count(reply)
+    return tokens > int(configuration.compaction_trigger_tokens)
 
 
 async def call_model(state: State, config: RunnableConfig) -> Command[Literal[END, "tools"]]:
     configuration = Configuration.from_runnable_config(config)
-    llm = init_chat_model(
-        model=configuration.model, 
-        model_provider=configuration.model_provider
+    capabilities = await aget_model_capabilities(configuration)
+    tools = route_tools(
+        configuration, latest_human_text(state.internal_messages), state.internal_messages
     )
-    llm_with_tools = llm.bind_tools(agent_tool_kit)
+    llm_with_tools = get_chat_model_with_tools(configuration, tools)
     
     sys = configuration.system_prompt.format(
         time=datetime.now().isoformat()
     )
-    max_tokens = (model_max_tokens(llm) or 128_000) - 1000
-    msgs = trim_messages(
-        state.internal_messages,
-        strategy="last",
-        token_counter=count_tokens_approximately,
-        max_tokens=max_tokens,
-        start_on="human",
-        include_system=True,
-    )
+    sys = with_summary(sys, state)
+    msgs, prompt_tokens = fit_to_context(capabilities, sys, state.internal_messages, tools)
     msg = await llm_with_tools.ainvoke(
         [{"role": "system", "content": sys}, *msgs],
     )
+    record_usage(configuration, capabilities, msg, prompt_tokens)
     if msg.tool_calls:
         return Command(
             goto="tools",
             update={"internal_messages": [msg]},
         )
+    thread_id = config.get("configurable", {}).get("thread_id")
+    if thread_id and needs_compaction(state, configuration, msg):
+        background_compactions.schedule(
+            str(thread_id),
+            state.summary,
+            compact_memory([*state.internal_messages, msg], state.summary, configuration),
+        )
     return Command(
         goto=END,
         update={
@@ -86,6 +113,46 @@ async def call_model(state: State, config: RunnableConfig) -> Command[Literal[EN
     )
 
 
+async def compact_memory(messages: list[AnyMessage], summary: str, configuration: Configuration) -> dict:
+    """Fold the turns before the recent window, and the bulky tool outputs of
+    earlier turns inside it, into ``summary``.
+
+    Runs in the background once the run that sent the reply has returned;
+    the resulting update is applied by ``start_node`` on the thread's next run.
+    """
+    capabilities = await aget_model_capabilities(configuration)
+    start = recent_window_start(
+        messages, int(configuration.compaction_keep_tokens), token_cache_for(capabilities)
+    )
+    older = messages[:start]
+    tool_outputs = foldable_tool_outputs(messages[start:])
+    if not older and not tool_outputs:
+        return {}
+
+    llm = get_chat_model(configuration)
+    sys = configuration.conversation_summary_instructions.format(
+        summary=summary or "(none yet)",
+        conversation=transcript(
+            [*older, *tool_outputs],
+            max_chars=int(capabilities.prompt_budget() * CHARS_PER_TOKEN),
+        ),
+    )
+    response = await llm.ainvoke(
+        [{"role": "system", "content": sys}],
+    )
+    record_usage(configuration, capabilities, response, count_text_tokens(capabilities, sys))
+    compaction_metrics.incr("compactions")
+    compaction_metrics.incr("messages_removed", len(older))
+    compaction_metrics.incr("tool_outputs_folded", len(tool_outputs))
+    return {
+        "summary": response.text(),
+        "internal_messages": [
+            *(RemoveMessage(id=message.id) for message in older),
+            *(folded(message) for message in tool_outputs),
+        ],
+    }
+
+
 def route_start(state: State, config: RunnableConfig) -> str:
     configuration = Configuration.from_runnable_config(config)
     if configuration.deep_research is True:
@@ -98,44 +165,27 @@ async def tool_node(state: State, config: RunnableConfig) -> dict:
         message = messages[-1]
     else:
         raise ValueError("No message found in input")
-    tools_by_name = {
-        tool.name: tool for tool in agent_tool_kit
-    }
-    outputs = []
-    for tool_call in message.tool_calls:
-        tool_result = tools_by_name[tool_call["name"]].invoke(
-            tool_call["args"]
-        )
-        outputs.append(
-            ToolMessage(
-                content=json.dumps(tool_result),
-                name=tool_call["name"],
-                tool_call_id=tool_call["id"],
-            )
-        )
+    configuration = Configuration.from_runnable_config(config)
+    outputs = await execute_tool_calls(
+        message.tool_calls,
+        agent_tool_kit,
+        max_concurrency=int(configuration.max_tool_concurrency),
+        timeout=float(configuration.tool_timeout),
+    )
     return {"internal_messages": outputs}
 
 
 async def generate_report_plan(state: State, config: RunnableConfig) -> Command[Literal[END, "trigger_build"]]:
     configuration = Configuration.from_runnable_config(config)
-    llm = init_chat_model(
-        model=configuration.model, 
-        model_provider=configuration.model_provider
-    )
-    llm_with_tools = llm.bind_tools([submit_research_report_plan])
-    sys = configuration.report_planner_instructions
-    max_tokens = (model_max_tokens(llm) or 128_000) - 1000
-    msgs = trim_messages(
-        state.internal_messages,
-        strategy="last",
-        token_counter=count_tokens_approximately,
-        max_tokens=max_tokens,
-        start_on="human",
-        include_system=True,
-    )
+    capabilities = await aget_model_capabilities(configuration)
+    plan_tools = [submit_research_report_plan]
+    llm_with_tools = get_chat_model_with_tools(configuration, plan_tools)
+    sys = with_summary(configuration.report_planner_instructions, state)
+    msgs, prompt_tokens = fit_to_context(capabilities, sys, state.internal_messages, plan_tools)
     msg = await llm_with_tools.ainvoke(
         [{"role": "system", "content": sys}, *msgs],
     )
+    record_usage(configuration, capabilities, msg, prompt_tokens)
 
     report_topic = ""
     report_high_level_objectives = ""
@@ -216,10 +266,7 @@ def format_sections(completed_sections: list[CompletedSection]) -> list[str]:
 
 async def write_conclusion(state: State, config: RunnableConfig) -> dict:
     configuration = Configuration.from_runnable_config(config)
-    llm = init_chat_model(
-        model=configuration.model, 
-        model_provider=configuration.model_provider
-    )
+    llm = get_chat_model(configuration)
     section_index = len(state.completed_sections)
     completed_sections = state.completed_sections
     completed_sections.sort(key=lambda x: x.section_index)
@@ -231,6 +278,8 @@ async def write_conclusion(state: State, config: RunnableConfig) -> dict:
     content = await llm.ainvoke(
         [{"role": "system", "content": sys}],
     )
+    capabilities = await aget_model_capabilities(configuration)
+    record_usage(configuration, capabilities, content, count_text_tokens(capabilities, sys))
     conclusion_section = CompletedSection(
         section_index=section_index,
         section_title="Conclusion",
@@ -242,10 +291,7 @@ async def write_conclusion(state: State, config: RunnableConfig) -> dict:
 
 async def write_intro(state: State, config: RunnableConfig) -> dict:
     configuration = Configuration.from_runnable_config(config)
-    llm = init_chat_model(
-        model=configuration.model, 
-        model_provider=configuration.model_provider
-    )
+    llm = get_chat_model(configuration)
     section_index = -1
     completed_sections = state.completed_sections
     completed_sections.sort(key=lambda x: x.section_index)
@@ -257,6 +303,8 @@ async def write_intro(state: State, config: RunnableConfig) -> dict:
     content = await llm.ainvoke(
         [{"role": "system", "content": sys}],
     )
+    capabilities = await aget_model_capabilities(configuration)
+    record_usage(configuration, capabilities, content, count_text_tokens(capabilities, sys))
     intro_section = CompletedSection(
         section_index=section_index,
         section_title="Introduction",
@@ -277,6 +325,18 @@ async def compile_final_report(state: State, config: RunnableConfig) -> dict:
     return {"messages": [msg], "internal_messages": [msg]}
 
 
+if os.environ.get("WARM_MODEL_REGISTRY"):
+    # Also loads the tokenizer, which may download its encoding on first use.
+    token_cache_for(get_model_capabilities(Configuration.from_runnable_config()))
+    warm_up_models(
+        tool_sets=[agent_tool_kit, [submit_research_report_plan]],
+        schemas=[CompletedSection],
+    )
+
+if CACHE_WARMER_ENABLED:
+    cache_warmer.start()
+
+
 graph_builder = StateGraph(State, input=InputState, config_schema=Configuration)
 
 graph_builder.add_node("start_node", start_node, retry=RetryPolicy())
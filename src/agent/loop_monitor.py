@@ -0,0 +1,57 @@
+import asyncio
+import logging
+import os
+from typing import Optional
+
+from src.tools.metrics import get_metrics
+
+logger = logging.getLogger(__name__)
+
+
+class EventLoopLagMonitor:
+    """Measures how late the event loop wakes up from a fixed-interval sleep.
+
+    Any blocking work on the loop (e.g. a synchronous tool call) shows up as
+    lag, so ``event_loop.lag_seconds`` going up is a direct signal that one
+    run is stalling the others served by the same process.
+    """
+
+    def __init__(self, interval: float = 0.25, warn_threshold: float = 0.5):
+        self.interval = interval
+        self.warn_threshold = warn_threshold
+        self.metrics = get_metrics("event_loop")
+        self._task: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, loop.time() - start - self.interval)
+            self.metrics.observe("lag_seconds", lag)
+            self.metrics.set("current_lag_seconds", lag)
+            if lag > self.warn_threshold:
+                self.metrics.incr("stalls")
+                logger.warning(f"Event loop stalled for {lag:.3f}s")
+
+    def ensure_started(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._task is not None and self._loop is loop and not self._task.done():
+            return
+        self._loop = loop
+        self._task = loop.create_task(self._run(), name="event-loop-lag-monitor")
+
+    def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+            self._loop = None
+
+
+loop_monitor = EventLoopLagMonitor()
+
+
+def ensure_loop_monitor() -> None:
+    if os.environ.get("EVENT_LOOP_LAG_MONITOR", "1") != "0":
+        loop_monitor.ensure_started()
@@ -0,0 +1,207 @@
+import asyncio
+import logging
+import threading
+from dataclasses import dataclass, replace
+from typing import Any, Literal, Optional, Sequence
+
+from langchain_core.messages import AIMessage, AnyMessage
+from langchain_core.messages.utils import count_tokens_approximately
+from langchain_core.tools import BaseTool
+
+from src.agent.config import Configuration
+from src.agent.token_budget import MessageTokenCache, TokenCounter, trim_to_budget
+from src.agent.tool_router import tool_router
+from src.tools.metrics import get_metrics
+
+logger = logging.getLogger(__name__)
+
+APPROXIMATE = "approximate"
+# Tokens kept free on top of the reply when the tokenizer is exact, and the
+# share of the window kept free when token counts are only approximate.
+SAFETY_MARGIN_TOKENS = 1_000
+APPROXIMATE_SAFETY_MARGIN = 0.05
+TIKTOKEN_TOKENS_PER_MESSAGE = 3
+
+
+@dataclass(frozen=True)
+class ModelCapabilities:
+    context_window: int
+    """Total tokens the model accepts, prompt and reply included."""
+    max_output_tokens: int
+    tokenizer: str = APPROXIMATE
+    """``approximate`` (~4 characters per token) or ``tiktoken:<encoding>``."""
+    input_price: Optional[float] = None
+    """USD per million input tokens."""
+    output_price: Optional[float] = None
+    """USD per million output tokens."""
+
+    def prompt_budget(self, reserved: int = 0, exact: bool = False) -> int:
+        """Tokens left for the conversation once the reply, a safety margin and
+        ``reserved`` tokens (system prompt, tool schemas) are set aside.
+        ``exact`` says whether tokens are counted with the model's own tokenizer."""
+        margin = SAFETY_MARGIN_TOKENS
+        if not exact:
+            margin = max(margin, int(self.context_window * APPROXIMATE_SAFETY_MARGIN))
+        return max(0, self.context_window - self.max_output_tokens - margin - reserved)
+
+    def cost(self, input_tokens: int, output_tokens: int) -> Optional[float]:
+        if self.input_price is None or self.output_price is None:
+            return None
+        return (input_tokens * self.input_price + output_tokens * self.output_price) / 1_000_000
+
+
+MODEL_CAPABILITIES: dict[tuple[str, str], ModelCapabilities] = {
+    ("openai", "gpt-4.1"): ModelCapabilities(1_047_576, 32_768, "tiktoken:o200k_base", 2.00, 8.00),
+    ("openai", "gpt-4.1-mini"): ModelCapabilities(1_047_576, 32_768, "tiktoken:o200k_base", 0.40, 1.60),
+    ("openai", "gpt-4.1-nano"): ModelCapabilities(1_047_576, 32_768, "tiktoken:o200k_base", 0.10, 0.40),
+    ("openai", "gpt-4o"): ModelCapabilities(128_000, 16_384, "tiktoken:o200k_base", 2.50, 10.00),
+    ("openai", "gpt-4o-mini"): ModelCapabilities(128_000, 16_384, "tiktoken:o200k_base", 0.15, 0.60),
+    ("openai", "o3"): ModelCapabilities(200_000, 100_000, "tiktoken:o200k_base", 2.00, 8.00),
+    ("openai", "o4-mini"): ModelCapabilities(200_000, 100_000, "tiktoken:o200k_base", 1.10, 4.40),
+    ("anthropic", "claude-3-5-haiku"): ModelCapabilities(200_000, 8_192, APPROXIMATE, 0.80, 4.00),
+    ("anthropic", "claude-3-7-sonnet"): ModelCapabilities(200_000, 64_000, APPROXIMATE, 3.00, 15.00),
+    ("anthropic", "claude-sonnet-4"): ModelCapabilities(200_000, 64_000, APPROXIMATE, 3.00, 15.00),
+    ("anthropic", "claude-opus-4"): ModelCapabilities(200_000, 32_000, APPROXIMATE, 15.00, 75.00),
+}
+DEFAULT_CAPABILITIES = ModelCapabilities(128_000, 4_096)
+
+
+def lookup_capabilities(model_provider: str, model: str) -> ModelCapabilities:
+    """Registered capabilities of a model; dated or aliased names (``gpt-4.1-mini-2025-04-14``,
+    ``claude-sonnet-4-0``) resolve to the longest registered prefix."""
+    key = (model_provider.lower(), model.lower())
+    if key in MODEL_CAPABILITIES:
+        return MODEL_CAPABILITIES[key]
+    candidates = [
+        name for provider, name in MODEL_CAPABILITIES
+        if provider == key[0] and key[1].startswith(name + "-")
+    ]
+    if candidates:
+        return MODEL_CAPABILITIES[(key[0], max(candidates, key=len))]
+    return DEFAULT_CAPABILITIES
+
+
+def get_model_capabilities(configuration: Configuration) -> ModelCapabilities:
+    """Capabilities of the configured model, with the ``model_*`` overrides from the configuration applied."""
+    capabilities = lookup_capabilities(configuration.model_provider, configuration.model)
+    overrides: dict[str, Any] = {}
+    if configuration.model_context_window:
+        overrides["context_window"] = int(configuration.model_context_window)
+    if configuration.model_max_output_tokens:
+        overrides["max_output_tokens"] = int(configuration.model_max_output_tokens)
+    if configuration.model_tokenizer:
+        overrides["tokenizer"] = configuration.model_tokenizer
+    if configuration.model_input_price:
+        overrides["input_price"] = float(configuration.model_input_price)
+    if configuration.model_output_price:
+        overrides["output_price"] = float(configuration.model_output_price)
+    return replace(capabilities, **overrides) if overrides else capabilities
+
+
+def _tiktoken_counter(encoding_name: str) -> TokenCounter:
+    import tiktoken
+
+    encoding = tiktoken.get_encoding(encoding_name)
+
+    def count(messages: list[AnyMessage]) -> int:
+        tokens = 0
+        for message in messages:
+            text = message.content if isinstance(message.content, str) else repr(message.content)
+            if isinstance(message, AIMessage) and message.tool_calls and isinstance(message.content, str):
+                text += repr(message.tool_calls)
+            if message.name:
+                text += message.name
+            tokens += len(encoding.encode(text, disallowed_special=())) + TIKTOKEN_TOKENS_PER_MESSAGE
+        return tokens
+
+    return count
+
+
+_token_caches: dict[str, MessageTokenCache] = {}
+_token_caches_lock = threading.Lock()
+
+
+def token_cache_for(capabilities: ModelCapabilities) -> MessageTokenCache:
+    """The per-message token cache for the model's tokenizer, shared by all models that use it."""
+    tokenizer = capabilities.tokenizer
+    with _token_caches_lock:
+        if tokenizer not in _token_caches:
+            counter: TokenCounter = count_tokens_approximately
+            if tokenizer.startswith("tiktoken:"):
+                try:
+                    counter = _tiktoken_counter(tokenizer.removeprefix("tiktoken:"))
+                except Exception as e:
+                    logger.warning(f"Tokenizer {tokenizer} unavailable ({e}); counting tokens approximately")
+            elif tokenizer != APPROXIMATE:
+                logger.warning(f"Unknown tokenizer {tokenizer}; counting tokens approximately")
+            _token_caches[tokenizer] = MessageTokenCache(counter)
+        return _token_caches[tokenizer]
+
+
+async def aget_model_capabilities(configuration: Configuration) -> ModelCapabilities:
+    """``get_model_capabilities`` for graph nodes: the first call for a
+    tokenizer loads it in a thread, as ``tiktoken`` reads (or downloads) its
+    encoding synchronously and would otherwise block the event loop."""
+    capabilities = get_model_capabilities(configuration)
+    if capabilities.tokenizer not in _token_caches:
+        await asyncio.to_thread(token_cache_for, capabilities)
+    return capabilities
+
+
+def count_text_tokens(capabilities: ModelCapabilities, text: str) -> int:
+    """Tokens of a string that is not part of the message history, e.g. a system prompt."""
+    counter = token_cache_for(capabilities).token_counter
+    return counter([AIMessage(content=text)])
+
+
+def fit_to_context(
+    capabilities: ModelCapabilities,
+    system_prompt: str,
+    messages: Sequence[AnyMessage],
+    tools: Sequence[BaseTool] = (),
+    start_on: Optional[Literal["human", "ai", "tool"]] = "human",
+) -> tuple[list[AnyMessage], int]:
+    """The most recent ``messages`` that fit in the model's context next to the
+    system prompt and tool schemas, and the estimated prompt tokens of the call."""
+    cache = token_cache_for(capabilities)
+    reserved = count_text_tokens(capabilities, system_prompt) + tool_router.tools_tokens(tools)
+    kept = trim_to_budget(
+        messages,
+        max_tokens=capabilities.prompt_budget(
+            reserved, exact=cache.token_counter is not count_tokens_approximately
+        ),
+        start_on=start_on,
+        include_system=True,
+        cache=cache,
+    )
+    return kept, reserved + sum(cache.count(message) for message in kept)
+
+
+usage_metrics = get_metrics("model_usage")
+
+
+def record_usage(
+    configuration: Configuration,
+    capabilities: ModelCapabilities,
+    message: Any,
+    estimated_input_tokens: int,
+) -> Optional[float]:
+    """Record the tokens and estimated cost of one model call; returns the cost in USD if prices are known.
+
+    Uses the usage reported by the provider when the reply carries it, and
+    the prompt estimate used for trimming otherwise.
+    """
+    usage = getattr(message, "usage_metadata", None) or {}
+    input_tokens = usage.get("input_tokens", estimated_input_tokens)
+    output_tokens = usage.get("output_tokens", 0)
+    usage_metrics.incr("calls")
+    usage_metrics.incr("input_tokens", input_tokens)
+    usage_metrics.incr("output_tokens", output_tokens)
+    usage_metrics.observe("context_utilisation", input_tokens / capabilities.context_window)
+    if usage:
+        usage_metrics.observe("input_estimate_error", estimated_input_tokens - input_tokens)
+    cost = capabilities.cost(input_tokens, output_tokens)
+    if cost is not None:
+        usage_metrics.incr("cost_usd", cost)
+        usage_metrics.incr(f"cost_usd.{configuration.model}", cost)
+    return cost
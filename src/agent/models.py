@@ -0,0 +1,195 @@
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional, Sequence
+
+from langchain.chat_models import init_chat_model
+from langchain_core.language_models import BaseChatModel
+from langchain_core.runnables import Runnable
+from langchain_core.tools import BaseTool
+
+from src.agent.config import Configuration
+from src.tools.metrics import get_metrics
+
+
+def _freeze(value: Any) -> Hashable:
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple, set)):
+        return tuple(_freeze(v) for v in value)
+    try:
+        hash(value)
+    except TypeError:
+        return repr(value)
+    return value
+
+
+def _tools_key(tools: Sequence[BaseTool | dict | Callable]) -> Hashable:
+    key = []
+    for tool in tools:
+        if isinstance(tool, BaseTool):
+            key.append((tool.name, id(tool)))
+        elif isinstance(tool, dict):
+            key.append(_freeze(tool))
+        else:
+            key.append((getattr(tool, "__name__", repr(tool)), id(tool)))
+    return tuple(key)
+
+
+class ModelRegistry:
+    """Process-wide LRU cache of chat model clients and the runnables derived from them.
+
+    Base clients are keyed by (model, model_provider, kwargs) so their HTTP
+    connection pools are reused across graph steps. Derived runnables
+    (``bind_tools`` / ``with_structured_output``) are keyed by the base client
+    plus the tool set or schema, which avoids re-converting tool schemas.
+    """
+
+    def __init__(self, max_clients: int = 8, max_derived: int = 64):
+        self.max_clients = max_clients
+        self.max_derived = max_derived
+        self._clients: OrderedDict[Hashable, BaseChatModel] = OrderedDict()
+        self._derived: OrderedDict[Hashable, Runnable] = OrderedDict()
+        self._lock = threading.RLock()
+        self.metrics = get_metrics("model_registry")
+
+    @staticmethod
+    def client_key(model: str, model_provider: str, **kwargs: Any) -> Hashable:
+        return (model, model_provider, _freeze(kwargs))
+
+    def get_model(self, model: str, model_provider: str, **kwargs: Any) -> BaseChatModel:
+        key = self.client_key(model, model_provider, **kwargs)
+        with self._lock:
+            llm = self._clients.get(key)
+            if llm is not None:
+                self._clients.move_to_end(key)
+                self.metrics.incr("client_hits")
+                return llm
+            self.metrics.incr("client_misses")
+            llm = init_chat_model(model=model, model_provider=model_provider, **kwargs)
+            self._clients[key] = llm
+            while len(self._clients) > self.max_clients:
+                evicted_key, _ = self._clients.popitem(last=False)
+                self._evict_derived(evicted_key)
+                self.metrics.incr("client_evictions")
+            self.metrics.set("clients", len(self._clients))
+            return llm
+
+    def get_derived(
+        self,
+        base_key: Hashable,
+        derived_key: Hashable,
+        build: Callable[[], Runnable],
+    ) -> Runnable:
+        key = (base_key, derived_key)
+        with self._lock:
+            runnable = self._derived.get(key)
+            if runnable is not None:
+                self._derived.move_to_end(key)
+                self.metrics.incr("derived_hits")
+                return runnable
+            self.metrics.incr("derived_misses")
+            runnable = build()
+            self._derived[key] = runnable
+            while len(self._derived) > self.max_derived:
+                self._derived.popitem(last=False)
+                self.metrics.incr("derived_evictions")
+            self.metrics.set("derived", len(self._derived))
+            return runnable
+
+    def _evict_derived(self, base_key: Hashable) -> None:
+        for key in [k for k in self._derived if k[0] == base_key]:
+            del self._derived[key]
+            self.metrics.incr("derived_evictions")
+
+    def with_tools(
+        self,
+        model: str,
+        model_provider: str,
+        tools: Sequence[BaseTool | dict | Callable],
+        **kwargs: Any,
+    ) -> Runnable:
+        base_key = self.client_key(model, model_provider, **kwargs)
+        llm = self.get_model(model, model_provider, **kwargs)
+        return self.get_derived(
+            base_key, ("tools", _tools_key(tools)), lambda: llm.bind_tools(list(tools))
+        )
+
+    def with_structured_output(
+        self,
+        model: str,
+        model_provider: str,
+        schema: Any,
+        **kwargs: Any,
+    ) -> Runnable:
+        base_key = self.client_key(model, model_provider, **kwargs)
+        llm = self.get_model(model, model_provider, **kwargs)
+        return self.get_derived(
+            base_key, ("schema", id(schema)), lambda: llm.with_structured_output(schema=schema)
+        )
+
+    def warm_up(
+        self,
+        configuration: Configuration,
+        tool_sets: Sequence[Sequence[BaseTool | dict | Callable]] = (),
+        schemas: Sequence[Any] = (),
+    ) -> None:
+        self.get_model(configuration.model, configuration.model_provider)
+        for tools in tool_sets:
+            self.with_tools(configuration.model, configuration.model_provider, tools)
+        for schema in schemas:
+            self.with_structured_output(configuration.model, configuration.model_provider, schema)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._clients.clear()
+            self._derived.clear()
+            self.metrics.set("clients", 0)
+            self.metrics.set("derived", 0)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "client_hit_rate": self.metrics.hit_rate("client_hits", "client_misses"),
+            "derived_hit_rate": self.metrics.hit_rate("derived_hits", "derived_misses"),
+            **self.metrics.snapshot(),
+        }
+
+
+model_registry = ModelRegistry()
+
+
+def get_chat_model(configuration: Configuration, **kwargs: Any) -> BaseChatModel:
+    return model_registry.get_model(
+        configuration.model, configuration.model_provider, **kwargs
+    )
+
+
+def get_chat_model_with_tools(
+    configuration: Configuration,
+    tools: Sequence[BaseTool | dict | Callable],
+    **kwargs: Any,
+) -> Runnable:
+    return model_registry.with_tools(
+        configuration.model, configuration.model_provider, tools, **kwargs
+    )
+
+
+def get_structured_chat_model(
+    configuration: Configuration,
+    schema: Any,
+    **kwargs: Any,
+) -> Runnable:
+    return model_registry.with_structured_output(
+        configuration.model, configuration.model_provider, schema, **kwargs
+    )
+
+
+def warm_up_models(
+    configuration: Optional[Configuration] = None,
+    tool_sets: Sequence[Sequence[BaseTool | dict | Callable]] = (),
+    schemas: Sequence[Any] = (),
+) -> None:
+    model_registry.warm_up(
+        configuration or Configuration.from_runnable_config(),
+        tool_sets=tool_sets,
+        schemas=schemas,
+    )
@@ -172,6 +172,13 @@ effective_writing_guidance = (
 )
 
 
+reason_and_act_step_name = (
+    "Reflection Step and Tool Selection Step, combined in a single response: first write your reflection, "
+    "then select the tools for the next step of your research in the same response, "
+    "or select no tools to move to the Writing Step"
+)
+
+
 deep_research_system_instruction = (
     "<task>\n"
     "You are an expert research assistant that has been assigned to help build a research report. "
@@ -189,4 +196,60 @@ deep_research_system_instruction = (
     "{brief}\n"
     "</brief>\n\n"
     "You are currently in the {current_step}.\n"
-)
\ No newline at end of file
+)
+
+conversation_summary_instructions = (
+    "<task>\n"
+    "You maintain the running summary of a conversation between a user and an assistant, "
+    "so that the assistant can continue the conversation without the older messages.\n\n"
+    "Update the existing summary with the new messages below. The updated summary must keep:"
+    "\n\t- The user's goals, preferences, constraints and any open questions."
+    "\n\t- The facts, figures, dates and conclusions the assistant found, with the sources (names and URLs) they came from."
+    "\n\t- Any document handles (doc_...) that may be needed for follow-up lookups."
+    "\nDrop greetings, repetition and tool output that did not contribute to an answer. "
+    "Write the summary as concise bullet points, and only output the summary.\n"
+    "</task>\n\n"
+    "<existing_summary>\n"
+    "{summary}\n"
+    "</existing_summary>\n\n"
+    "<new_messages>\n"
+    "{conversation}\n"
+    "</new_messages>"
+)
+
+
+conversation_summary_context = (
+    "\n\n<earlier_conversation_summary>\n"
+    "The older part of this conversation has been summarised as follows:\n"
+    "{summary}\n"
+    "</earlier_conversation_summary>\n"
+)
+
+
+research_digest_instructions = (
+    "<task>\n"
+    "You are helping a research assistant who is researching one section of a report. "
+    "The tool outputs below have already been read, and will now be removed from the assistant's context. "
+    "Extract everything in them that is useful for the section described in the brief, so that nothing of value is lost:"
+    "\n\t- notes: self-contained findings, each with the specific facts, figures and dates it relies on, "
+    "and the document handle (doc_...) when a tool returned one."
+    "\n\t- sources: the title, source name and URL of every source a note relies on."
+    "\nIgnore content that is irrelevant to the brief. Do not add information that is not in the tool outputs.\n"
+    "</task>\n\n"
+    "<brief>\n"
+    "{brief}\n"
+    "</brief>\n\n"
+    "<tool_outputs>\n"
+    "{tool_outputs}\n"
+    "</tool_outputs>"
+)
+
+
+research_notes_context = (
+    "<research_notes>\n"
+    "Findings from the tool outputs of your earlier research iterations (the raw outputs are no longer shown):\n"
+    "{notes}\n\n"
+    "Sources:\n"
+    "{sources}\n"
+    "</research_notes>\n\n"
+)
@@ -13,11 +13,15 @@ class State:
     """Main graph state."""
 
     messages: Annotated[list[AnyMessage], add_messages]
+    """The conversation as shown to the client: user messages and final replies.
+    It is kept whole and never sent to the model, so compaction leaves it alone."""
     internal_messages: Annotated[list[AnyMessage], add_messages]
-    """The messages in the conversation."""
+    """The messages the model works from, tool calls included; compaction keeps them bounded."""
     completed_sections: Annotated[list[CompletedSection], add] = field(default_factory=list)
     report_topic: str = ""
     report_high_level_objectives: str = ""
+    summary: str = ""
+    """Running summary of the turns removed from ``internal_messages`` by compaction."""
     
     
 @dataclass(kw_only=True)
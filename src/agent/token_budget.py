@@ -0,0 +1,112 @@
+import threading
+from collections import OrderedDict
+from typing import Callable, Hashable, Literal, Optional, Sequence
+
+from langchain_core.messages import AIMessage, AnyMessage, SystemMessage
+from langchain_core.messages.utils import count_tokens_approximately
+
+from src.tools.metrics import get_metrics
+
+TokenCounter = Callable[[list[AnyMessage]], int]
+
+MAX_CACHED_MESSAGES = 100_000
+
+
+def _fingerprint(message: AnyMessage) -> Hashable:
+    """Identity of a message's content, so a message replaced under the same
+    id (``add_messages`` updates by id) is counted again. ``str`` caches its
+    hash, so repeat lookups of the same message stay cheap."""
+    content = message.content
+    tool_calls = message.tool_calls if isinstance(message, AIMessage) else []
+    return (
+        message.type,
+        hash(content) if isinstance(content, str) else hash(repr(content)),
+        hash(repr([(call["name"], call["args"]) for call in tool_calls])) if tool_calls else 0,
+    )
+
+
+class MessageTokenCache:
+    """Token count of each message, computed once and keyed by message id.
+
+    ``token_counter`` must be additive (the count of a list is the sum of
+    the counts of its messages), as ``count_tokens_approximately`` is.
+    Messages without an id are counted on every call.
+    """
+
+    def __init__(
+        self,
+        token_counter: TokenCounter = count_tokens_approximately,
+        max_entries: int = MAX_CACHED_MESSAGES,
+    ):
+        self.token_counter = token_counter
+        self.max_entries = max_entries
+        self.metrics = get_metrics("token_budget")
+        self._entries: OrderedDict[str, tuple[Hashable, int]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def count(self, message: AnyMessage) -> int:
+        if message.id is None:
+            self.metrics.incr("uncacheable")
+            return self.token_counter([message])
+        fingerprint = _fingerprint(message)
+        with self._lock:
+            entry = self._entries.get(message.id)
+            if entry is not None and entry[0] == fingerprint:
+                self._entries.move_to_end(message.id)
+                return entry[1]
+        self.metrics.incr("misses")
+        tokens = self.token_counter([message])
+        with self._lock:
+            self._entries[message.id] = (fingerprint, tokens)
+            self._entries.move_to_end(message.id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return tokens
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+def trim_to_budget(
+    messages: Sequence[AnyMessage],
+    max_tokens: int,
+    start_on: Optional[Literal["human", "ai", "tool"]] = "human",
+    include_system: bool = True,
+    cache: Optional[MessageTokenCache] = None,
+) -> list[AnyMessage]:
+    """The most recent messages that fit in ``max_tokens``.
+
+    Same result as ``trim_messages(strategy="last", ...)`` with an additive
+    token counter, but the walk starts at the newest message and stops as
+    soon as the budget is full, and each message is counted once per thread
+    rather than once per call: the cost of a turn is proportional to the
+    kept window, not to the whole history.
+    """
+    cache = cache or message_token_cache
+    budget = max_tokens
+    system: Optional[AnyMessage] = None
+    if include_system and messages and isinstance(messages[0], SystemMessage):
+        system = messages[0]
+        budget = max(0, budget - cache.count(system))
+        messages = messages[1:]
+
+    start = len(messages)
+    scanned = 0
+    while start > 0:
+        scanned += 1
+        tokens = cache.count(messages[start - 1])
+        if tokens > budget:
+            break
+        budget -= tokens
+        start -= 1
+    cache.metrics.observe("messages_scanned", scanned)
+
+    if start_on is not None:
+        while start < len(messages) and messages[start].type != start_on:
+            start += 1
+    kept = list(messages[start:])
+    return [system, *kept] if system is not None else kept
+
+
+message_token_cache = MessageTokenCache()
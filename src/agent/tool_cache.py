@@ -0,0 +1,283 @@
+import asyncio
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Optional, Protocol
+
+from src.tools.constants import TOOL_CACHE_DIR, RATE_LIMIT_REDIS_URI
+from src.tools.metrics import get_metrics
+from src.tools.retrieval import document_store
+
+
+# Seconds a tool result is reused, per tool; tools not listed are never cached.
+# The fundamentals, BBC and Hugging Face tools are left out: they keep their
+# own caches and report how fresh their data is (data_status,
+# snapshot_age_seconds), which a replayed result would freeze.
+TOOL_CACHE_TTLS: dict[str, float] = {
+    "tavily_search": 900,
+    "multi_web_search": 900,
+    "analyze_price_history": 900,
+    "fetch_stock_related_news": 600,
+    "read_hf_paper_from_url": 24 * 3600,
+}
+MEMORY_MAX_ENTRIES = 1024
+SQLITE_MAX_ENTRIES = 20_000
+DOCUMENT_HANDLE_PATTERN = re.compile(r"doc_[0-9a-f]{12}")
+# Tools that return plain text report failures with these prefixes.
+ERROR_PREFIXES = ("Error", "An unexpected error")
+
+
+class ToolCacheBackend(Protocol):
+    shared: bool
+    """Whether entries are visible to other processes."""
+
+    async def get(self, key: str) -> Optional[str]:
+        ...
+
+    async def set(self, key: str, value: str, ttl: float) -> None:
+        ...
+
+
+class MemoryBackend:
+    shared = False
+
+    def __init__(self, max_entries: int = MEMORY_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[float, str]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    async def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    async def set(self, key: str, value: str, ttl: float) -> None:
+        with self._lock:
+            self._entries[key] = (time.time() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+class SqliteBackend:
+    """Tool results in a SQLite file, shared by the processes on one host."""
+
+    shared = True
+
+    def __init__(self, path: Path = TOOL_CACHE_DIR / "tool_results.sqlite3", max_entries: int = SQLITE_MAX_ENTRIES):
+        self.path = Path(path)
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+
+    def _conn(self) -> sqlite3.Connection:
+        if self._db is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(self.path, check_same_thread=False)
+            self._db.executescript(
+                """
+                PRAGMA journal_mode=WAL;
+                CREATE TABLE IF NOT EXISTS results (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    expires_at REAL NOT NULL,
+                    last_access REAL NOT NULL
+                );
+                """
+            )
+        return self._db
+
+    def _get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            db = self._conn()
+            row = db.execute(
+                "SELECT value FROM results WHERE key = ? AND expires_at > ?", (key, now)
+            ).fetchone()
+            if row is None:
+                return None
+            db.execute("UPDATE results SET last_access = ? WHERE key = ?", (now, key))
+            db.commit()
+            return row[0]
+
+    def _set(self, key: str, value: str, ttl: float) -> None:
+        now = time.time()
+        with self._lock:
+            db = self._conn()
+            db.execute(
+                "INSERT OR REPLACE INTO results (key, value, expires_at, last_access) VALUES (?, ?, ?, ?)",
+                (key, value, now + ttl, now),
+            )
+            db.execute("DELETE FROM results WHERE expires_at <= ?", (now,))
+            db.execute(
+                "DELETE FROM results WHERE key IN ("
+                "SELECT key FROM results ORDER BY last_access DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+            db.commit()
+
+    async def get(self, key: str) -> Optional[str]:
+        return await asyncio.to_thread(self._get, key)
+
+    async def set(self, key: str, value: str, ttl: float) -> None:
+        await asyncio.to_thread(self._set, key, value, ttl)
+
+
+class RedisBackend:
+    """Tool results in Redis, shared by every API replica.
+
+    Entries expire with their TTL; size is bounded by the server's
+    ``maxmemory`` with an LRU ``maxmemory-policy``.
+    """
+
+    shared = True
+
+    def __init__(self, redis_client: Any, key_prefix: str = "tools:results:"):
+        self.redis = redis_client
+        self.key_prefix = key_prefix
+
+    async def get(self, key: str) -> Optional[str]:
+        value = await self.redis.get(self.key_prefix + key)
+        return value.decode() if isinstance(value, bytes) else value
+
+    async def set(self, key: str, value: str, ttl: float) -> None:
+        await self.redis.set(self.key_prefix + key, value, ex=max(1, int(ttl)))
+
+
+def _canonical(value: Any) -> Any:
+    if isinstance(value, str):
+        return value.strip()
+    if isinstance(value, dict):
+        return {str(k): _canonical(v) for k, v in value.items() if v is not None}
+    if isinstance(value, (list, tuple)):
+        return [_canonical(v) for v in value]
+    return value
+
+
+def cache_key(tool_name: str, args: dict[str, Any]) -> str:
+    """``tool_name`` plus a digest of its arguments, independent of key order,
+    surrounding whitespace and arguments explicitly passed as ``None``."""
+    canonical = json.dumps(_canonical(args), sort_keys=True, separators=(",", ":"), default=str)
+    return f"{tool_name}:{hashlib.sha256(canonical.encode()).hexdigest()[:32]}"
+
+
+class ToolResultCache:
+    """Memoises tool results across runs, keyed by tool name and canonical arguments.
+
+    Only tools with a TTL are cached, and error results never are. Concurrent
+    identical calls on the same event loop are coalesced: the first one runs
+    the tool and the others wait for its result (``coalesced``). Results that
+    reference an in-process document handle are not written to shared
+    backends, since other processes cannot resolve the handle, and are only
+    reused while the document store still holds every handle they mention
+    (``stale_handles`` otherwise).
+    """
+
+    def __init__(self, backend: ToolCacheBackend, ttls: Optional[dict[str, float]] = None):
+        self.backend = backend
+        self.ttls = dict(TOOL_CACHE_TTLS if ttls is None else ttls)
+        self.metrics = get_metrics("tool_cache")
+        self._inflight: dict[str, asyncio.Future] = {}
+
+    def _cacheable(self, result: Any, content: str) -> bool:
+        if isinstance(result, dict) and "error" in result:
+            return False
+        if isinstance(result, str) and result.startswith(ERROR_PREFIXES):
+            return False
+        return not (self.backend.shared and DOCUMENT_HANDLE_PATTERN.search(content))
+
+    @staticmethod
+    def _handles_resolve(content: str) -> bool:
+        return all(document_store.get(handle) is not None for handle in DOCUMENT_HANDLE_PATTERN.findall(content))
+
+    async def call(
+        self, tool_name: str, args: dict[str, Any], run: Callable[[], Awaitable[Any]]
+    ) -> tuple[Any, str]:
+        """``(result, cache_status)``, where the status is hit, miss, coalesced or bypass."""
+        ttl = self.ttls.get(tool_name)
+        if not ttl:
+            self.metrics.incr("bypass")
+            return await run(), "bypass"
+
+        key = cache_key(tool_name, args)
+        try:
+            cached = await self.backend.get(key)
+        except Exception:
+            self.metrics.incr("backend_errors")
+            cached = None
+        if cached is not None and not self._handles_resolve(cached):
+            # The document store evicted the handle: run the tool again to re-index it.
+            self.metrics.incr("stale_handles")
+            cached = None
+        if cached is not None:
+            self.metrics.incr("hits")
+            self.metrics.incr(f"hits.{tool_name}")
+            return json.loads(cached), "hit"
+
+        loop = asyncio.get_running_loop()
+        inflight = self._inflight.get(key)
+        if inflight is not None and inflight.get_loop() is loop:
+            self.metrics.incr("coalesced")
+            return await asyncio.shield(inflight), "coalesced"
+
+        self.metrics.incr("misses")
+        self.metrics.incr(f"misses.{tool_name}")
+        future = loop.create_future()
+        self._inflight[key] = future
+        try:
+            result = await run()
+        except asyncio.CancelledError:
+            # The leader timed out: the calls waiting on it time out with it.
+            future.set_exception(asyncio.TimeoutError())
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+        finally:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+            # Mark any exception as retrieved, in case nobody was waiting for it.
+            future.exception()
+
+        content = json.dumps(result)
+        if self._cacheable(result, content):
+            try:
+                await self.backend.set(key, content, ttl)
+                self.metrics.incr("stores")
+            except Exception:
+                self.metrics.incr("backend_errors")
+        return result, "miss"
+
+
+def create_tool_cache(kind: Optional[str] = None) -> Optional[ToolResultCache]:
+    """The cache selected by ``TOOL_RESULT_CACHE``: memory (default), sqlite, redis or off."""
+    kind = (kind or os.environ.get("TOOL_RESULT_CACHE", "memory")).lower()
+    if kind == "off":
+        return None
+    if kind == "sqlite":
+        return ToolResultCache(SqliteBackend())
+    if kind == "redis":
+        import redis.asyncio
+
+        uri = os.environ.get("TOOL_RESULT_CACHE_REDIS_URI") or RATE_LIMIT_REDIS_URI
+        if not uri:
+            raise ValueError("TOOL_RESULT_CACHE=redis requires TOOL_RESULT_CACHE_REDIS_URI")
+        return ToolResultCache(RedisBackend(redis.asyncio.from_url(uri)))
+    return ToolResultCache(MemoryBackend())
+
+
+tool_result_cache = create_tool_cache()
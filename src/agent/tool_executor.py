@@ -0,0 +1,170 @@
+import asyncio
+import contextvars
+import json
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Sequence
+
+from langchain_core.messages import ToolCall, ToolMessage
+from langchain_core.tools import BaseTool, StructuredTool
+
+from src.agent.loop_monitor import ensure_loop_monitor
+from src.agent.tool_cache import tool_result_cache
+from src.tools.http import tool_deadline
+from src.tools.metrics import get_metrics
+
+logger = logging.getLogger(__name__)
+
+metrics = get_metrics("tool_executor")
+
+# Worker threads per blocking tool. Sized to what each upstream tolerates,
+# so a burst of one tool cannot starve the others.
+TOOL_POOL_SIZES: dict[str, int] = {
+    "fetch_stock_fundamentals": 8,
+    "fetch_multiple_stock_fundamentals": 2,
+    "analyze_price_history": 2,
+    "fetch_stock_related_news": 4,
+    "fetch_latest_news": 4,
+    "fetch_hf_papers": 2,
+    "read_hf_paper_from_url": 4,
+}
+DEFAULT_POOL_SIZE = 4
+
+_executors: dict[str, ThreadPoolExecutor] = {}
+_executors_lock = threading.Lock()
+# Workers per tool still running a call that already timed out.
+_abandoned: dict[str, int] = {}
+
+
+def _get_executor(tool_name: str) -> ThreadPoolExecutor:
+    with _executors_lock:
+        if tool_name not in _executors:
+            _executors[tool_name] = ThreadPoolExecutor(
+                max_workers=TOOL_POOL_SIZES.get(tool_name, DEFAULT_POOL_SIZE),
+                thread_name_prefix=f"tool-{tool_name}",
+            )
+        return _executors[tool_name]
+
+
+def _is_async_native(tool: BaseTool) -> bool:
+    if isinstance(tool, StructuredTool):
+        return tool.coroutine is not None
+    return type(tool)._arun is not BaseTool._arun
+
+
+def _error_message(tool_call: ToolCall, error: str) -> ToolMessage:
+    return ToolMessage(
+        content=json.dumps({"error": error}),
+        name=tool_call["name"],
+        tool_call_id=tool_call["id"],
+        status="error",
+    )
+
+
+def _release_worker(tool_name: str) -> None:
+    with _executors_lock:
+        _abandoned[tool_name] -= 1
+        count = _abandoned[tool_name]
+    metrics.set(f"abandoned_workers.{tool_name}", count)
+
+
+def _abandon_worker(tool_name: str, future: Future) -> None:
+    """Account for a worker still running a call whose caller has given up."""
+    with _executors_lock:
+        _abandoned[tool_name] = count = _abandoned.get(tool_name, 0) + 1
+    metrics.incr("abandoned_workers")
+    metrics.set(f"abandoned_workers.{tool_name}", count)
+    pool_size = TOOL_POOL_SIZES.get(tool_name, DEFAULT_POOL_SIZE)
+    if count >= pool_size:
+        metrics.incr(f"pool_saturated.{tool_name}")
+        logger.warning(
+            f"All {pool_size} workers of {tool_name} are running timed-out calls; "
+            "new calls queue until one of them returns"
+        )
+    future.add_done_callback(lambda _: _release_worker(tool_name))
+
+
+async def _run_tool(tool: BaseTool, args: dict[str, Any], deadline: float) -> Any:
+    if _is_async_native(tool):
+        return await tool.ainvoke(args)
+    # The worker sees the deadline, so the shared HTTP client stops waiting for it.
+    context = contextvars.copy_context()
+    context.run(tool_deadline.set, deadline)
+    future = _get_executor(tool.name).submit(context.run, tool.invoke, args)
+    try:
+        return await asyncio.wrap_future(future)
+    except asyncio.CancelledError:
+        # A call still queued is dropped; one already running cannot be stopped.
+        if not future.cancel():
+            _abandon_worker(tool.name, future)
+        raise
+
+
+async def _call_tool(tool: BaseTool, args: dict[str, Any], deadline: float) -> tuple[Any, str]:
+    if tool_result_cache is None:
+        return await _run_tool(tool, args, deadline), "off"
+    return await tool_result_cache.call(tool.name, args, lambda: _run_tool(tool, args, deadline))
+
+
+async def _execute_tool_call(
+    tool_call: ToolCall,
+    tools_by_name: dict[str, BaseTool],
+    semaphore: asyncio.Semaphore,
+    timeout: float,
+) -> ToolMessage:
+    tool = tools_by_name.get(tool_call["name"])
+    if tool is None:
+        metrics.incr("unknown_tool")
+        return _error_message(tool_call, f"Unknown tool: {tool_call['name']}")
+    async with semaphore:
+        try:
+            tool_result, cache_status = await asyncio.wait_for(
+                _call_tool(tool, tool_call["args"], time.monotonic() + timeout), timeout=timeout
+            )
+        except asyncio.TimeoutError:
+            metrics.incr("timeouts")
+            return _error_message(
+                tool_call, f"Tool '{tool_call['name']}' timed out after {timeout} seconds"
+            )
+        except Exception as e:
+            metrics.incr("failures")
+            return _error_message(tool_call, str(e))
+    metrics.incr("completed")
+    return ToolMessage(
+        content=json.dumps(tool_result),
+        name=tool_call["name"],
+        tool_call_id=tool_call["id"],
+        response_metadata={"tool_cache": cache_status},
+    )
+
+
+async def execute_tool_calls(
+    tool_calls: Sequence[ToolCall],
+    tools: Sequence[BaseTool],
+    max_concurrency: int = 4,
+    timeout: float = 60.0,
+) -> list[ToolMessage]:
+    """Run the tool calls of one AIMessage concurrently.
+
+    At most ``max_concurrency`` calls run at once and each is bounded by
+    ``timeout`` seconds. A failing or timed-out call becomes an error
+    ToolMessage; the returned messages follow the original call order.
+    Blocking tools run on a bounded per-tool thread pool so they never
+    hold up the event loop; their requests through the shared HTTP client
+    stop at the timeout, and workers still busy after it are counted in
+    the ``abandoned_workers`` metrics. Results go through ``tool_result_cache`` and
+    each ToolMessage records the outcome in ``response_metadata["tool_cache"]``.
+    """
+    ensure_loop_monitor()
+    tools_by_name = {tool.name: tool for tool in tools}
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+    return list(
+        await asyncio.gather(
+            *[
+                _execute_tool_call(tool_call, tools_by_name, semaphore, timeout)
+                for tool_call in tool_calls
+            ]
+        )
+    )
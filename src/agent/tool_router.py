@@ -0,0 +1,160 @@
+import json
+import logging
+from typing import Sequence
+
+from langchain_core.messages import AIMessage, AnyMessage, HumanMessage, ToolMessage
+from langchain_core.tools import BaseTool
+from langchain_core.utils.function_calling import convert_to_openai_tool
+
+from src.agent.config import Configuration
+from src.agent.tool_cache import DOCUMENT_HANDLE_PATTERN
+from src.tools import agent_tool_kit
+from src.tools.metrics import get_metrics
+from src.tools.retrieval import tokenize
+
+logger = logging.getLogger(__name__)
+
+# Tools bound on every routed call: general search is the answer to anything
+# the groups below do not cover.
+ALWAYS_AVAILABLE = ("tavily_search", "multi_web_search")
+# Tool groups and the whole words that select them. Plurals are listed
+# explicitly, and generic words ("share", "current", "latest") are left out
+# because they select a group far more often than they should.
+TOOL_GROUPS: dict[str, tuple[tuple[str, ...], frozenset[str]]] = {
+    "markets": (
+        (
+            "fetch_stock_fundamentals",
+            "fetch_multiple_stock_fundamentals",
+            "analyze_price_history",
+            "fetch_stock_related_news",
+        ),
+        frozenset((
+            "stock", "stocks", "shares", "shareholder", "shareholders", "ticker", "tickers",
+            "equity", "equities", "market", "markets", "price", "prices", "valuation",
+            "earnings", "dividend", "dividends", "revenue", "fundamentals", "portfolio",
+            "invest", "investing", "investment", "investments", "investor", "investors",
+            "sharpe", "volatility", "drawdown", "nasdaq", "nyse", "sp500", "etf", "etfs",
+            "finance", "financial", "financials",
+        )),
+    ),
+    "news": (
+        ("fetch_latest_news", "fetch_stock_related_news"),
+        frozenset((
+            "news", "headline", "headlines", "bbc", "breaking", "politics", "political",
+            "election", "elections", "sport", "sports",
+        )),
+    ),
+    "papers": (
+        ("fetch_hf_papers", "read_hf_paper_from_url"),
+        frozenset((
+            "paper", "papers", "arxiv", "huggingface", "hugging", "hf", "preprint", "preprints",
+            "llm", "llms", "ml", "neural", "transformer", "transformers", "diffusion",
+            "benchmark", "benchmarks", "dataset", "datasets",
+        )),
+    ),
+}
+DOCUMENT_TOOL = "lookup_document"
+CHARS_PER_TOKEN = 4.0
+
+
+def schema_tokens(tool: BaseTool) -> int:
+    """Approximate prompt tokens taken by the tool's schema once bound to a model."""
+    return round(len(json.dumps(convert_to_openai_tool(tool))) / CHARS_PER_TOKEN)
+
+
+def latest_human_text(messages: Sequence[AnyMessage]) -> str:
+    for message in reversed(messages):
+        if isinstance(message, HumanMessage):
+            return message.text()
+    return ""
+
+
+class ToolRouter:
+    """Picks the tools to bind for one model call from cheap keyword matching.
+
+    The text (the latest user message, or a section's research objectives) is
+    tokenised and its whole words matched against each group's keywords. The
+    general search tools are always bound, plus the matched groups and the
+    groups whose tools the conversation has already called, so follow-ups
+    ("and MSFT?") keep them. Tools are bound in kit order so the bound
+    runnables stay cacheable. ``lookup_document`` is added once a document
+    handle appears in the conversation. When no group matches (e.g. a bare
+    ticker, "How is NVDA doing?") or there is no text to route on, the
+    router cannot tell what is needed and returns the full kit.
+    """
+
+    def __init__(
+        self,
+        tools: Sequence[BaseTool],
+        groups: dict[str, tuple[tuple[str, ...], frozenset[str]]] = TOOL_GROUPS,
+        always: Sequence[str] = ALWAYS_AVAILABLE,
+    ):
+        self.tools = list(tools)
+        self.groups = groups
+        self.always = frozenset(always)
+        self.metrics = get_metrics("tool_router")
+        self._schema_tokens = {tool.name: schema_tokens(tool) for tool in self.tools}
+        self.full_kit_tokens = sum(self._schema_tokens.values())
+
+    def tools_tokens(self, tools: Sequence[BaseTool]) -> int:
+        """Approximate schema tokens of ``tools`` once bound, kit or not."""
+        return sum(
+            self._schema_tokens[tool.name] if tool.name in self._schema_tokens else schema_tokens(tool)
+            for tool in tools
+        )
+
+    def matched_groups(self, text: str) -> list[str]:
+        tokens = set(tokenize(text))
+        return [group for group, (_, keywords) in self.groups.items() if not tokens.isdisjoint(keywords)]
+
+    def used_groups(self, messages: Sequence[AnyMessage]) -> list[str]:
+        """Groups whose tools were called in ``messages``."""
+        called = {
+            tool_call["name"]
+            for message in messages
+            if isinstance(message, AIMessage)
+            for tool_call in message.tool_calls
+        }
+        return [group for group, (names, _) in self.groups.items() if not called.isdisjoint(names)]
+
+    def select(self, text: str, messages: Sequence[AnyMessage] = ()) -> list[BaseTool]:
+        if not text.strip():
+            self.metrics.incr("full_kit")
+            return self.tools
+
+        groups = list(dict.fromkeys([*self.matched_groups(text), *self.used_groups(messages)]))
+        if not groups:
+            self.metrics.incr("unmatched")
+            self.metrics.incr("full_kit")
+            return self.tools
+        names = set(self.always)
+        for group in groups:
+            names.update(self.groups[group][0])
+        if any(
+            isinstance(message, ToolMessage) and DOCUMENT_HANDLE_PATTERN.search(str(message.content))
+            for message in messages
+        ):
+            names.add(DOCUMENT_TOOL)
+        selected = [tool for tool in self.tools if tool.name in names]
+
+        saved = self.full_kit_tokens - sum(self._schema_tokens[tool.name] for tool in selected)
+        self.metrics.incr("routed")
+        self.metrics.observe("tools_bound", len(selected))
+        self.metrics.observe("schema_tokens_saved", saved)
+        logger.info(
+            f"Tool router matched {', '.join(groups)}: binding {len(selected)}/{len(self.tools)} tools, "
+            f"~{saved} schema tokens saved"
+        )
+        return selected
+
+
+tool_router = ToolRouter(agent_tool_kit)
+
+
+def route_tools(
+    configuration: Configuration, text: str, messages: Sequence[AnyMessage] = ()
+) -> list[BaseTool]:
+    """The tools to bind for this call, or the full kit when routing is off."""
+    if configuration.tool_routing == "off":
+        return agent_tool_kit
+    return tool_router.select(text, messages)
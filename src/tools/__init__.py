@@ -1,19 +1,28 @@
 from langchain_core.tools import BaseTool
 
-from src.tools.web_search import web_search_tool
-from src.tools.stock_fundamentals import fetch_stock_fundamentals
+from src.tools.web_search import web_search_tool, multi_web_search
+from src.tools.stock_fundamentals import (
+    fetch_stock_fundamentals,
+    fetch_multiple_stock_fundamentals,
+)
+from src.tools.price_history import analyze_price_history
 from src.tools.stock_news import fetch_stock_related_news
 from src.tools.bbc_news import fetch_latest_news
 from src.tools.hf_papers import fetch_hf_papers
 from src.tools.fetch_hf_paper import read_hf_paper_from_url
+from src.tools.retrieval import lookup_document
 
 agent_tool_kit: list[BaseTool] = [
     web_search_tool,
+    multi_web_search,
     fetch_stock_fundamentals,
+    fetch_multiple_stock_fundamentals,
+    analyze_price_history,
     fetch_stock_related_news,
     fetch_latest_news,
     fetch_hf_papers,
-    read_hf_paper_from_url
+    read_hf_paper_from_url,
+    lookup_document,
 ]
 
 __all__ = [
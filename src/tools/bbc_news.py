@@ -1,11 +1,18 @@
-from typing import Any, Literal
-import requests
+import asyncio
+import time
+from collections import Counter
+from typing import Any, Literal, Optional
 
-import bbc
-from bs4 import BeautifulSoup
 from langchain_core.tools import tool
 
-from src.tools.constants import HEADERS
+from src.tools.constants import BBC_WARM_INTERVAL, CACHE_WARMER_BBC_CATEGORIES
+from src.tools.extract import extract_text, rules_for
+from src.tools.http import http_client, HttpResponse
+from src.tools.lazy import lazy_module
+from src.tools.retrieval import focus
+from src.tools.warmer import cache_warmer
+
+bbc = lazy_module("bbc")
 
 
 NewsCategories = Literal[
@@ -33,71 +40,187 @@ NewsCategories = Literal[
 ]
 
 
+ARTICLE_URL_PREFIX = "https://bbc.com/news/articles/"
+FETCH_DEADLINE = 20.0
+# Failure reason of the articles still loading at the deadline; the others
+# fail with ``HTTP <status>`` or the exception's class name.
+DEADLINE = "deadline"
+
+
+def _article_content(url: str, content: bytes) -> str:
+    return extract_text(content, rules_for(url))
+
+
+def _article_links(section_news: list[dict[str, str]]) -> list[dict[str, str]]:
+    return [
+        news_dict for news_dict in section_news
+        if isinstance(news_dict.get("news_link", None), str)
+        and news_dict["news_link"].startswith(ARTICLE_URL_PREFIX)
+    ]
+
+
+async def _fetch_pages(urls: list[str], deadline: float) -> dict[str, HttpResponse | str]:
+    """The response for each URL that loaded, or the reason it failed."""
+    tasks = {asyncio.ensure_future(http_client.aget(url)): url for url in urls}
+    if not tasks:
+        return {}
+    done, pending = await asyncio.wait(tasks, timeout=max(0.0, deadline))
+    outcomes: dict[str, HttpResponse | str] = {}
+    for task in pending:
+        task.cancel()
+        outcomes[tasks[task]] = DEADLINE
+    for task in done:
+        if task.exception() is not None:
+            outcomes[tasks[task]] = type(task.exception()).__name__
+        elif task.result().status_code != 200:
+            outcomes[tasks[task]] = f"HTTP {task.result().status_code}"
+        else:
+            outcomes[tasks[task]] = task.result()
+    return outcomes
+
+
+def _fetch_news_results(
+    articles: list[dict[str, str]], deadline: float, query: Optional[str] = None
+) -> list[dict[str, str]]:
+    """Fetch all article pages concurrently, giving up on those not done by ``deadline`` seconds.
+
+    Returns one entry per article, in their original order: the record, or
+    for an article that could not be loaded, its title, url and ``failure``.
+    """
+    urls = [news_dict["news_link"] for news_dict in articles]
+    responses = http_client.run(_fetch_pages(urls, deadline))
+    news_results: list[dict[str, str]] = []
+    for news_dict in articles:
+        response = responses.get(news_dict["news_link"], DEADLINE)
+        if isinstance(response, str):
+            news_results.append({
+                "Title": news_dict.get("title", "UNKNOWN"),
+                "url": news_dict["news_link"],
+                "failure": response,
+            })
+            continue
+        content = http_client.parse(
+            response,
+            "bbc_article_text:v2",
+            lambda: _article_content(news_dict["news_link"], response.content),
+        )
+        record = {
+            "Title": news_dict.get("title", "UNKNOWN"),
+            "url": news_dict["news_link"],
+            "content": content,
+        }
+        if query:
+            record.update(focus(news_dict["news_link"], content, query))
+        news_results.append(record)
+    return news_results
+
+
+def split_failures(news_results: list[dict[str, str]]) -> tuple[list[dict[str, str]], list[str]]:
+    """The loaded records, and the failure reason of each article that was not loaded."""
+    records = [record for record in news_results if "failure" not in record]
+    failures = [record["failure"] for record in news_results if "failure" in record]
+    return records, failures
+
+
+def _failure_note(failures: list[str]) -> Optional[str]:
+    if not failures:
+        return None
+    notes = []
+    timed_out = failures.count(DEADLINE)
+    if timed_out:
+        notes.append(f"{timed_out} article(s) could not be loaded within {FETCH_DEADLINE:.0f} seconds and were skipped.")
+    errors = Counter(failure for failure in failures if failure != DEADLINE)
+    if errors:
+        reasons = ", ".join(f"{reason} x{count}" if count > 1 else reason for reason, count in errors.items())
+        notes.append(f"{errors.total()} article(s) could not be loaded ({reasons}) and were skipped.")
+    return " ".join(notes)
+
+
+def _crawl_category(category: str, max_articles: Optional[int] = None, query: Optional[str] = None) -> list[dict[str, str]]:
+    start = time.monotonic()
+    news = bbc.news.get_news(
+        language=bbc.languages.Languages.English
+    )
+    section_news = news.news_category(category)
+    articles = _article_links(section_news)
+    if max_articles is not None:
+        articles = articles[:max(0, max_articles)]
+    return _fetch_news_results(
+        articles, deadline=FETCH_DEADLINE - (time.monotonic() - start), query=query
+    )
+
+
+def _warm_key(category: str) -> str:
+    return f"bbc_news:{category}"
+
+
+def _from_snapshot(
+    news_results: list[dict[str, str]], max_articles: Optional[int], query: Optional[str]
+) -> list[dict[str, str]]:
+    if max_articles is not None:
+        news_results = news_results[:max(0, max_articles)]
+    if not query:
+        return news_results
+    return [
+        record if "failure" in record else {**record, **focus(record["url"], record["content"], query)}
+        for record in news_results
+    ]
+
+
+for _category in CACHE_WARMER_BBC_CATEGORIES:
+    cache_warmer.register(
+        _warm_key(_category),
+        lambda category=_category: _crawl_category(category),
+        interval=BBC_WARM_INTERVAL,
+    )
+
+
 @tool("fetch_latest_news")
-def fetch_latest_news(category: NewsCategories) -> dict[str, Any]:
+def fetch_latest_news(
+    category: NewsCategories,
+    max_articles: Optional[int] = None,
+    query: Optional[str] = None,
+) -> dict[str, Any]:
     """Fetch latest news from the BBC by category.
     Retrieves the latest news articles from the BBC in the specified category.
 
     Args:
-    category : Literal[
-        'Latest',
-        'Only from the BBC',
-        'Arts in Motion',
-        'Listen',
-        'Must watch',
-        'The SpeciaList',
-        'Culture',
-        'US & Canada news',
-        'More world news',
-        'Sport',
-        'Business',
-        'Latest audio',
-        'Tech',
-        'Science & health',
-        'Arts',
-        'Watch',
-        'Travel',
-        "World's Table",
-        'Earth',
-        'Video',
-        'Discover more from the BBC'
-    ]
+    category : NewsCategories
+        The BBC section to read, e.g. 'Latest', 'Business', 'Tech' or 'Science & health'.
+    max_articles : Optional[int]
+        The maximum number of articles to return (default: all articles in the category).
+    query : Optional[str]
+        Return only the passages of each article relevant to this query, plus a document handle for follow-up lookups.
 
     Returns:
     dict[str, Any]
         A dictionary containing the category and a list of news articles or an error message.
+        Articles served from the background refresh include snapshot_age_seconds, their age in seconds.
     """
     try:
-        news = bbc.news.get_news(
-            language=bbc.languages.Languages.English
-        )
-        section_news = news.news_category(category)
-        news_results: list[dict[str, str]] = []
-        for news_dict in section_news:
-            url = news_dict.get("news_link", None)
-            if isinstance(url, str) and url.startswith("https://bbc.com/news/articles/"):
-                response = requests.get(url, headers=HEADERS)
-                soup = BeautifulSoup(response.content, "html.parser")
-                paras = soup.find_all("p")
-                content = "\n".join([d.get_text() for d in paras])
-                record = {
-                    "Title": news_dict.get("title", "UNKNOWN"),
-                    "url": url,
-                    "content": content,
-                }
-                news_results.append(record)
+        snapshot = cache_warmer.get(_warm_key(category))
+        if snapshot is not None:
+            news_results = _from_snapshot(snapshot.value, max_articles, query)
+        else:
+            news_results = _crawl_category(category, max_articles, query)
+        news_results, failures = split_failures(news_results)
         if len(news_results) == 0:
             return {
                 "query": category,
                 "error": f"No news found for category: {category}"
             }
-        return {
+        result: dict[str, Any] = {
             "query": category,
             "news_results": news_results
         }
+        if note := _failure_note(failures):
+            result["note"] = note
+        if snapshot is not None:
+            result["snapshot_age_seconds"] = round(snapshot.age)
+        return result
         
     except Exception as e:
         return {
             "query": category,
             "error": str(e)
-        }
\ No newline at end of file
+        }
@@ -1,4 +1,87 @@
+import os
+from pathlib import Path
+
 HEADERS = {
     "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
     "Accept-Language": "en-US,en;q=0.9",
-}
\ No newline at end of file
+}
+
+HTTP_TIMEOUT = 30.0
+HTTP_CONNECT_TIMEOUT = 5.0
+HTTP_MAX_CONNECTIONS = 100
+HTTP_MAX_KEEPALIVE_CONNECTIONS = 20
+
+# Maximum in-flight requests per host; hosts not listed use the default.
+HOST_CONCURRENCY_LIMITS = {
+    "huggingface.co": 4,
+    "arxiv.org": 4,
+    "bbc.com": 8,
+    "www.bbc.com": 8,
+    "finance.yahoo.com": 8,
+}
+DEFAULT_HOST_CONCURRENCY = 8
+
+
+TOOL_CACHE_DIR = Path(
+    os.environ.get("TOOL_CACHE_DIR", Path.home() / ".cache" / "langgraph-tools")
+)
+
+HTTP_CACHE_ENABLED = os.environ.get("HTTP_CACHE_ENABLED", "1") != "0"
+HTTP_CACHE_MAX_BYTES = 512 * 1024 * 1024
+
+# Seconds a cached response is served without revalidation, per host.
+HTTP_CACHE_TTLS = {
+    "arxiv.org": 30 * 24 * 3600,
+    "huggingface.co": 3600,
+    "bbc.com": 300,
+    "www.bbc.com": 300,
+    "finance.yahoo.com": 900,
+}
+DEFAULT_HTTP_CACHE_TTL = 600
+
+PAPER_STORE_MAX_BYTES = 256 * 1024 * 1024
+# Seconds the text of an unversioned arXiv URL is reused before it is fetched
+# again, in case a newer version has been published since.
+PAPER_STORE_LATEST_TTL = 24 * 3600
+
+# Token-bucket limits per host as (requests per second, burst).
+HOST_RATE_LIMITS = {
+    "huggingface.co": (1.5, 5),
+}
+# When set, rate-limit buckets live in Redis and are shared by all API replicas.
+RATE_LIMIT_REDIS_URI = os.environ.get("RATE_LIMIT_REDIS_URI")
+
+# Seconds before volatile fields (upvotes) of an indexed HF paper are refreshed.
+HF_PAPER_VOLATILE_TTL = 3600
+
+# Background refresh of feed-style tools (see src/tools/warmer.py), enabled with CACHE_WARMER=1.
+CACHE_WARMER_ENABLED = os.environ.get("CACHE_WARMER", "0") != "0"
+CACHE_WARMER_CONCURRENCY = 2
+# Each refresh is scheduled within +/- this fraction of the job's interval.
+CACHE_WARMER_JITTER = 0.1
+CACHE_WARMER_BBC_CATEGORIES = [
+    category.strip()
+    for category in os.environ.get(
+        "CACHE_WARMER_BBC_CATEGORIES", "Latest,Business,Tech,Science & health"
+    ).split(",")
+    if category.strip()
+]
+BBC_WARM_INTERVAL = 300
+HF_PAPERS_WARM_INTERVAL = 1800
+
+# Stock fundamentals are cached for FUNDAMENTALS_TTL_OPEN seconds while the
+# exchange is open and until the next open (at most FUNDAMENTALS_TTL_CLOSED_MAX)
+# while it is closed. Expired entries are still served, marked stale, for up to
+# FUNDAMENTALS_STALE_MAX seconds when a refresh fails.
+FUNDAMENTALS_TTL_OPEN = 300
+FUNDAMENTALS_TTL_CLOSED_MAX = 12 * 3600
+FUNDAMENTALS_STALE_MAX = 7 * 24 * 3600
+FUNDAMENTALS_MAX_WORKERS = 8
+MAX_SYMBOLS_PER_CALL = 20
+
+# Daily price history is refreshed at most every PRICE_HISTORY_TTL_OPEN seconds
+# while the market is open; the last few stored days are re-downloaded on each
+# refresh to pick up late corrections.
+PRICE_HISTORY_TTL_OPEN = 900
+PRICE_HISTORY_TTL_CLOSED_MAX = 12 * 3600
+PRICE_HISTORY_OVERLAP_DAYS = 5
@@ -0,0 +1,116 @@
+import importlib.util
+import io
+from dataclasses import dataclass
+from typing import Literal, Optional
+
+from src.tools.http import host_of
+from src.tools.lazy import lazy_module
+
+LXML_AVAILABLE = importlib.util.find_spec("lxml") is not None
+if LXML_AVAILABLE:
+    etree = lazy_module("lxml.etree")
+
+Engine = Literal["lxml", "bs4"]
+
+
+@dataclass(frozen=True)
+class SiteRules:
+    """Boilerplate stripping rules for one site.
+
+    Paragraphs inside any of ``drop_tags`` are skipped, paragraphs shorter
+    than ``min_paragraph_chars`` are ignored and every string in
+    ``removals`` is removed from the final text.
+    """
+    drop_tags: tuple[str, ...] = ("script", "style", "noscript", "template")
+    removals: tuple[str, ...] = ()
+    min_paragraph_chars: int = 0
+
+
+DEFAULT_RULES = SiteRules()
+
+SITE_RULES: dict[str, SiteRules] = {
+    "bbc.com": SiteRules(
+        drop_tags=("script", "style", "noscript", "template", "nav", "footer"),
+    ),
+    "www.bbc.com": SiteRules(
+        drop_tags=("script", "style", "noscript", "template", "nav", "footer"),
+    ),
+    "finance.yahoo.com": SiteRules(
+        removals=("Oops, something went wrong",),
+    ),
+}
+
+
+def rules_for(url: str) -> SiteRules:
+    return SITE_RULES.get(host_of(url), DEFAULT_RULES)
+
+
+def _lxml_paragraphs(content: bytes, rules: SiteRules) -> list[str]:
+    # Streams the document and frees each subtree once closed, so memory
+    # stays proportional to the deepest open element rather than the page.
+    paragraphs: list[str] = []
+    skip_depth = 0
+    paragraph_depth = 0
+    for event, element in etree.iterparse(
+        io.BytesIO(content),
+        events=("start", "end"),
+        html=True,
+        recover=True,
+        no_network=True,
+        huge_tree=True,
+    ):
+        tag = element.tag if isinstance(element.tag, str) else ""
+        if event == "start":
+            if tag in rules.drop_tags:
+                skip_depth += 1
+            elif tag == "p":
+                paragraph_depth += 1
+            continue
+        if tag in rules.drop_tags:
+            skip_depth -= 1
+        elif tag == "p":
+            paragraph_depth -= 1
+            if skip_depth == 0:
+                paragraphs.append("".join(element.itertext()))
+        if paragraph_depth:
+            continue
+        element.clear(keep_tail=True)
+        parent = element.getparent()
+        if parent is not None:
+            while element.getprevious() is not None:
+                del parent[0]
+    return paragraphs
+
+
+def _bs4_paragraphs(content: bytes, rules: SiteRules) -> list[str]:
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(content, "html.parser")
+    for element in soup.find_all(list(rules.drop_tags)):
+        element.decompose()
+    return [d.get_text() for d in soup.find_all("p")]
+
+
+def extract_paragraphs(
+    content: bytes,
+    rules: SiteRules = DEFAULT_RULES,
+    engine: Optional[Engine] = None,
+) -> list[str]:
+    engine = engine or ("lxml" if LXML_AVAILABLE else "bs4")
+    if engine == "lxml" and content.strip():
+        paragraphs = _lxml_paragraphs(content, rules)
+    else:
+        paragraphs = _bs4_paragraphs(content, rules)
+    return [p for p in paragraphs if len(p.strip()) >= rules.min_paragraph_chars]
+
+
+def extract_text(
+    content: bytes,
+    rules: SiteRules = DEFAULT_RULES,
+    engine: Optional[Engine] = None,
+) -> str:
+    """Join the text of every ``<p>`` in an HTML page, minus the site's boilerplate."""
+    text = "\n".join(extract_paragraphs(content, rules, engine))
+    for removal in rules.removals:
+        text = text.replace(removal, "")
+    return text.strip()
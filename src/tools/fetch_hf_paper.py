@@ -1,40 +1,137 @@
-import requests
+from pathlib import Path
+from typing import Iterator, Optional
 
-import fitz
 from langchain_core.tools import tool
 
+from src.tools.http import http_client, HttpError
+from src.tools.paper_store import paper_store, arxiv_key, StoredPaper
+from src.tools.pdf import extract_pages, page_count
+from src.tools.retrieval import retrieve, DEFAULT_TOP_K
+
+
+DEFAULT_MAX_CHARS = 50_000
+PAGE_BATCH_SIZE = 10
+
+
+def _iter_extracted(path: Path, start: int, end: int) -> Iterator[str]:
+    for batch_start in range(start, end, PAGE_BATCH_SIZE):
+        yield from extract_pages(path, batch_start, min(batch_start + PAGE_BATCH_SIZE, end))
+
+
+def _iter_stored(paper: StoredPaper, start: int, end: int) -> Iterator[str]:
+    for batch_start in range(start, end, PAGE_BATCH_SIZE):
+        yield from paper_store.read_pages(paper, batch_start, min(batch_start + PAGE_BATCH_SIZE, end))
+
+
+def _select_pages(pages: Iterator[str], max_chars: Optional[int]) -> list[str]:
+    """Whole pages up to ``max_chars`` in total; the first page is returned whole
+    even when it is longer, since reading resumes at a page boundary."""
+    if max_chars is None:
+        return list(pages)
+    selected: list[str] = []
+    total = 0
+    for text in pages:
+        if selected and total + len(text) > max_chars:
+            break
+        selected.append(text)
+        total += len(text)
+    return selected
+
+
+def _format_retrieval(result: dict) -> str:
+    lines = [
+        f"Document handle: {result['document_handle']} ({result['total_chunks']} chunks). "
+        "Use lookup_document with this handle to search the paper again or to fetch neighbouring chunks."
+    ]
+    if not result["chunks"]:
+        lines.append("\nNo passages matched the query.")
+    for chunk in result["chunks"]:
+        lines.append(f"\n[Chunk {chunk['chunk_id']}, page {chunk['page']}]\n{chunk['text']}")
+    return "\n".join(lines)
+
+
+def _page_range(page_start: int, page_end: Optional[int], total_pages: int) -> tuple[int, int]:
+    start = max(page_start, 1) - 1
+    end = total_pages if page_end is None else min(page_end, total_pages)
+    return start, end
+
 
 @tool("read_hf_paper_from_url")
-def read_hf_paper_from_url(url: str) -> str:
+def read_hf_paper_from_url(
+    url: str,
+    page_start: int = 1,
+    page_end: Optional[int] = None,
+    max_chars: Optional[int] = DEFAULT_MAX_CHARS,
+    query: Optional[str] = None,
+    top_k: int = DEFAULT_TOP_K,
+) -> str:
     """Fetches a paper (PDF) from a given URL and extracts its text content.
     This tool should be used with HuggingFace (HF) papers that link to an ArXiv PDF.
+    Long papers are returned a few pages at a time; the output ends with a note
+    on how to continue reading when pages remain. Pass a query to get only the
+    passages of the paper relevant to it instead.
 
     Args:
     url : str
         The URL of the PDF file to fetch and read.
+    page_start : int
+        The first page to read, starting from 1 (default: 1).
+    page_end : Optional[int]
+        The last page to read, inclusive (default: the last page of the paper).
+    max_chars : Optional[int]
+        Stop after whole pages totalling at most this many characters; the first page is always returned whole (default: 50000).
+    query : Optional[str]
+        Return only the passages most relevant to this query, plus a document handle for follow-up lookups.
+    top_k : int
+        The number of passages to return for a query (default: 5).
     """
     try:
-        response = requests.get(url, stream=True, timeout=30)
-        response.raise_for_status()
+        paper_key = arxiv_key(url)
+        stored = paper_store.get(paper_key) if paper_key else None
+        if stored is None:
+            with http_client.download(url, timeout=30) as response:
+                response.raise_for_status()
+
+                content_type = response.content_type
+                if 'application/pdf' not in content_type:
+                    return f"Error: URL does not point to a PDF file (Content-Type: {content_type})"
+
+                if paper_key:
+                    stored = paper_store.put(paper_key, extract_pages(response.path))
+                else:
+                    total_pages = page_count(response.path)
+                    start, end = _page_range(page_start, page_end, total_pages)
+                    pages = _select_pages(
+                        _iter_extracted(response.path, start, end), None if query else max_chars
+                    )
 
-        content_type = response.headers.get('Content-Type', '').lower()
-        if 'application/pdf' not in content_type:
-            return f"Error: URL does not point to a PDF file (Content-Type: {content_type})"
+        if stored is not None:
+            total_pages = stored.total_pages
+            start, end = _page_range(page_start, page_end, total_pages)
+            pages = _select_pages(
+                _iter_stored(stored, start, end), None if query else max_chars
+            )
 
-        pdf_content = response.content
-        pdf_document = fitz.open(stream=pdf_content, filetype="pdf")
+        if start >= end:
+            return f"Error: no pages in range {page_start}-{page_end} (the paper has {total_pages} pages)"
 
-        text = ""
-        for page_num in range(len(pdf_document)):
-            page = pdf_document.load_page(page_num)
-            text += page.get_text()
+        if query:
+            sections = [(text, {"page": start + i + 1}) for i, text in enumerate(pages)]
+            return _format_retrieval(retrieve(url, sections, query, top_k))
 
-        pdf_document.close()
+        text = "".join(pages)
+        last_page = start + len(pages)
+        if last_page < total_pages:
+            text += (
+                f"\n\n[Showing pages {start + 1}-{last_page} of {total_pages}. "
+                f"Call read_hf_paper_from_url again with page_start={last_page + 1} to continue reading.]"
+            )
         return text
 
-    except requests.exceptions.RequestException as e:
+    except HttpError as e:
         return f"Error downloading PDF: {e}"
-    except fitz.errors.FitzError as e:
+    except RuntimeError as e:
+        # PyMuPDF raises fitz.FileDataError, a RuntimeError, for damaged or unsupported files.
         return f"Error processing PDF: {e}"
     except Exception as e:
-        return f"An unexpected error occurred: {e}"
\ No newline at end of file
+        return f"An unexpected error occurred: {e}"
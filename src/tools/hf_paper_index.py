@@ -0,0 +1,100 @@
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+from src.tools.constants import TOOL_CACHE_DIR, HF_PAPER_VOLATILE_TTL
+from src.tools.metrics import get_metrics
+
+
+VOLATILE_FIELDS = ("upvotes",)
+
+
+class HfPaperIndex:
+    """Persistent index of parsed Hugging Face paper records, keyed by paper id.
+
+    A paper's title, abstract, authors and links never change, so each paper
+    page is parsed once. Only the volatile fields (upvotes) go stale, after
+    ``volatile_ttl`` seconds, and are refreshed on their own.
+    """
+
+    def __init__(
+        self,
+        directory: Path = TOOL_CACHE_DIR / "hf_papers",
+        volatile_ttl: float = HF_PAPER_VOLATILE_TTL,
+    ):
+        self.directory = Path(directory)
+        self.volatile_ttl = volatile_ttl
+        self.metrics = get_metrics("hf_paper_index")
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+
+    def _conn(self) -> sqlite3.Connection:
+        if self._db is None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(
+                self.directory / "index.sqlite3", check_same_thread=False
+            )
+            self._db.executescript(
+                """
+                PRAGMA journal_mode=WAL;
+                CREATE TABLE IF NOT EXISTS papers (
+                    paper_id TEXT PRIMARY KEY,
+                    record TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    refreshed_at REAL NOT NULL
+                );
+                """
+            )
+        return self._db
+
+    def get_many(self, paper_ids: list[str]) -> dict[str, tuple[dict[str, Any], float]]:
+        """Indexed records among ``paper_ids``, with the time their volatile fields were refreshed."""
+        if not paper_ids:
+            return {}
+        with self._lock:
+            rows = self._conn().execute(
+                f"SELECT paper_id, record, refreshed_at FROM papers "
+                f"WHERE paper_id IN ({', '.join('?' * len(paper_ids))})",
+                paper_ids,
+            ).fetchall()
+        found = {paper_id: (json.loads(record), refreshed_at) for paper_id, record, refreshed_at in rows}
+        self.metrics.incr("hits", len(found))
+        self.metrics.incr("misses", len(set(paper_ids)) - len(found))
+        return found
+
+    def is_stale(self, refreshed_at: float) -> bool:
+        return time.time() - refreshed_at >= self.volatile_ttl
+
+    def put(self, paper_id: str, record: dict[str, Any]) -> None:
+        now = time.time()
+        with self._lock:
+            db = self._conn()
+            db.execute(
+                "INSERT OR REPLACE INTO papers (paper_id, record, created_at, refreshed_at) "
+                "VALUES (?, ?, ?, ?)",
+                (paper_id, json.dumps(record), now, now),
+            )
+            db.commit()
+        self.metrics.incr("stores")
+
+    def update_volatile(self, paper_id: str, record: dict[str, Any], fields: dict[str, Any]) -> dict[str, Any]:
+        """Merge refreshed volatile ``fields`` into an indexed ``record`` and return it."""
+        record = {**record, **{k: v for k, v in fields.items() if k in VOLATILE_FIELDS}}
+        with self._lock:
+            db = self._conn()
+            db.execute(
+                "UPDATE papers SET record = ?, refreshed_at = ? WHERE paper_id = ?",
+                (json.dumps(record), time.time(), paper_id),
+            )
+            db.commit()
+        self.metrics.incr("refreshes")
+        return record
+
+    def stats(self) -> dict[str, Any]:
+        return {"hit_rate": self.metrics.hit_rate(), **self.metrics.snapshot()}
+
+
+hf_paper_index = HfPaperIndex()
@@ -1,13 +1,22 @@
+from __future__ import annotations
+
+import asyncio
+import logging
 import re
 from datetime import datetime
-from typing import Any
+from typing import Any, Optional
 
-import requests
-from bs4 import BeautifulSoup
 from langchain_core.tools import tool
 
-from src.tools.utils import RateLimitCounter
-from src.tools.constants import HEADERS
+from src.tools.constants import HF_PAPERS_WARM_INTERVAL
+from src.tools.hf_paper_index import hf_paper_index
+from src.tools.http import http_client, HttpResponse
+from src.tools.lazy import lazy_module
+from src.tools.warmer import cache_warmer
+
+bs4 = lazy_module("bs4")
+
+logger = logging.getLogger(__name__)
 
 
 def _create_url() -> str:
@@ -18,14 +27,14 @@ def _create_url() -> str:
     url = f"https://huggingface.co/papers/week/{suffix}"
     return url
 
-def _get_papers_this_week_soup() -> BeautifulSoup:
+def _get_papers_this_week_soup() -> bs4.BeautifulSoup:
     url = _create_url()
-    response = requests.get(url)
+    response = http_client.get(url)
 
     if not response.status_code == 200:
         raise Exception(f"Failed to fetch data from {url}. Status code: {response.status_code}")
 
-    soup = BeautifulSoup(response.content, "html.parser")
+    soup = bs4.BeautifulSoup(response.content, "html.parser")
     return soup
 
 def _get_paper_links() -> list[str]:
@@ -34,15 +43,19 @@ def _get_paper_links() -> list[str]:
     links = soup.find_all("a", href=True)
     pattern = re.compile(r"^/papers/\d+(\.\d+)?$")
     links = [link for link in links if pattern.match(link["href"])]
-    paper_links = list(set([f"{prefix}{link["href"]}" for link in links]))
+    # Keep the listing order (most upvoted first) so a limit keeps the top papers.
+    paper_links = list(dict.fromkeys([f"{prefix}{link["href"]}" for link in links]))
     return paper_links
 
-def _get_paper_title(soup: BeautifulSoup) -> str:
+def _paper_id(url: str) -> str:
+    return url.rstrip("/").rsplit("/", 1)[-1]
+
+def _get_paper_title(soup: bs4.BeautifulSoup) -> str:
     headers_1 = soup.find_all("h1")
     title = headers_1[0].text
     return title
 
-def _get_paper_abstract(soup: BeautifulSoup) -> str:
+def _get_paper_abstract(soup: bs4.BeautifulSoup) -> str:
     abstract_heading = soup.find("h2", string="Abstract")
     if not abstract_heading:
         return ""
@@ -52,7 +65,7 @@ def _get_paper_abstract(soup: BeautifulSoup) -> str:
     abstract_text = " ".join(p.get_text(strip=True) for p in abstract_div.find_all("p"))
     return abstract_text
 
-def _get_publish_date(soup: BeautifulSoup) -> datetime:
+def _get_publish_date(soup: bs4.BeautifulSoup) -> datetime:
     div = soup.select_one("div.mb-6.flex.gap-2.text-sm")
     pattern = re.compile(r"Published on (.+?)\n")
     date = pattern.findall(div.text)
@@ -63,7 +76,7 @@ def _get_publish_date(soup: BeautifulSoup) -> datetime:
     publish_date = datetime.strptime(date_str, "%Y %b %d")
     return publish_date
 
-def _get_authors(soup: BeautifulSoup) -> list[str]:
+def _get_authors(soup: bs4.BeautifulSoup) -> list[str]:
     authors = []
     author_spans = soup.find_all("span", class_="author flex items-center")
     for span in author_spans:
@@ -71,7 +84,7 @@ def _get_authors(soup: BeautifulSoup) -> list[str]:
         authors.append(author_name)
     return authors
 
-def _get_upvotes(soup: BeautifulSoup) -> int:
+def _get_upvotes(soup: bs4.BeautifulSoup) -> int:
     label = soup.find("div", class_=[
         "font-semibold", "text-orange-500"
     ])
@@ -82,42 +95,103 @@ def _get_upvotes(soup: BeautifulSoup) -> int:
     except Exception as _:
         return 0
     
-def _get_paper_link(soup: BeautifulSoup) -> str:
+def _get_paper_link(soup: bs4.BeautifulSoup) -> str:
     links = soup.select('a[href^="https://arxiv.org/pdf/"]')
     if not links:
         raise ValueError("No PDF link found.")
     link = links[0]["href"]
     return link
 
+def _parse_paper(content: bytes) -> dict[str, Any]:
+    soup = bs4.BeautifulSoup(content, "html.parser")
+    return {
+        "title": _get_paper_title(soup),
+        "abstract": _get_paper_abstract(soup),
+        "publish_date": _get_publish_date(soup).strftime("%Y-%m-%d"),
+        "authors": _get_authors(soup),
+        "upvotes": _get_upvotes(soup),
+        "paper_url": _get_paper_link(soup),
+    }
+
+def _parse_volatile(content: bytes) -> dict[str, Any]:
+    soup = bs4.BeautifulSoup(content, "html.parser")
+    return {"upvotes": _get_upvotes(soup)}
+
+async def _fetch_paper_pages(urls: list[str], refresh: set[str]) -> list[HttpResponse | BaseException]:
+    # The shared client caps in-flight requests and applies the huggingface.co rate limit.
+    # Pages in ``refresh`` bypass the HTTP cache, whose TTL is as long as HF_PAPER_VOLATILE_TTL.
+    return await asyncio.gather(
+        *(http_client.aget(url, use_cache=url not in refresh) for url in urls), return_exceptions=True
+    )
+
+def _crawl_papers(paper_links: list[str]) -> list[dict[str, Any]]:
+    """Records for ``paper_links``, fetching only new papers and papers with stale upvotes."""
+    paper_ids = [_paper_id(url) for url in paper_links]
+    indexed = hf_paper_index.get_many(paper_ids)
+    refresh = {
+        url for url, paper_id in zip(paper_links, paper_ids)
+        if paper_id in indexed and hf_paper_index.is_stale(indexed[paper_id][1])
+    }
+    to_fetch = [
+        url for url, paper_id in zip(paper_links, paper_ids)
+        if paper_id not in indexed or url in refresh
+    ]
+    responses = dict(zip(to_fetch, http_client.run(_fetch_paper_pages(to_fetch, refresh)))) if to_fetch else {}
+
+    hf_papers: list[dict[str, Any]] = []
+    for url, paper_id in zip(paper_links, paper_ids):
+        record = indexed[paper_id][0] if paper_id in indexed else None
+        response = responses.get(url)
+        if response is None:
+            hf_papers.append(record)
+            continue
+        try:
+            if isinstance(response, BaseException):
+                raise response
+            response.raise_for_status()
+            if record is None:
+                record = http_client.parse(
+                    response, "hf_paper_record", lambda: _parse_paper(response.content)
+                )
+                hf_paper_index.put(paper_id, record)
+            else:
+                volatile = http_client.parse(
+                    response, "hf_paper_volatile", lambda: _parse_volatile(response.content)
+                )
+                record = hf_paper_index.update_volatile(paper_id, record, volatile)
+        except Exception as e:
+            logger.warning(f"Failed to fetch HF paper {url}: {e}")
+        if record is not None:
+            hf_papers.append(record)
+    return hf_papers
+
+def _crawl_week(limit: Optional[int] = None) -> list[dict[str, Any]]:
+    paper_links = _get_paper_links()
+    if limit is not None:
+        paper_links = paper_links[:max(limit, 0)]
+    hf_papers = _crawl_papers(paper_links)
+    hf_papers.sort(key=lambda x: x["upvotes"], reverse=True)
+    return hf_papers
+
+cache_warmer.register("hf_papers:week", _crawl_week, interval=HF_PAPERS_WARM_INTERVAL)
+
 @tool("fetch_hf_papers")
-def fetch_hf_papers() -> list[dict[str, Any]]:
+def fetch_hf_papers(limit: Optional[int] = None) -> list[dict[str, Any]]:
     """
     Fetches the latest highlighted papers from Hugging Face and returns a list of dictionaries containing paper details.
-    
+
+    Args:
+    limit : Optional[int]
+        Only return the top papers of the week, up to this many (default: all of them).
+
     Returns:
     list[dict[str, Any]]
         A list of dictionaries, each containing the title, abstract, publish date, authors, upvotes, and paper link.
+        Papers served from the background refresh also include snapshot_age_seconds, their age in seconds.
     """
-    paper_links = _get_paper_links()
-    hf_papers: list[dict[str, Any]] = []
-    for url in RateLimitCounter(paper_links):
-        response = requests.get(url, headers=HEADERS)
-        soup = BeautifulSoup(response.content, "html.parser")
-        title = _get_paper_title(soup)
-        abstract = _get_paper_abstract(soup)
-        publish_date = _get_publish_date(soup)
-        authors = _get_authors(soup)
-        upvotes = _get_upvotes(soup)
-        paper_link = _get_paper_link(soup)
-        hf_papers.append(
-            {
-                "title": title,
-                "abstract": abstract,
-                "publish_date": publish_date.strftime("%Y-%m-%d"),
-                "authors": authors,
-                "upvotes": upvotes,
-                "paper_url": paper_link,
-            }
-        )
-    hf_papers.sort(key=lambda x: x["upvotes"], reverse=True)
-    return hf_papers
\ No newline at end of file
+    snapshot = cache_warmer.get("hf_papers:week")
+    if snapshot is None:
+        return _crawl_week(limit)
+    hf_papers = snapshot.value if limit is None else snapshot.value[:max(limit, 0)]
+    age = round(snapshot.age)
+    return [{**paper, "snapshot_age_seconds": age} for paper in hf_papers]
@@ -0,0 +1,436 @@
+import asyncio
+import contextvars
+import hashlib
+import importlib.util
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import Future
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Coroutine, Iterator, Optional, TypeVar
+from urllib.parse import urlsplit
+
+import httpx
+
+from src.tools.constants import (
+    HEADERS,
+    HTTP_TIMEOUT,
+    HTTP_CONNECT_TIMEOUT,
+    HTTP_MAX_CONNECTIONS,
+    HTTP_MAX_KEEPALIVE_CONNECTIONS,
+    HOST_CONCURRENCY_LIMITS,
+    DEFAULT_HOST_CONCURRENCY,
+    HTTP_CACHE_ENABLED,
+    HOST_RATE_LIMITS,
+    RATE_LIMIT_REDIS_URI,
+)
+from src.tools.http_cache import HttpCache
+from src.tools.metrics import get_metrics
+from src.tools.utils import RateLimiter, create_rate_limiter
+
+# httpx imports h2 itself when an HTTP/2 client is created.
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+T = TypeVar("T")
+
+# Monotonic time by which the current tool call must finish, set by the tool
+# executor. Blocking calls through the shared client give up at that point,
+# so a timed-out tool frees its worker thread instead of holding it.
+tool_deadline: contextvars.ContextVar[Optional[float]] = contextvars.ContextVar("tool_deadline", default=None)
+
+
+class HttpError(Exception):
+    """Raised for transport failures and, via ``raise_for_status``, error responses."""
+
+    def __init__(self, message: str, status_code: Optional[int] = None):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+@dataclass
+class HttpResponse:
+    url: str
+    status_code: int
+    headers: dict[str, str] = field(default_factory=dict)
+    content: bytes = b""
+    from_cache: bool = False
+    content_hash: Optional[str] = None
+    path: Optional[Path] = None
+    """Where the body was written, for responses fetched with ``download``."""
+    temporary: bool = False
+
+    @property
+    def text(self) -> str:
+        return self.content.decode(_charset(self.headers), errors="replace")
+
+    @property
+    def content_type(self) -> str:
+        return self.headers.get("content-type", "").lower()
+
+    def raise_for_status(self) -> None:
+        if self.status_code >= 400:
+            raise HttpError(
+                f"Failed to fetch {self.url}. Status code: {self.status_code}",
+                status_code=self.status_code,
+            )
+
+
+def _charset(headers: dict[str, str]) -> str:
+    for part in headers.get("content-type", "").split(";"):
+        key, _, value = part.strip().partition("=")
+        if key.lower() == "charset" and value:
+            return value.strip('"')
+    return "utf-8"
+
+
+def host_of(url: str) -> str:
+    return urlsplit(url).hostname or ""
+
+
+class HttpClient:
+    """Shared, pooled HTTP client for the tool layer.
+
+    All requests run on one ``httpx.AsyncClient`` owned by a dedicated I/O
+    event loop thread, so keep-alive connections (and HTTP/2 where ``h2`` is
+    installed) are reused by every tool regardless of which thread or event
+    loop calls it. ``HEADERS`` and default timeouts are applied centrally and
+    in-flight requests are capped per host. Hosts with a ``RateLimiter``
+    budget wait for a token before each request, and GET responses go
+    through the on-disk ``HttpCache`` when one is configured.
+
+    Use ``get`` from synchronous code (e.g. tools on a worker thread) and
+    ``aget`` from coroutines. ``run`` executes a whole coroutine on the I/O
+    loop, which lets a tool fan out many requests at once.
+    """
+
+    def __init__(
+        self,
+        headers: Optional[dict[str, str]] = None,
+        timeout: Optional[httpx.Timeout] = None,
+        host_limits: Optional[dict[str, int]] = None,
+        default_host_limit: int = DEFAULT_HOST_CONCURRENCY,
+        http2: bool = HTTP2_AVAILABLE,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        cache: Optional[HttpCache] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+    ):
+        self.headers = dict(HEADERS if headers is None else headers)
+        self.timeout = timeout or httpx.Timeout(HTTP_TIMEOUT, connect=HTTP_CONNECT_TIMEOUT)
+        self.host_limits = dict(HOST_CONCURRENCY_LIMITS if host_limits is None else host_limits)
+        self.default_host_limit = default_host_limit
+        self.http2 = http2
+        self.transport = transport
+        self.cache = cache
+        self.rate_limiter = rate_limiter
+        self.metrics = get_metrics("http")
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._client: Optional[httpx.AsyncClient] = None
+        self._semaphores: dict[str, asyncio.Semaphore] = {}
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None or self._loop.is_closed():
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(
+                    target=loop.run_forever, name="tools-http-io", daemon=True
+                )
+                thread.start()
+                self._loop, self._thread = loop, thread
+            return self._loop
+
+    def _on_io_loop(self) -> bool:
+        try:
+            return asyncio.get_running_loop() is self._loop
+        except RuntimeError:
+            return False
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                headers=self.headers,
+                timeout=self.timeout,
+                http2=self.http2,
+                follow_redirects=True,
+                limits=httpx.Limits(
+                    max_connections=HTTP_MAX_CONNECTIONS,
+                    max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                ),
+                transport=self.transport,
+            )
+        return self._client
+
+    def _host_semaphore(self, host: str) -> asyncio.Semaphore:
+        if host not in self._semaphores:
+            limit = self.host_limits.get(host, self.default_host_limit)
+            self._semaphores[host] = asyncio.Semaphore(limit)
+        return self._semaphores[host]
+
+    async def _request(
+        self,
+        method: str,
+        url: str,
+        headers: Optional[dict[str, str]] = None,
+        timeout: Optional[float] = None,
+        use_cache: bool = True,
+    ) -> HttpResponse:
+        if self.cache is not None and use_cache and method == "GET":
+            return await self._cached_get(url, headers, timeout)
+        return await self._fetch(method, url, headers, timeout)
+
+    async def _cached_get(
+        self,
+        url: str,
+        headers: Optional[dict[str, str]],
+        timeout: Optional[float],
+    ) -> HttpResponse:
+        cache = self.cache
+        entry = await asyncio.to_thread(cache.lookup, url)
+        if entry is not None and cache.is_fresh(entry, host_of(url)):
+            body = await asyncio.to_thread(cache.read_body, entry)
+            if body is not None:
+                self.metrics.incr("cache_hits")
+                return HttpResponse(
+                    url=url,
+                    status_code=entry.status_code,
+                    headers=entry.headers,
+                    content=body,
+                    from_cache=True,
+                    content_hash=entry.content_hash,
+                )
+
+        request_headers = self._conditional_headers(headers, entry)
+        response = await self._fetch("GET", url, request_headers, timeout)
+
+        if response.status_code == 304 and entry is not None:
+            body = await asyncio.to_thread(cache.read_body, entry)
+            if body is not None:
+                await asyncio.to_thread(cache.refresh, url)
+                self.metrics.incr("cache_revalidated")
+                return HttpResponse(
+                    url=url,
+                    status_code=entry.status_code,
+                    headers=entry.headers,
+                    content=body,
+                    from_cache=True,
+                    content_hash=entry.content_hash,
+                )
+            response = await self._fetch("GET", url, headers, timeout)
+
+        self.metrics.incr("cache_misses")
+        if response.status_code == 200 and "no-store" not in response.headers.get("cache-control", ""):
+            response.content_hash = await asyncio.to_thread(
+                cache.store, url, response.status_code, response.headers, response.content
+            )
+        return response
+
+    async def _fetch(
+        self,
+        method: str,
+        url: str,
+        headers: Optional[dict[str, str]] = None,
+        timeout: Optional[float] = None,
+    ) -> HttpResponse:
+        host = host_of(url)
+        if self.rate_limiter is not None:
+            await self.rate_limiter.acquire(host)
+        async with self._host_semaphore(host):
+            self.metrics.incr("requests")
+            self.metrics.incr(f"requests.{host}")
+            try:
+                response = await self._get_client().request(
+                    method,
+                    url,
+                    headers=headers,
+                    timeout=timeout if timeout is not None else httpx.USE_CLIENT_DEFAULT,
+                )
+            except httpx.HTTPError as e:
+                self.metrics.incr("errors")
+                raise HttpError(f"Request to {url} failed: {e}") from e
+        return HttpResponse(
+            url=str(response.url),
+            status_code=response.status_code,
+            headers={k.lower(): v for k, v in response.headers.items()},
+            content=response.content,
+        )
+
+    def _conditional_headers(self, headers: Optional[dict[str, str]], entry: Any) -> dict[str, str]:
+        request_headers = dict(headers or {})
+        if entry is not None:
+            if entry.etag:
+                request_headers["If-None-Match"] = entry.etag
+            if entry.last_modified:
+                request_headers["If-Modified-Since"] = entry.last_modified
+        return request_headers
+
+    async def _download(
+        self,
+        url: str,
+        headers: Optional[dict[str, str]] = None,
+        timeout: Optional[float] = None,
+        use_cache: bool = True,
+        chunk_size: int = 256 * 1024,
+    ) -> HttpResponse:
+        cache = self.cache if use_cache else None
+        entry = None
+        if cache is not None:
+            entry = await asyncio.to_thread(cache.lookup, url)
+            if entry is not None and cache.blob_path(entry.content_hash).exists():
+                cached = HttpResponse(
+                    url=url,
+                    status_code=entry.status_code,
+                    headers=entry.headers,
+                    from_cache=True,
+                    content_hash=entry.content_hash,
+                    path=cache.blob_path(entry.content_hash),
+                )
+                if cache.is_fresh(entry, host_of(url)):
+                    await asyncio.to_thread(cache.touch, url)
+                    self.metrics.incr("cache_hits")
+                    return cached
+            else:
+                entry = None
+
+        host = host_of(url)
+        fd, tmp_name = tempfile.mkstemp(
+            suffix=".download",
+            dir=await asyncio.to_thread(cache.download_dir) if cache is not None else None,
+        )
+        tmp_path = Path(tmp_name)
+        digest = hashlib.sha256()
+        try:
+            if self.rate_limiter is not None:
+                await self.rate_limiter.acquire(host)
+            async with self._host_semaphore(host):
+                self.metrics.incr("requests")
+                self.metrics.incr(f"requests.{host}")
+                async with self._get_client().stream(
+                    "GET",
+                    url,
+                    headers=self._conditional_headers(headers, entry),
+                    timeout=timeout if timeout is not None else httpx.USE_CLIENT_DEFAULT,
+                ) as response:
+                    result = HttpResponse(
+                        url=str(response.url),
+                        status_code=response.status_code,
+                        headers={k.lower(): v for k, v in response.headers.items()},
+                        path=tmp_path,
+                        temporary=True,
+                    )
+                    if response.status_code == 200:
+                        with os.fdopen(fd, "wb") as f:
+                            fd = -1
+                            async for chunk in response.aiter_bytes(chunk_size):
+                                f.write(chunk)
+                                digest.update(chunk)
+        except httpx.HTTPError as e:
+            self.metrics.incr("errors")
+            tmp_path.unlink(missing_ok=True)
+            raise HttpError(f"Request to {url} failed: {e}") from e
+        except BaseException:
+            # e.g. cancelled at the tool deadline
+            tmp_path.unlink(missing_ok=True)
+            raise
+        finally:
+            if fd != -1:
+                os.close(fd)
+
+        if result.status_code == 304 and entry is not None:
+            tmp_path.unlink(missing_ok=True)
+            await asyncio.to_thread(cache.refresh, url)
+            self.metrics.incr("cache_revalidated")
+            return cached
+        if cache is not None:
+            self.metrics.incr("cache_misses")
+            if result.status_code == 200:
+                result.content_hash = digest.hexdigest()
+                result.path = await asyncio.to_thread(
+                    cache.store_file, url, result.status_code, result.headers, tmp_path, result.content_hash
+                )
+                result.temporary = False
+        return result
+
+    @contextmanager
+    def download(self, url: str, **kwargs: Any) -> Iterator[HttpResponse]:
+        """Stream a response body to disk rather than memory.
+
+        Yields a response whose ``path`` holds the body; temporary files are
+        removed on exit, bodies kept by the cache are left in place.
+        """
+        response = self.run(self._download(url, **kwargs))
+        try:
+            yield response
+        finally:
+            if response.temporary and response.path is not None:
+                response.path.unlink(missing_ok=True)
+
+    def submit(self, coro: Coroutine[Any, Any, T]) -> "Future[T]":
+        return asyncio.run_coroutine_threadsafe(coro, self._ensure_loop())
+
+    def run(self, coro: Coroutine[Any, Any, T], timeout: Optional[float] = None) -> T:
+        """Run ``coro`` on the I/O loop and wait for it, for at most ``timeout``
+        seconds and never past the calling tool's ``tool_deadline``."""
+        if self._on_io_loop():
+            coro.close()
+            raise RuntimeError("HttpClient.run cannot be called from the I/O loop; await instead")
+        deadline = tool_deadline.get()
+        if deadline is not None:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                coro.close()
+                self.metrics.incr("deadline_exceeded")
+                raise TimeoutError("The tool call ran out of time")
+            timeout = remaining if timeout is None else min(timeout, remaining)
+        future = self.submit(coro)
+        try:
+            return future.result(timeout)
+        except TimeoutError:
+            future.cancel()
+            if deadline is not None and time.monotonic() >= deadline:
+                self.metrics.incr("deadline_exceeded")
+            raise
+
+    async def _bridge(self, coro: Coroutine[Any, Any, T]) -> T:
+        if self._on_io_loop():
+            return await coro
+        return await asyncio.wrap_future(self.submit(coro))
+
+    def get(self, url: str, **kwargs: Any) -> HttpResponse:
+        return self.run(self._request("GET", url, **kwargs))
+
+    async def aget(self, url: str, **kwargs: Any) -> HttpResponse:
+        return await self._bridge(self._request("GET", url, **kwargs))
+
+    def parse(self, response: HttpResponse, kind: str, compute: Callable[[], T]) -> T:
+        """Return ``compute()``, memoised on disk against the response body.
+
+        ``kind`` names the parser (and its version) and the result must be
+        JSON-serialisable.
+        """
+        if self.cache is None:
+            return compute()
+        return self.cache.derived(response.content_hash, kind, compute)
+
+    def close(self) -> None:
+        with self._lock:
+            loop, client = self._loop, self._client
+            self._loop, self._thread, self._client = None, None, None
+            self._semaphores = {}
+        if loop is None:
+            return
+        if client is not None:
+            asyncio.run_coroutine_threadsafe(client.aclose(), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+
+    def stats(self) -> dict[str, Any]:
+        return {"http2": self.http2, **self.metrics.snapshot()}
+
+
+http_client = HttpClient(
+    cache=HttpCache() if HTTP_CACHE_ENABLED else None,
+    rate_limiter=create_rate_limiter(HOST_RATE_LIMITS, RATE_LIMIT_REDIS_URI),
+)
@@ -0,0 +1,277 @@
+import hashlib
+import json
+import shutil
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Optional, TypeVar
+
+from src.tools.constants import (
+    TOOL_CACHE_DIR,
+    HTTP_CACHE_MAX_BYTES,
+    HTTP_CACHE_TTLS,
+    DEFAULT_HTTP_CACHE_TTL,
+)
+from src.tools.metrics import get_metrics
+
+T = TypeVar("T")
+
+
+@dataclass
+class CacheEntry:
+    url: str
+    content_hash: str
+    status_code: int
+    headers: dict[str, str]
+    etag: Optional[str]
+    last_modified: Optional[str]
+    stored_at: float
+    size: int
+
+
+class HttpCache:
+    """Persistent, content-addressed HTTP response cache.
+
+    Bodies are stored once per SHA-256 digest under ``blobs/`` and indexed by
+    URL in SQLite together with their validators (ETag / Last-Modified).
+    Entries are fresh for a per-host TTL, after which the client revalidates
+    them with a conditional request. The total body size is bounded and the
+    least recently used entries are evicted first.
+
+    Derived values (e.g. text extracted from an HTML page) are stored against
+    the body digest, so a cache hit can also skip the parse.
+    """
+
+    def __init__(
+        self,
+        directory: Path = TOOL_CACHE_DIR / "http",
+        max_bytes: int = HTTP_CACHE_MAX_BYTES,
+        host_ttls: Optional[dict[str, float]] = None,
+        default_ttl: float = DEFAULT_HTTP_CACHE_TTL,
+    ):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.host_ttls = dict(HTTP_CACHE_TTLS if host_ttls is None else host_ttls)
+        self.default_ttl = default_ttl
+        self.metrics = get_metrics("http_cache")
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+
+    def _conn(self) -> sqlite3.Connection:
+        if self._db is None:
+            (self.directory / "blobs").mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(
+                self.directory / "index.sqlite3", check_same_thread=False
+            )
+            self._db.executescript(
+                """
+                PRAGMA journal_mode=WAL;
+                CREATE TABLE IF NOT EXISTS entries (
+                    url TEXT PRIMARY KEY,
+                    content_hash TEXT NOT NULL,
+                    status_code INTEGER NOT NULL,
+                    headers TEXT NOT NULL,
+                    etag TEXT,
+                    last_modified TEXT,
+                    stored_at REAL NOT NULL,
+                    last_access REAL NOT NULL,
+                    size INTEGER NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS entries_last_access ON entries (last_access);
+                CREATE TABLE IF NOT EXISTS derived (
+                    content_hash TEXT NOT NULL,
+                    kind TEXT NOT NULL,
+                    value TEXT NOT NULL,
+                    PRIMARY KEY (content_hash, kind)
+                );
+                """
+            )
+        return self._db
+
+    def download_dir(self) -> Path:
+        """Where streamed bodies are written before ``store_file`` moves them
+        into the blob store; on the same filesystem, so the move is a rename."""
+        path = self.directory / "downloads"
+        path.mkdir(parents=True, exist_ok=True)
+        return path
+
+    def blob_path(self, content_hash: str) -> Path:
+        return self.directory / "blobs" / content_hash[:2] / content_hash
+
+    def ttl_for(self, host: str) -> float:
+        return self.host_ttls.get(host, self.default_ttl)
+
+    def is_fresh(self, entry: CacheEntry, host: str) -> bool:
+        return time.time() - entry.stored_at < self.ttl_for(host)
+
+    def lookup(self, url: str) -> Optional[CacheEntry]:
+        with self._lock:
+            row = self._conn().execute(
+                "SELECT url, content_hash, status_code, headers, etag, last_modified, stored_at, size "
+                "FROM entries WHERE url = ?",
+                (url,),
+            ).fetchone()
+        if row is None:
+            return None
+        return CacheEntry(
+            url=row[0],
+            content_hash=row[1],
+            status_code=row[2],
+            headers=json.loads(row[3]),
+            etag=row[4],
+            last_modified=row[5],
+            stored_at=row[6],
+            size=row[7],
+        )
+
+    def read_body(self, entry: CacheEntry) -> Optional[bytes]:
+        try:
+            body = self.blob_path(entry.content_hash).read_bytes()
+        except FileNotFoundError:
+            self.invalidate(entry.url)
+            return None
+        self.touch(entry.url)
+        return body
+
+    def store(self, url: str, status_code: int, headers: dict[str, str], body: bytes) -> str:
+        content_hash = hashlib.sha256(body).hexdigest()
+        path = self.blob_path(content_hash)
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(f".{threading.get_ident()}.tmp")
+            tmp_path.write_bytes(body)
+            tmp_path.replace(path)
+        self._index(url, content_hash, status_code, headers, len(body))
+        return content_hash
+
+    def store_file(
+        self,
+        url: str,
+        status_code: int,
+        headers: dict[str, str],
+        source: Path,
+        content_hash: str,
+    ) -> Path:
+        """Move an already-downloaded body into the blob store and index it."""
+        path = self.blob_path(content_hash)
+        size = source.stat().st_size
+        if path.exists():
+            source.unlink(missing_ok=True)
+        else:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # A plain rename fails with EXDEV when the source is on another filesystem.
+            shutil.move(source, path)
+        self._index(url, content_hash, status_code, headers, size)
+        return path
+
+    def _index(
+        self,
+        url: str,
+        content_hash: str,
+        status_code: int,
+        headers: dict[str, str],
+        size: int,
+    ) -> None:
+        now = time.time()
+        with self._lock:
+            self._conn().execute(
+                "INSERT OR REPLACE INTO entries "
+                "(url, content_hash, status_code, headers, etag, last_modified, stored_at, last_access, size) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    url,
+                    content_hash,
+                    status_code,
+                    json.dumps(headers),
+                    headers.get("etag"),
+                    headers.get("last-modified"),
+                    now,
+                    now,
+                    size,
+                ),
+            )
+            self._conn().commit()
+            self.metrics.incr("stores")
+            self._evict()
+
+    def touch(self, url: str) -> None:
+        with self._lock:
+            self._conn().execute(
+                "UPDATE entries SET last_access = ? WHERE url = ?", (time.time(), url)
+            )
+            self._conn().commit()
+
+    def refresh(self, url: str) -> None:
+        now = time.time()
+        with self._lock:
+            self._conn().execute(
+                "UPDATE entries SET stored_at = ?, last_access = ? WHERE url = ?", (now, now, url)
+            )
+            self._conn().commit()
+
+    def invalidate(self, url: str) -> None:
+        with self._lock:
+            self._conn().execute("DELETE FROM entries WHERE url = ?", (url,))
+            self._conn().commit()
+
+    def _evict(self) -> None:
+        db = self._conn()
+        total = db.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM (SELECT DISTINCT content_hash, size FROM entries)"
+        ).fetchone()[0]
+        self.metrics.set("bytes", total)
+        if total <= self.max_bytes:
+            return
+        rows = db.execute("SELECT url, content_hash, size FROM entries ORDER BY last_access").fetchall()
+        for url, content_hash, size in rows:
+            if total <= self.max_bytes:
+                break
+            db.execute("DELETE FROM entries WHERE url = ?", (url,))
+            still_referenced = db.execute(
+                "SELECT 1 FROM entries WHERE content_hash = ? LIMIT 1", (content_hash,)
+            ).fetchone()
+            if not still_referenced:
+                self.blob_path(content_hash).unlink(missing_ok=True)
+                db.execute("DELETE FROM derived WHERE content_hash = ?", (content_hash,))
+                total -= size
+            self.metrics.incr("evictions")
+        db.commit()
+        self.metrics.set("bytes", total)
+
+    def get_derived(self, content_hash: str, kind: str) -> Optional[Any]:
+        with self._lock:
+            row = self._conn().execute(
+                "SELECT value FROM derived WHERE content_hash = ? AND kind = ?", (content_hash, kind)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def set_derived(self, content_hash: str, kind: str, value: Any) -> None:
+        with self._lock:
+            self._conn().execute(
+                "INSERT OR REPLACE INTO derived (content_hash, kind, value) VALUES (?, ?, ?)",
+                (content_hash, kind, json.dumps(value)),
+            )
+            self._conn().commit()
+
+    def derived(self, content_hash: Optional[str], kind: str, compute: Callable[[], T]) -> T:
+        if content_hash is None:
+            return compute()
+        value = self.get_derived(content_hash, kind)
+        if value is not None:
+            self.metrics.incr("derived_hits")
+            return value
+        self.metrics.incr("derived_misses")
+        value = compute()
+        self.set_derived(content_hash, kind, value)
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            db = self._conn()
+            db.execute("DELETE FROM entries")
+            db.execute("DELETE FROM derived")
+            db.commit()
+        for path in (self.directory / "blobs").glob("*/*"):
+            path.unlink(missing_ok=True)
@@ -0,0 +1,76 @@
+import importlib
+import importlib.util
+import sys
+import threading
+import time
+from types import ModuleType
+from typing import Any, Callable, Optional
+
+from langchain_core.callbacks import CallbackManagerForToolRun
+from langchain_core.tools import BaseTool
+from pydantic import PrivateAttr
+
+from src.tools.metrics import get_metrics
+
+metrics = get_metrics("lazy_imports")
+
+
+def lazy_module(name: str) -> ModuleType:
+    """Import ``name`` lazily: the module body runs on first attribute access.
+
+    Lets tool modules keep ``yf.Ticker(...)``-style code while heavy
+    dependencies (yfinance, PyMuPDF, pandas, ...) are only loaded when a
+    tool actually uses them, not when ``src.tools`` is imported. Use
+    ``module.attr`` access rather than ``from module import attr``, which
+    would load the module immediately.
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.find_spec(name)
+    if spec is None or spec.loader is None:
+        raise ImportError(f"No module named '{name}'")
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
+
+
+class LazyTool(BaseTool):
+    """A tool whose implementation is built on first invocation.
+
+    For tools provided by third-party packages, where importing the package
+    is the expensive part: the name, description and ``args_schema`` are
+    declared up front so the tool can be bound to a model, and ``load``
+    imports the package and builds the real tool the first time it runs.
+    Arguments left unset by the model are not forwarded, so the real
+    tool's own defaults apply.
+    """
+
+    _loader: Callable[[], BaseTool] = PrivateAttr()
+    _tool: Optional[BaseTool] = PrivateAttr(default=None)
+    _lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
+
+    def __init__(self, loader: Callable[[], BaseTool], **kwargs: Any):
+        super().__init__(**kwargs)
+        self._loader = loader
+
+    @property
+    def loaded(self) -> bool:
+        return self._tool is not None
+
+    def load(self) -> BaseTool:
+        with self._lock:
+            if self._tool is None:
+                start = time.perf_counter()
+                self._tool = self._loader()
+                metrics.observe("load_seconds", time.perf_counter() - start)
+                metrics.incr(f"loaded.{self.name}")
+            return self._tool
+
+    def _run(self, run_manager: Optional[CallbackManagerForToolRun] = None, **kwargs: Any) -> Any:
+        return self.load().invoke(
+            {k: v for k, v in kwargs.items() if v is not None},
+            config={"callbacks": run_manager.get_child() if run_manager else None},
+        )
@@ -0,0 +1,63 @@
+from datetime import datetime, time as dt_time, timedelta
+from typing import Optional
+from zoneinfo import ZoneInfo
+
+
+DEFAULT_EXCHANGE_TIMEZONE = "America/New_York"
+
+# Regular trading session (local open, local close) by exchange timezone, as
+# reported in yfinance's ``exchangeTimezoneName``. Holidays are not modelled.
+TRADING_HOURS = {
+    "America/New_York": (dt_time(9, 30), dt_time(16, 0)),
+    "America/Toronto": (dt_time(9, 30), dt_time(16, 0)),
+    "Europe/London": (dt_time(8, 0), dt_time(16, 30)),
+    "Europe/Berlin": (dt_time(9, 0), dt_time(17, 30)),
+    "Europe/Paris": (dt_time(9, 0), dt_time(17, 30)),
+    "Europe/Amsterdam": (dt_time(9, 0), dt_time(17, 30)),
+    "Europe/Zurich": (dt_time(9, 0), dt_time(17, 30)),
+    "Asia/Tokyo": (dt_time(9, 0), dt_time(15, 30)),
+    "Asia/Hong_Kong": (dt_time(9, 30), dt_time(16, 0)),
+    "Asia/Shanghai": (dt_time(9, 30), dt_time(15, 0)),
+    "Asia/Kolkata": (dt_time(9, 15), dt_time(15, 30)),
+    "Australia/Sydney": (dt_time(10, 0), dt_time(16, 0)),
+}
+
+
+def _zone(timezone_name: Optional[str]) -> tuple[ZoneInfo, tuple[dt_time, dt_time]]:
+    # Exchanges without a known session are treated as trading on New York hours.
+    name = timezone_name if timezone_name in TRADING_HOURS else DEFAULT_EXCHANGE_TIMEZONE
+    return ZoneInfo(name), TRADING_HOURS[name]
+
+
+def market_is_open(timezone_name: Optional[str], now: Optional[datetime] = None) -> bool:
+    """Whether the exchange in ``timezone_name`` is in its regular weekday session."""
+    zone, (open_at, close_at) = _zone(timezone_name)
+    local = (now or datetime.now(tz=zone)).astimezone(zone)
+    return local.weekday() < 5 and open_at <= local.time() < close_at
+
+
+def seconds_until_open(timezone_name: Optional[str], now: Optional[datetime] = None) -> float:
+    """Seconds until the next regular session starts (0 while the market is open)."""
+    zone, (open_at, _) = _zone(timezone_name)
+    local = (now or datetime.now(tz=zone)).astimezone(zone)
+    if market_is_open(timezone_name, local):
+        return 0.0
+    candidate = local.replace(hour=open_at.hour, minute=open_at.minute, second=0, microsecond=0)
+    if candidate <= local:
+        candidate += timedelta(days=1)
+    while candidate.weekday() >= 5:
+        candidate += timedelta(days=1)
+    return (candidate - local).total_seconds()
+
+
+def market_data_ttl(
+    timezone_name: Optional[str],
+    open_ttl: float,
+    closed_max_ttl: float,
+    now: Optional[datetime] = None,
+) -> float:
+    """How long market data stays fresh: ``open_ttl`` during the session,
+    otherwise until the next open (between ``open_ttl`` and ``closed_max_ttl``)."""
+    if market_is_open(timezone_name, now):
+        return open_ttl
+    return min(max(seconds_until_open(timezone_name, now), open_ttl), closed_max_ttl)
@@ -0,0 +1,76 @@
+import threading
+from typing import Any
+
+
+class Metrics:
+    """Thread-safe counters, gauges and timing summaries for one component."""
+
+    def __init__(self, namespace: str):
+        self.namespace = namespace
+        self._lock = threading.Lock()
+        self._counters: dict[str, float] = {}
+        self._gauges: dict[str, float] = {}
+        self._observations: dict[str, dict[str, float]] = {}
+
+    def incr(self, name: str, value: float = 1) -> None:
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def set(self, name: str, value: float) -> None:
+        with self._lock:
+            self._gauges[name] = value
+
+    def observe(self, name: str, value: float) -> None:
+        with self._lock:
+            summary = self._observations.setdefault(
+                name, {"count": 0, "sum": 0.0, "max": 0.0, "last": 0.0}
+            )
+            summary["count"] += 1
+            summary["sum"] += value
+            summary["max"] = max(summary["max"], value)
+            summary["last"] = value
+
+    def get(self, name: str) -> float:
+        with self._lock:
+            return self._counters.get(name, self._gauges.get(name, 0))
+
+    def hit_rate(self, hits: str = "hits", misses: str = "misses") -> float:
+        with self._lock:
+            hit_count = self._counters.get(hits, 0)
+            total = hit_count + self._counters.get(misses, 0)
+        return hit_count / total if total else 0.0
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            observations = {
+                name: {**summary, "mean": summary["sum"] / summary["count"]}
+                for name, summary in self._observations.items()
+            }
+            return {
+                "counters": dict(self._counters),
+                "gauges": dict(self._gauges),
+                "observations": observations,
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._gauges.clear()
+            self._observations.clear()
+
+
+_registry: dict[str, Metrics] = {}
+_registry_lock = threading.Lock()
+
+
+def get_metrics(namespace: str) -> Metrics:
+    with _registry_lock:
+        if namespace not in _registry:
+            _registry[namespace] = Metrics(namespace)
+        return _registry[namespace]
+
+
+def snapshot_all() -> dict[str, dict[str, Any]]:
+    with _registry_lock:
+        registry = dict(_registry)
+    return {namespace: metrics.snapshot() for namespace, metrics in registry.items()}
@@ -0,0 +1,186 @@
+import hashlib
+import json
+import mmap
+import re
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Optional
+
+from src.tools.constants import TOOL_CACHE_DIR, PAPER_STORE_MAX_BYTES, PAPER_STORE_LATEST_TTL
+from src.tools.metrics import get_metrics
+
+
+ARXIV_URL_PATTERN = re.compile(
+    r"arxiv\.org/(?:pdf|abs)/(?P<id>\d{4}\.\d{4,5})(?P<version>v\d+)?"
+)
+LATEST = "latest"
+
+
+def arxiv_key(url: str) -> Optional[str]:
+    """``<id><version>`` for an arXiv abs/pdf URL, e.g. ``2401.01234v2``.
+
+    Unversioned URLs map to ``<id>latest``, which the store only keeps for
+    ``PAPER_STORE_LATEST_TTL`` since it may point to a newer version later.
+    """
+    match = ARXIV_URL_PATTERN.search(url)
+    if match is None:
+        return None
+    return f"{match['id']}{match['version'] or LATEST}"
+
+
+@dataclass
+class StoredPaper:
+    paper_key: str
+    content_hash: str
+    page_offsets: list[int]
+    """Byte offset of each page in the UTF-8 text file, plus the end offset."""
+
+    @property
+    def total_pages(self) -> int:
+        return len(self.page_offsets) - 1
+
+
+class PaperTextStore:
+    """Persistent store of text extracted from arXiv papers.
+
+    Each paper's text is written once to a content-addressed UTF-8 file and
+    indexed by arXiv id + version together with the byte offset of every
+    page, so a page range is served by slicing a memory map rather than by
+    re-downloading and re-parsing the PDF. Total size is capped and the least
+    recently read papers are evicted first. Versioned papers never change;
+    ``<id>latest`` entries expire after ``latest_ttl`` seconds.
+    """
+
+    def __init__(
+        self,
+        directory: Path = TOOL_CACHE_DIR / "papers",
+        max_bytes: int = PAPER_STORE_MAX_BYTES,
+        latest_ttl: float = PAPER_STORE_LATEST_TTL,
+    ):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.latest_ttl = latest_ttl
+        self.metrics = get_metrics("paper_store")
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+
+    def _conn(self) -> sqlite3.Connection:
+        if self._db is None:
+            (self.directory / "texts").mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(
+                self.directory / "index.sqlite3", check_same_thread=False
+            )
+            self._db.executescript(
+                """
+                PRAGMA journal_mode=WAL;
+                CREATE TABLE IF NOT EXISTS papers (
+                    paper_key TEXT PRIMARY KEY,
+                    content_hash TEXT NOT NULL,
+                    page_offsets TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    last_access REAL NOT NULL,
+                    stored_at REAL NOT NULL DEFAULT 0
+                );
+                """
+            )
+            columns = {row[1] for row in self._db.execute("PRAGMA table_info(papers)")}
+            if "stored_at" not in columns:
+                # Stores created before stored_at: their latest entries count as expired.
+                self._db.execute("ALTER TABLE papers ADD COLUMN stored_at REAL NOT NULL DEFAULT 0")
+                self._db.commit()
+        return self._db
+
+    def _text_path(self, content_hash: str) -> Path:
+        return self.directory / "texts" / f"{content_hash}.txt"
+
+    def get(self, paper_key: str) -> Optional[StoredPaper]:
+        with self._lock:
+            db = self._conn()
+            row = db.execute(
+                "SELECT content_hash, page_offsets, stored_at FROM papers WHERE paper_key = ?", (paper_key,)
+            ).fetchone()
+            if row is None or not self._text_path(row[0]).exists():
+                self.metrics.incr("misses")
+                return None
+            now = time.time()
+            if paper_key.endswith(LATEST) and now - row[2] >= self.latest_ttl:
+                self.metrics.incr("expired")
+                self.metrics.incr("misses")
+                return None
+            db.execute(
+                "UPDATE papers SET last_access = ? WHERE paper_key = ?", (now, paper_key)
+            )
+            db.commit()
+        self.metrics.incr("hits")
+        return StoredPaper(paper_key, row[0], json.loads(row[1]))
+
+    def put(self, paper_key: str, pages: list[str]) -> StoredPaper:
+        encoded = [page.encode("utf-8") for page in pages]
+        page_offsets = [0]
+        for page in encoded:
+            page_offsets.append(page_offsets[-1] + len(page))
+        data = b"".join(encoded)
+        content_hash = hashlib.sha256(data).hexdigest()
+        path = self._text_path(content_hash)
+        if not path.exists():
+            tmp_path = path.with_suffix(f".{threading.get_ident()}.tmp")
+            tmp_path.write_bytes(data)
+            tmp_path.replace(path)
+        with self._lock:
+            db = self._conn()
+            now = time.time()
+            db.execute(
+                "INSERT OR REPLACE INTO papers (paper_key, content_hash, page_offsets, size, last_access, stored_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (paper_key, content_hash, json.dumps(page_offsets), len(data), now, now),
+            )
+            db.commit()
+            self.metrics.incr("stores")
+            self._evict()
+        return StoredPaper(paper_key, content_hash, page_offsets)
+
+    def read_pages(self, paper: StoredPaper, start: int, end: int) -> list[str]:
+        """Pages ``[start, end)`` (0-indexed) of a stored paper."""
+        end = min(end, paper.total_pages)
+        if start >= end:
+            return []
+        with open(self._text_path(paper.content_hash), "rb") as f:
+            if paper.page_offsets[-1] == 0:
+                return [""] * (end - start)
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                return [
+                    mapped[paper.page_offsets[i]:paper.page_offsets[i + 1]].decode("utf-8")
+                    for i in range(start, end)
+                ]
+
+    def _evict(self) -> None:
+        db = self._conn()
+        total = db.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM (SELECT DISTINCT content_hash, size FROM papers)"
+        ).fetchone()[0]
+        if total > self.max_bytes:
+            rows = db.execute(
+                "SELECT paper_key, content_hash, size FROM papers ORDER BY last_access"
+            ).fetchall()
+            for paper_key, content_hash, size in rows:
+                if total <= self.max_bytes:
+                    break
+                db.execute("DELETE FROM papers WHERE paper_key = ?", (paper_key,))
+                still_referenced = db.execute(
+                    "SELECT 1 FROM papers WHERE content_hash = ? LIMIT 1", (content_hash,)
+                ).fetchone()
+                if not still_referenced:
+                    self._text_path(content_hash).unlink(missing_ok=True)
+                    total -= size
+                self.metrics.incr("evictions")
+            db.commit()
+        self.metrics.set("bytes", total)
+
+    def stats(self) -> dict[str, Any]:
+        return {"hit_rate": self.metrics.hit_rate(), **self.metrics.snapshot()}
+
+
+paper_store = PaperTextStore()
@@ -0,0 +1,55 @@
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Optional
+
+from src.tools.lazy import lazy_module
+
+fitz = lazy_module("fitz")
+
+# Documents with at least this many pages in the requested range are split
+# across the process pool; smaller ones are cheaper to extract in-process.
+PARALLEL_PAGE_THRESHOLD = 40
+MAX_PDF_WORKERS = min(4, os.cpu_count() or 1)
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # Spawned (not forked) workers: the parent runs an I/O thread and an event loop.
+            _pool = ProcessPoolExecutor(
+                max_workers=MAX_PDF_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _pool
+
+
+def page_count(path: Path) -> int:
+    with fitz.open(path) as document:
+        return len(document)
+
+
+def _extract_range(path: str, start: int, end: int) -> list[str]:
+    with fitz.open(path) as document:
+        return [document.load_page(page_num).get_text() for page_num in range(start, end)]
+
+
+def extract_pages(path: Path, start: int = 0, end: Optional[int] = None) -> list[str]:
+    """Extract the text of pages ``[start, end)`` (0-indexed) of a PDF on disk."""
+    end = page_count(path) if end is None else end
+    total = end - start
+    if total <= 0:
+        return []
+    if total < PARALLEL_PAGE_THRESHOLD or MAX_PDF_WORKERS < 2:
+        return _extract_range(str(path), start, end)
+    chunk = -(-total // MAX_PDF_WORKERS)
+    bounds = [(s, min(s + chunk, end)) for s in range(start, end, chunk)]
+    pool = _get_pool()
+    futures = [pool.submit(_extract_range, str(path), s, e) for s, e in bounds]
+    return [text for future in futures for text in future.result()]
@@ -0,0 +1,294 @@
+from __future__ import annotations
+
+import math
+import threading
+import time
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any, Callable, Literal, Optional
+
+from langchain_core.tools import tool
+
+from src.tools.constants import (
+    TOOL_CACHE_DIR,
+    PRICE_HISTORY_TTL_OPEN,
+    PRICE_HISTORY_TTL_CLOSED_MAX,
+    PRICE_HISTORY_OVERLAP_DAYS,
+    MAX_SYMBOLS_PER_CALL,
+)
+from src.tools.lazy import lazy_module
+from src.tools.market_hours import market_data_ttl
+from src.tools.metrics import get_metrics
+
+np = lazy_module("numpy")
+pd = lazy_module("pandas")
+yf = lazy_module("yfinance")
+
+
+PriceHistoryPeriod = Literal["1mo", "3mo", "6mo", "ytd", "1y", "2y", "5y"]
+
+PERIOD_DAYS = {"1mo": 31, "3mo": 92, "6mo": 183, "1y": 366, "2y": 731, "5y": 1827}
+TRADING_DAYS_PER_YEAR = 252
+MOVING_AVERAGE_WINDOWS = (50, 200)
+# Calendar days that hold the longest moving-average window in trading days, holidays included.
+SMA_LOOKBACK_DAYS = math.ceil(max(MOVING_AVERAGE_WINDOWS) * 365 / TRADING_DAYS_PER_YEAR) + 14
+MAX_CORRELATION_MATRIX_SYMBOLS = 8
+TOP_CORRELATED_PAIRS = 10
+FIELDS = ("open", "high", "low", "close", "volume")
+
+Downloader = Callable[[list[str], date], dict[str, "pd.DataFrame"]]
+
+
+def yf_download(symbols: list[str], start: date) -> dict[str, pd.DataFrame]:
+    """Daily OHLCV (split/dividend adjusted) for all ``symbols`` since ``start``, in one batch request."""
+    data = yf.download(
+        symbols,
+        start=start.isoformat(),
+        interval="1d",
+        auto_adjust=True,
+        group_by="ticker",
+        threads=True,
+        progress=False,
+    )
+    frames: dict[str, pd.DataFrame] = {}
+    if data is None or data.empty:
+        return frames
+    for symbol in symbols:
+        if isinstance(data.columns, pd.MultiIndex):
+            if symbol not in data.columns.get_level_values(0):
+                continue
+            frame = data[symbol]
+        else:
+            frame = data
+        frame = frame.rename(columns=str.lower)[list(FIELDS)].dropna(subset=["close"])
+        if not frame.empty:
+            frames[symbol] = frame
+    return frames
+
+
+def period_start(period: str, today: Optional[date] = None) -> date:
+    today = today or date.today()
+    if period == "ytd":
+        return date(today.year, 1, 1)
+    return today - timedelta(days=PERIOD_DAYS[period])
+
+
+class PriceHistoryStore:
+    """Local columnar cache of daily OHLCV history, one ``.npz`` file per symbol.
+
+    Every column is stored as its own NumPy array (dates as ``datetime64[D]``),
+    so a file loads straight into a DataFrame without parsing. ``closes``
+    only downloads what is missing: symbols never seen, history earlier than
+    what is stored, or the last few days once the data has gone stale. All
+    of it comes from a single batch download starting at the earliest date needed.
+    """
+
+    def __init__(
+        self,
+        directory: Path = TOOL_CACHE_DIR / "prices",
+        downloader: Downloader = yf_download,
+    ):
+        self.directory = Path(directory)
+        self.downloader = downloader
+        self.metrics = get_metrics("price_history")
+        self._lock = threading.Lock()
+
+    def _path(self, symbol: str) -> Path:
+        return self.directory / f"{symbol.upper()}.npz"
+
+    def load(self, symbol: str) -> Optional[tuple[pd.DataFrame, date, float]]:
+        """``(history, covered_from, updated_at)`` for a stored symbol."""
+        path = self._path(symbol)
+        if not path.exists():
+            return None
+        with np.load(path) as stored:
+            history = pd.DataFrame(
+                {field: stored[field] for field in FIELDS},
+                index=pd.DatetimeIndex(stored["dates"]),
+            )
+            covered_from = stored["covered_from"].item()
+            updated_at = float(stored["updated_at"].item())
+        return history, covered_from, updated_at
+
+    def _save(self, symbol: str, history: pd.DataFrame, covered_from: date) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self._path(symbol)
+        tmp_path = path.with_suffix(f".{threading.get_ident()}.tmp.npz")
+        np.savez(
+            tmp_path,
+            dates=history.index.values.astype("datetime64[D]"),
+            covered_from=np.datetime64(covered_from, "D"),
+            updated_at=np.float64(time.time()),
+            **{field: history[field].to_numpy(dtype=np.float64) for field in FIELDS},
+        )
+        tmp_path.replace(path)
+
+    def closes(self, symbols: list[str], start: date) -> tuple[pd.DataFrame, list[str]]:
+        """Adjusted closes since ``start``, one column per symbol, and the symbols with no data."""
+        ttl = market_data_ttl(None, PRICE_HISTORY_TTL_OPEN, PRICE_HISTORY_TTL_CLOSED_MAX)
+        now = time.time()
+        stored: dict[str, tuple[pd.DataFrame, date, float]] = {}
+        fetch_from: dict[str, date] = {}
+        for symbol in symbols:
+            entry = self.load(symbol)
+            if entry is None:
+                fetch_from[symbol] = start
+                continue
+            stored[symbol] = entry
+            history, covered_from, updated_at = entry
+            if covered_from > start:
+                fetch_from[symbol] = start
+            elif now - updated_at >= ttl:
+                last = history.index[-1].date() if len(history) else start
+                fetch_from[symbol] = max(start, last - timedelta(days=PRICE_HISTORY_OVERLAP_DAYS))
+
+        self.metrics.incr("hits", len(symbols) - len(fetch_from))
+        self.metrics.incr("misses", len(fetch_from))
+        if fetch_from:
+            with self._lock:
+                download_start = min(fetch_from.values())
+                downloaded = self.downloader(list(fetch_from), download_start)
+                self.metrics.incr("downloads")
+                for symbol in fetch_from:
+                    frame = downloaded.get(symbol)
+                    if frame is None:
+                        if symbol in stored:
+                            # Nothing new (e.g. a holiday): restart the TTL instead of re-downloading on every call.
+                            old, covered_from, _ = stored[symbol]
+                            self._save(symbol, old, covered_from)
+                            stored[symbol] = (old, covered_from, time.time())
+                            self.metrics.incr("empty_refreshes")
+                        continue
+                    frame = frame[list(FIELDS)].astype(np.float64)
+                    if symbol in stored:
+                        old, covered_from, _ = stored[symbol]
+                        frame = pd.concat([old, frame])
+                        frame = frame[~frame.index.duplicated(keep="last")].sort_index()
+                        covered_from = min(covered_from, download_start)
+                    else:
+                        covered_from = download_start
+                    self._save(symbol, frame, covered_from)
+                    stored[symbol] = (frame, covered_from, time.time())
+
+        columns = {
+            symbol: stored[symbol][0]["close"]
+            for symbol in symbols
+            if symbol in stored
+        }
+        missing = [symbol for symbol in symbols if symbol not in columns]
+        if not columns:
+            return pd.DataFrame(), missing
+        closes = pd.DataFrame(columns).sort_index()
+        return closes[closes.index >= pd.Timestamp(start)], missing
+
+
+price_history_store = PriceHistoryStore()
+
+
+def compute_metrics(closes: pd.DataFrame, history: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+    """Per-symbol return, risk and trend metrics, computed column-wise over the whole frame.
+
+    ``history`` holds the same closes extended back before the period, so the
+    moving averages are defined even for periods shorter than their window.
+    """
+    history = closes if history is None else history
+    returns = closes.pct_change(fill_method=None)
+    first = closes.bfill().iloc[0]
+    last = closes.ffill().iloc[-1]
+    daily_mean = returns.mean()
+    daily_std = returns.std()
+    volatility = daily_std * np.sqrt(TRADING_DAYS_PER_YEAR)
+    drawdown = closes / closes.cummax() - 1
+    table = pd.DataFrame({
+        "last": last,
+        "return_%": (last / first - 1) * 100,
+        "ann_vol_%": volatility * 100,
+        "sharpe": (daily_mean * TRADING_DAYS_PER_YEAR) / volatility.replace(0, np.nan),
+        "max_dd_%": drawdown.min() * 100,
+    })
+    for window in MOVING_AVERAGE_WINDOWS:
+        moving_average = history.rolling(window, min_periods=window).mean().iloc[-1]
+        table[f"vs_sma{window}_%"] = (last / moving_average - 1) * 100
+    return table.sort_values("sharpe", ascending=False)
+
+
+def correlation_summary(closes: pd.DataFrame) -> pd.DataFrame:
+    """The return correlation matrix for a few symbols, or the most correlated pairs for many."""
+    correlations = closes.pct_change(fill_method=None).corr()
+    if len(correlations) <= MAX_CORRELATION_MATRIX_SYMBOLS:
+        return correlations
+    upper = correlations.where(np.triu(np.ones(correlations.shape, dtype=bool), k=1))
+    pairs = upper.stack().sort_values(ascending=False).head(TOP_CORRELATED_PAIRS)
+    return pairs.rename("correlation").rename_axis(["symbol_a", "symbol_b"]).reset_index()
+
+
+def _markdown_table(frame: pd.DataFrame, index: bool = True) -> str:
+    def cell(value: Any) -> str:
+        if isinstance(value, (float, np.floating)):
+            return "N/A" if np.isnan(value) else f"{value:,.2f}"
+        return str(value)
+
+    header = ([frame.index.name or ""] if index else []) + [str(c) for c in frame.columns]
+    lines = ["| " + " | ".join(header) + " |", "|" + "---|" * len(header)]
+    for label, row in frame.iterrows():
+        cells = ([str(label)] if index else []) + [cell(v) for v in row]
+        lines.append("| " + " | ".join(cells) + " |")
+    return "\n".join(lines)
+
+
+@tool("analyze_price_history")
+def analyze_price_history(symbols: list[str], period: PriceHistoryPeriod = "1y") -> dict[str, Any]:
+    """Compare the price performance of one or more stocks over a period.
+    Computes, per symbol: last price, total return, annualised volatility, Sharpe ratio
+    (risk-free rate 0), maximum drawdown and distance from the 50/200-day moving averages,
+    plus the correlation of daily returns between symbols. Use this instead of
+    computing such figures yourself.
+
+    Args:
+    symbols : list[str]
+        The stock symbols to analyze (at most 20).
+    period : Literal["1mo", "3mo", "6mo", "ytd", "1y", "2y", "5y"]
+        The period to analyze, ending today (default: 1y).
+
+    Returns:
+    dict[str, Any]
+        A dictionary containing a metrics table sorted by Sharpe ratio and a correlation table, or an error message.
+    """
+    unique_symbols = list(dict.fromkeys(s.strip().upper() for s in symbols if s and s.strip()))
+    if not unique_symbols:
+        return {
+            "query": symbols,
+            "error": "Missing required argument: symbols"
+        }
+    if len(unique_symbols) > MAX_SYMBOLS_PER_CALL:
+        return {
+            "query": symbols,
+            "error": f"Too many symbols: at most {MAX_SYMBOLS_PER_CALL} per call"
+        }
+    try:
+        start = period_start(period)
+        history, missing = price_history_store.closes(unique_symbols, start - timedelta(days=SMA_LOOKBACK_DAYS))
+        closes = history[history.index >= pd.Timestamp(start)] if not history.empty else history
+        if closes.empty or len(closes) < 2:
+            return {
+                "query": unique_symbols,
+                "error": f"No price history found for: {', '.join(unique_symbols)}"
+            }
+        result: dict[str, Any] = {
+            "query": unique_symbols,
+            "period": f"{period} ({closes.index[0].date()} to {closes.index[-1].date()})",
+            "metrics": _markdown_table(compute_metrics(closes, history).rename_axis("symbol")),
+        }
+        if closes.shape[1] > 1:
+            correlations = correlation_summary(closes)
+            result["correlations"] = _markdown_table(
+                correlations, index="symbol_a" not in correlations.columns
+            )
+        if missing:
+            result["missing"] = missing
+        return result
+    except Exception as e:
+        return {
+            "query": unique_symbols,
+            "error": str(e)
+        }
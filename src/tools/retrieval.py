@@ -0,0 +1,240 @@
+import hashlib
+import math
+import re
+import threading
+from collections import Counter, OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Optional, Sequence
+
+from langchain_core.tools import tool
+
+from src.tools.metrics import get_metrics
+
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it its of on or that the this "
+    "to was were will with which what who how why when".split()
+)
+CHUNK_CHARS = 1200
+CHUNK_OVERLAP = 150
+DEFAULT_TOP_K = 5
+MAX_DOCUMENTS = 256
+
+
+def tokenize(text: str) -> list[str]:
+    return [t for t in TOKEN_PATTERN.findall(text.lower()) if t not in STOPWORDS]
+
+
+def chunk_text(text: str, chunk_chars: int = CHUNK_CHARS, overlap: int = CHUNK_OVERLAP) -> list[str]:
+    """Split text into ~``chunk_chars`` pieces, preferring paragraph and sentence breaks."""
+    text = text.strip()
+    chunks: list[str] = []
+    start = 0
+    while start < len(text):
+        end = min(start + chunk_chars, len(text))
+        if end < len(text):
+            window = text[start:end]
+            for separator in ("\n\n", "\n", ". "):
+                cut = window.rfind(separator)
+                if cut > chunk_chars // 2:
+                    end = start + cut + len(separator)
+                    break
+        chunk = text[start:end].strip()
+        if chunk:
+            chunks.append(chunk)
+        if end >= len(text):
+            break
+        start = max(end - overlap, start + 1)
+    return chunks
+
+
+@dataclass
+class Chunk:
+    chunk_id: int
+    text: str
+    metadata: dict[str, Any] = field(default_factory=dict)
+
+
+class BM25Index:
+    """Okapi BM25 over a fixed set of chunks, built in memory."""
+
+    def __init__(self, texts: Sequence[str], k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.term_freqs = [Counter(tokenize(text)) for text in texts]
+        self.lengths = [sum(tf.values()) for tf in self.term_freqs]
+        self.avg_length = (sum(self.lengths) / len(self.lengths)) if self.lengths else 0.0
+        doc_freqs: Counter[str] = Counter()
+        for tf in self.term_freqs:
+            doc_freqs.update(tf.keys())
+        n = len(texts)
+        self.idf = {
+            term: math.log(1 + (n - df + 0.5) / (df + 0.5)) for term, df in doc_freqs.items()
+        }
+
+    def search(self, query: str, top_k: int = DEFAULT_TOP_K) -> list[tuple[int, float]]:
+        terms = [t for t in set(tokenize(query)) if t in self.idf]
+        scores: list[tuple[int, float]] = []
+        for i, tf in enumerate(self.term_freqs):
+            score = 0.0
+            norm = self.k1 * (1 - self.b + self.b * self.lengths[i] / (self.avg_length or 1))
+            for term in terms:
+                freq = tf.get(term, 0)
+                if freq:
+                    score += self.idf[term] * freq * (self.k1 + 1) / (freq + norm)
+            if score > 0:
+                scores.append((i, score))
+        scores.sort(key=lambda x: x[1], reverse=True)
+        return scores[:top_k]
+
+
+@dataclass
+class Document:
+    handle: str
+    source: str
+    chunks: list[Chunk]
+    index: BM25Index
+
+    def search(self, query: str, top_k: int = DEFAULT_TOP_K) -> list[dict[str, Any]]:
+        return [
+            self.chunk_record(chunk_id, score) for chunk_id, score in self.index.search(query, top_k)
+        ]
+
+    def chunk_record(self, chunk_id: int, score: Optional[float] = None) -> dict[str, Any]:
+        chunk = self.chunks[chunk_id]
+        record: dict[str, Any] = {"chunk_id": chunk.chunk_id, **chunk.metadata, "text": chunk.text}
+        if score is not None:
+            record["score"] = round(score, 3)
+        return record
+
+
+class DocumentStore:
+    """Bounded in-process LRU of indexed documents, addressed by handle."""
+
+    def __init__(self, max_documents: int = MAX_DOCUMENTS):
+        self.max_documents = max_documents
+        self.metrics = get_metrics("retrieval")
+        self._documents: OrderedDict[str, Document] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def add(self, source: str, sections: Sequence[tuple[str, dict[str, Any]]]) -> Document:
+        """Index ``sections`` (text plus metadata, e.g. the page number) as one document."""
+        digest = hashlib.sha256(source.encode())
+        for text, _ in sections:
+            digest.update(text.encode())
+        handle = f"doc_{digest.hexdigest()[:12]}"
+        with self._lock:
+            if handle in self._documents:
+                self._documents.move_to_end(handle)
+                return self._documents[handle]
+        chunks = [
+            Chunk(chunk_id=0, text=piece, metadata=dict(metadata))
+            for text, metadata in sections
+            for piece in chunk_text(text)
+        ]
+        for i, chunk in enumerate(chunks):
+            chunk.chunk_id = i
+        document = Document(handle, source, chunks, BM25Index([c.text for c in chunks]))
+        with self._lock:
+            self._documents[handle] = document
+            while len(self._documents) > self.max_documents:
+                self._documents.popitem(last=False)
+            self.metrics.incr("documents_indexed")
+            self.metrics.incr("chunks_indexed", len(chunks))
+        return document
+
+    def get(self, handle: str) -> Optional[Document]:
+        with self._lock:
+            document = self._documents.get(handle)
+            if document is not None:
+                self._documents.move_to_end(handle)
+            return document
+
+
+document_store = DocumentStore()
+
+
+def retrieve(
+    source: str,
+    sections: Sequence[tuple[str, dict[str, Any]]],
+    query: str,
+    top_k: int = DEFAULT_TOP_K,
+) -> dict[str, Any]:
+    """Index a long document and return only its ``top_k`` chunks for ``query``."""
+    document = document_store.add(source, sections)
+    chunks = document.search(query, top_k)
+    metrics = document_store.metrics
+    metrics.incr("queries")
+    metrics.incr("chars_in", sum(len(text) for text, _ in sections))
+    metrics.incr("chars_out", sum(len(c["text"]) for c in chunks))
+    return {
+        "document_handle": document.handle,
+        "total_chunks": len(document.chunks),
+        "chunks": chunks,
+    }
+
+
+def focus(source: str, text: str, query: str, top_k: int = 3) -> dict[str, Any]:
+    """The passages of ``text`` most relevant to ``query``, in document order, plus its handle."""
+    result = retrieve(source, [(text, {})], query, top_k)
+    chunks = sorted(result["chunks"], key=lambda c: c["chunk_id"])
+    if not chunks:
+        # Nothing matched: keep the lead of the document rather than nothing.
+        document = document_store.get(result["document_handle"])
+        chunks = [document.chunk_record(i) for i in range(min(top_k, len(document.chunks)))]
+    return {
+        "content": "\n...\n".join(c["text"] for c in chunks),
+        "document_handle": result["document_handle"],
+    }
+
+
+@tool("lookup_document")
+def lookup_document(
+    document_handle: str,
+    query: Optional[str] = None,
+    chunk_ids: Optional[list[int]] = None,
+    top_k: int = DEFAULT_TOP_K,
+) -> dict[str, Any]:
+    """Look up more of a long document previously returned by another tool as a document handle.
+    Either search the document again with a new query, or fetch specific chunks (e.g. the neighbours of a useful chunk).
+
+    Args:
+    document_handle : str
+        The document handle returned by the earlier tool call.
+    query : Optional[str]
+        What to search the document for.
+    chunk_ids : Optional[list[int]]
+        Specific chunk ids to return.
+    top_k : int
+        The number of chunks to return for a query (default: 5).
+
+    Returns:
+    dict[str, Any]
+        A dictionary containing the matching chunks or an error message.
+    """
+    document = document_store.get(document_handle)
+    if document is None:
+        return {
+            "query": document_handle,
+            "error": "Unknown or expired document handle; call the original tool again."
+        }
+    if chunk_ids:
+        chunks = [
+            document.chunk_record(chunk_id)
+            for chunk_id in chunk_ids
+            if 0 <= chunk_id < len(document.chunks)
+        ]
+    elif query:
+        chunks = document.search(query, top_k)
+    else:
+        return {
+            "query": document_handle,
+            "error": "Provide either a query or chunk_ids."
+        }
+    return {
+        "document_handle": document.handle,
+        "source": document.source,
+        "total_chunks": len(document.chunks),
+        "chunks": chunks,
+    }
@@ -1,8 +1,91 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from typing import Any
 
-import yfinance as yf
 from langchain_core.tools import tool
 
+from src.tools.constants import (
+    FUNDAMENTALS_TTL_OPEN,
+    FUNDAMENTALS_TTL_CLOSED_MAX,
+    FUNDAMENTALS_STALE_MAX,
+    FUNDAMENTALS_MAX_WORKERS,
+    MAX_SYMBOLS_PER_CALL,
+)
+from src.tools.lazy import lazy_module
+from src.tools.market_hours import market_data_ttl
+from src.tools.metrics import get_metrics
+
+yf = lazy_module("yfinance")
+
+metrics = get_metrics("stock_fundamentals")
+
+
+@dataclass
+class _CachedInfo:
+    info: dict
+    fetched_at: float
+    expires_at: float
+
+
+_info_cache: dict[str, _CachedInfo] = {}
+_info_cache_lock = threading.Lock()
+_executor = ThreadPoolExecutor(max_workers=FUNDAMENTALS_MAX_WORKERS, thread_name_prefix="fundamentals")
+
+
+def _get_info(symbol: str) -> tuple[dict, str, float]:
+    """``(info, data_status, age_seconds)`` for a symbol; data_status is live, cached or stale."""
+    key = symbol.strip().upper()
+    now = time.time()
+    with _info_cache_lock:
+        entry = _info_cache.get(key)
+    if entry is not None and now < entry.expires_at:
+        metrics.incr("hits")
+        return entry.info, "cached", now - entry.fetched_at
+    metrics.incr("misses")
+    try:
+        info = yf.Ticker(symbol).info
+        if not info or "shortName" not in info:
+            raise LookupError(f"No data found for symbol: {symbol}")
+    except Exception:
+        if entry is not None and now - entry.fetched_at < FUNDAMENTALS_STALE_MAX:
+            metrics.incr("stale_served")
+            return entry.info, "stale", now - entry.fetched_at
+        raise
+    ttl = market_data_ttl(
+        info.get("exchangeTimezoneName"), FUNDAMENTALS_TTL_OPEN, FUNDAMENTALS_TTL_CLOSED_MAX
+    )
+    with _info_cache_lock:
+        _info_cache[key] = _CachedInfo(info, now, now + ttl)
+    return info, "live", 0.0
+
+
+def _freshness_note(data_status: str, age: float) -> str:
+    minutes = round(age / 60)
+    if data_status == "cached":
+        return f"_Cached data, fetched {minutes} minute(s) ago._\n\n"
+    if data_status == "stale":
+        return f"_Stale data: live data could not be fetched, showing data from {minutes} minute(s) ago._\n\n"
+    return ""
+
+
+def _symbol_report(symbol: str) -> dict[str, Any]:
+    try:
+        info, data_status, age = _get_info(symbol)
+        return {
+            "query": symbol,
+            "report": _freshness_note(data_status, age) + _format_report(info),
+            "data_status": data_status,
+        }
+    except LookupError as e:
+        return {"error": str(e)}
+    except Exception as e:
+        return {
+            "query": symbol,
+            "error": str(e)
+        }
+
 
 @tool("fetch_stock_fundamentals")
 def fetch_stock_fundamentals(symbol: str) -> dict[str, Any]:
@@ -21,21 +104,40 @@ def fetch_stock_fundamentals(symbol: str) -> dict[str, Any]:
             "query": symbol,
             "error": "Missing required argument: symbol"
         }
-    try:
-        ticker = yf.Ticker(symbol)
-        info = ticker.info
-        if not info or "shortName" not in info:
-            return {"error": f"No data found for symbol: {symbol}"}
-        report = _format_report(info)
+    return _symbol_report(symbol)
+
+
+@tool("fetch_multiple_stock_fundamentals")
+def fetch_multiple_stock_fundamentals(symbols: list[str]) -> dict[str, Any]:
+    """Fetch stock fundamentals for several symbols at once, e.g. to compare companies.
+    Prefer this over calling fetch_stock_fundamentals once per symbol.
+
+    Args:
+    symbols : list[str]
+        The stock symbols to fetch fundamentals for (at most 20).
+
+    Returns:
+    dict[str, Any]
+        A dictionary containing one report (or error message) per symbol.
+    """
+    unique_symbols = list(dict.fromkeys(s.strip() for s in symbols if s and s.strip()))
+    if not unique_symbols:
         return {
-            "query": symbol,
-            "report": report
+            "query": symbols,
+            "error": "Missing required argument: symbols"
         }
-    except Exception as e:
+    if len(unique_symbols) > MAX_SYMBOLS_PER_CALL:
         return {
-            "query": symbol,
-            "error": str(e)
+            "query": symbols,
+            "error": f"Too many symbols: at most {MAX_SYMBOLS_PER_CALL} per call"
         }
+    reports = list(_executor.map(_symbol_report, unique_symbols))
+    for symbol, report in zip(unique_symbols, reports):
+        report["query"] = symbol
+    return {
+        "query": unique_symbols,
+        "reports": reports
+    }
 
 def _format_report(info: dict) -> str:
     def safe(val, default="N/A"):
@@ -1,19 +1,36 @@
+import asyncio
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Any
-import requests
+from typing import Any, Optional, Union
 
-from bs4 import BeautifulSoup
-import yfinance as yf
 from langchain_core.tools import tool
 from pydantic import BaseModel, Field
-from tenacity import retry, stop_after_attempt, wait_exponential_jitter
 
-from src.tools.constants import HEADERS
+from src.tools.extract import extract_text, rules_for
+from src.tools.http import http_client, HttpError, HttpResponse
+from src.tools.lazy import lazy_module
+from src.tools.retrieval import focus
 
+yf = lazy_module("yfinance")
 
-REMOVALS = [
-    "Oops, something went wrong"
-]
+
+NEWS_PER_SYMBOL = 10
+MAX_SYMBOLS = 10
+# One budget for the whole tool call: listings, article downloads and their retries.
+FETCH_DEADLINE = 20.0
+MAX_ATTEMPTS = 5
+RETRY_INITIAL_WAIT = 1.0
+RETRY_MAX_WAIT = 8.0
+SUMMARY_FALLBACK_NOTE = "The full article could not be loaded in time; showing the summary."
+LOAD_FAILURE_NOTE = "The full article could not be loaded ({reason}); showing the summary."
+
+_listing_executor = ThreadPoolExecutor(max_workers=MAX_SYMBOLS, thread_name_prefix="stock-news")
+
+
+def _retryable(response: HttpResponse) -> bool:
+    return response.status_code == 429 or response.status_code >= 500
 
 
 class YFNewsArticle(BaseModel):
@@ -25,30 +42,49 @@ class YFNewsArticle(BaseModel):
     content: str = Field(description="Content of the news article.")
     
     @classmethod
-    def from_ticker_news(cls, data: dict) -> "YFNewsArticle":
-        content = data["content"]
+    def from_ticker_news(cls, data: dict, content: Optional[str] = None) -> "YFNewsArticle":
+        """Build an article from a ``Ticker.get_news`` item, using the summary when ``content`` is missing."""
+        news_content = data["content"]
         return cls(
             id=data["id"],
-            title=content["title"],
-            summary=content["summary"],
-            published_date=datetime.fromisoformat(content["pubDate"]),
-            url=content["canonicalUrl"]["url"],
-            content=cls.get_content(content["canonicalUrl"]["url"]),
+            title=news_content["title"],
+            summary=news_content["summary"],
+            published_date=datetime.fromisoformat(news_content["pubDate"]),
+            url=news_content["canonicalUrl"]["url"],
+            content=content if content is not None else news_content["summary"],
         )
-        
+
+    @staticmethod
+    async def fetch_page(url: str, deadline: float) -> HttpResponse:
+        """GET an article page, retrying with jittered backoff while the ``deadline`` (monotonic) allows."""
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                response = await http_client.aget(url)
+            except HttpError as e:
+                error = e
+            else:
+                if response.status_code == 200:
+                    return response
+                error = HttpError(
+                    f"Failed to fetch content from {url}. Status code: {response.status_code}",
+                    status_code=response.status_code,
+                )
+                if not _retryable(response):
+                    raise error
+            wait = min(RETRY_MAX_WAIT, RETRY_INITIAL_WAIT * 2 ** (attempt - 1)) + random.uniform(0, 1)
+            if attempt >= MAX_ATTEMPTS or time.monotonic() + wait >= deadline:
+                raise error
+            await asyncio.sleep(wait)
+
     @staticmethod
-    @retry(reraise=True, stop=stop_after_attempt(5), wait=wait_exponential_jitter(exp_base=2, initial=1, max=20, jitter=1))
-    def get_content(url: str) -> str:
-        response = requests.get(url, headers=HEADERS)
-        if response.status_code == 200:
-            soup = BeautifulSoup(response.content, "html.parser")
-            paras = soup.find_all("p")
-            content = "\n".join([d.get_text() for d in paras])
-            for removal in REMOVALS:
-                content = content.replace(removal, "")
-            return content.strip()
-        else:
-            raise Exception(f"Failed to fetch content from {url}. Status code: {response.status_code}")
+    def get_content(response: HttpResponse) -> str:
+        return http_client.parse(
+            response,
+            "yf_article_text:v2",
+            lambda: extract_text(response.content, rules_for(response.url)),
+        )
         
     def to_dict(self) -> dict[str, str]:
         return {
@@ -60,49 +96,149 @@ class YFNewsArticle(BaseModel):
         }
         
     
+def _failure_reason(error: BaseException) -> str:
+    status_code = getattr(error, "status_code", None)
+    return f"HTTP {status_code}" if status_code is not None else type(error).__name__
+
+
+async def _fetch_pages(urls: list[str], deadline: float) -> dict[str, HttpResponse | str]:
+    """The response for each page that loaded, or why it did not; pages still
+    loading at the ``deadline`` are left out."""
+    tasks = {asyncio.ensure_future(YFNewsArticle.fetch_page(url, deadline)): url for url in urls}
+    if not tasks:
+        return {}
+    done, pending = await asyncio.wait(tasks, timeout=max(0.0, deadline - time.monotonic()))
+    for task in pending:
+        task.cancel()
+    return {
+        tasks[task]: task.result() if task.exception() is None else _failure_reason(task.exception())
+        for task in done
+    }
+
+
+def _get_news(symbol: str) -> list[dict]:
+    return yf.Ticker(symbol).get_news(count=NEWS_PER_SYMBOL)
+
+
+def _collect_news(symbols: list[str], deadline: float) -> tuple[list[tuple[dict, list[str]]], dict[str, str]]:
+    """News items for all symbols, de-duplicated by id and URL, with the symbols each relates to."""
+    futures = {symbol: _listing_executor.submit(_get_news, symbol) for symbol in symbols}
+    items: dict[str, tuple[dict, list[str]]] = {}
+    keys: dict[str, str] = {}
+    errors: dict[str, str] = {}
+    for symbol, future in futures.items():
+        try:
+            news = future.result(timeout=max(0.0, deadline - time.monotonic()))
+        except Exception as e:
+            errors[symbol] = str(e) or type(e).__name__
+            continue
+        if not news:
+            errors[symbol] = f"No news found for symbol: {symbol}"
+        for n in news:
+            try:
+                url = n["content"]["canonicalUrl"]["url"]
+            except (KeyError, TypeError):
+                url = None
+            article_id = n.get("id")
+            key = keys.get(article_id) or keys.get(url) or article_id or url
+            if key is None:
+                continue
+            for alias in (article_id, url):
+                if alias:
+                    keys[alias] = key
+            if key in items:
+                if symbol not in items[key][1]:
+                    items[key][1].append(symbol)
+            else:
+                items[key] = (n, [symbol])
+    return list(items.values()), errors
+
+
 @tool("fetch_stock_related_news")
-def fetch_stock_related_news(symbol: str) -> dict[str, Any]:
-    """Fetch latest news regarding a stock (from Yahoo!).
-    Retrieves up to 10 news articles related to the stock symbol provided.
+def fetch_stock_related_news(symbol: Union[str, list[str]], query: Optional[str] = None) -> dict[str, Any]:
+    """Fetch latest news regarding one or more stocks (from Yahoo!).
+    Retrieves up to 10 news articles per stock symbol provided; articles covering several of the symbols are returned once.
 
     Args:
-    symbol : str
-        The stock symbol to fetch related news for.
+    symbol : Union[str, list[str]]
+        The stock symbol, or a list of stock symbols, to fetch related news for.
+    query : Optional[str]
+        Return only the passages of each article relevant to this query, plus a document handle for follow-up lookups.
 
     Returns:
     dict[str, Any]
-        A dictionary containing the stock symbol and a list of news articles or an error message.
+        A dictionary containing the stock symbol(s) and a list of news articles or an error message.
     """
-    if not symbol:
+    symbols = [symbol] if isinstance(symbol, str) else list(symbol or [])
+    symbols = list(dict.fromkeys(s.strip() for s in symbols if s and s.strip()))
+    if not symbols:
         return {
             "query": symbol,
             "error": "Missing required argument: symbol"
         }
+    if len(symbols) > MAX_SYMBOLS:
+        return {
+            "query": symbol,
+            "error": f"Too many symbols: at most {MAX_SYMBOLS} per call"
+        }
+    query_symbols = symbols[0] if isinstance(symbol, str) else symbols
     try:
-        ticker = yf.Ticker(symbol)
-        news = ticker.get_news(count=10)
+        deadline = time.monotonic() + FETCH_DEADLINE
+        news, errors = _collect_news(symbols, deadline)
         if len(news) == 0:
             return {
-                "query": symbol,
-                "error": f"No news found for symbol: {symbol}"
+                "query": query_symbols,
+                "error": "; ".join(errors.values()) or f"No news found for symbol: {', '.join(symbols)}"
             }
-        news_report = _format_report(news)
-        return {
-            "query": symbol,
+        news_report = _format_report(news, query, deadline, with_symbols=len(symbols) > 1)
+        result: dict[str, Any] = {
+            "query": query_symbols,
             "news_report": news_report
         }
+        if errors and len(symbols) > 1:
+            result["errors"] = errors
+        return result
     except Exception as e:
         return {
-            "query": symbol,
+            "query": query_symbols,
             "error": str(e)
         }
 
-def _format_report(news: list[dict]) -> list[dict[str, str]]:
+def _format_report(
+    news: list[tuple[dict, list[str]]],
+    query: Optional[str] = None,
+    deadline: Optional[float] = None,
+    with_symbols: bool = False,
+) -> list[dict[str, str]]:
+    """Fetch all article pages concurrently; those not loaded by ``deadline`` keep their summary."""
+    deadline = deadline if deadline is not None else time.monotonic() + FETCH_DEADLINE
+    urls = []
+    for n, _ in news:
+        try:
+            urls.append(n["content"]["canonicalUrl"]["url"])
+        except (KeyError, TypeError):
+            continue
+    responses = http_client.run(_fetch_pages(list(dict.fromkeys(urls)), deadline))
+
     articles: list[dict[str, str]] = []
-    for n in news:
+    for n, symbols in news:
         try:
             article = YFNewsArticle.from_ticker_news(n)
-            articles.append(article.to_dict())
+            response = responses.get(article.url)
+            if isinstance(response, HttpResponse):
+                article.content = YFNewsArticle.get_content(response)
+            record = article.to_dict()
+            if with_symbols:
+                record["Symbols"] = ", ".join(symbols)
+            if response is None:
+                record["Content Note"] = SUMMARY_FALLBACK_NOTE
+            elif isinstance(response, str):
+                record["Content Note"] = LOAD_FAILURE_NOTE.format(reason=response)
+            elif query:
+                focused = focus(article.url, article.content, query)
+                record["Content"] = focused["content"]
+                record["Document Handle"] = focused["document_handle"]
+            articles.append(record)
         except Exception as _:
             continue
-    return articles
\ No newline at end of file
+    return articles
@@ -1,25 +1,151 @@
+import asyncio
+import logging
+import threading
 import time
-import random
-from typing import Iterable, Iterator, TypeVar
-
-T = TypeVar("T")
-
-class RateLimitCounter:
-    def __init__(self, iterable: Iterable[T], limit: int = 5, wait_time: int = 3, jitter: bool = True):
-        self.iterable = iterable
-        self.limit = limit
-        self.wait_time = wait_time
-        self.jitter = jitter
-
-    def __iter__(self) -> Iterator[T]:
-        count = 0
-        for item in self.iterable:
-            yield item
-            count += 1
-            if count >= self.limit:
-                self._wait()
-                count = 0
-
-    def _wait(self):
-        wait_time = self.wait_time + random.uniform(0, 1) if self.jitter else self.wait_time
-        time.sleep(wait_time)
+from typing import Any, Optional, Protocol
+
+from src.tools.metrics import get_metrics
+
+logger = logging.getLogger(__name__)
+
+
+class Bucket(Protocol):
+    async def take(self) -> float:
+        """Consume a token if one is available; otherwise return the seconds to wait."""
+        ...
+
+
+class TokenBucket:
+    """In-process token bucket: ``burst`` tokens, refilled at ``rate`` tokens per second."""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def take_nowait(self) -> float:
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0.0
+            return (1 - self._tokens) / self.rate
+
+    async def take(self) -> float:
+        return self.take_nowait()
+
+
+# Refill and take atomically on the Redis server, using its clock so every
+# replica sees the same budget.
+_REDIS_TAKE_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+local tokens = tonumber(state[1]) or burst
+local updated = tonumber(state[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - updated) * rate)
+local wait = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+else
+    wait = (1 - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'updated', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil(burst / rate) + 60)
+return tostring(wait)
+"""
+
+
+class RedisTokenBucket:
+    """Token bucket whose state lives in Redis, shared by every process using the same key.
+
+    Falls back to an in-process bucket with the same settings if Redis is unreachable.
+    """
+
+    def __init__(self, redis_client: Any, key: str, rate: float, burst: int):
+        self.redis = redis_client
+        self.key = key
+        self.rate = rate
+        self.burst = burst
+        self._script = redis_client.register_script(_REDIS_TAKE_SCRIPT)
+        self._fallback = TokenBucket(rate, burst)
+
+    async def take(self) -> float:
+        try:
+            wait = await self._script(keys=[self.key], args=[self.rate, self.burst])
+        except Exception as e:
+            logger.warning(f"Redis rate limiter unavailable, using local bucket: {e}")
+            return self._fallback.take_nowait()
+        return float(wait.decode() if isinstance(wait, bytes) else wait)
+
+
+class RateLimiter:
+    """Per-host token-bucket rate limiting for the tool layer.
+
+    ``limits`` maps a host to ``(rate, burst)``; hosts without a limit are
+    not throttled. With a Redis client (``redis.asyncio`` or fakeredis) the
+    buckets are shared across processes, e.g. all ``langgraph-api`` replicas.
+    """
+
+    def __init__(
+        self,
+        limits: dict[str, tuple[float, int]],
+        redis_client: Optional[Any] = None,
+        key_prefix: str = "tools:ratelimit:",
+    ):
+        self.limits = dict(limits)
+        self.redis_client = redis_client
+        self.key_prefix = key_prefix
+        self.metrics = get_metrics("rate_limiter")
+        self._buckets: dict[str, Bucket] = {}
+        self._lock = threading.Lock()
+
+    def _bucket(self, host: str) -> Optional[Bucket]:
+        if host not in self.limits:
+            return None
+        with self._lock:
+            if host not in self._buckets:
+                rate, burst = self.limits[host]
+                if self.redis_client is not None:
+                    self._buckets[host] = RedisTokenBucket(
+                        self.redis_client, f"{self.key_prefix}{host}", rate, burst
+                    )
+                else:
+                    self._buckets[host] = TokenBucket(rate, burst)
+            return self._buckets[host]
+
+    async def acquire(self, host: str) -> float:
+        """Wait until a request to ``host`` is allowed; returns the time spent waiting."""
+        bucket = self._bucket(host)
+        if bucket is None:
+            return 0.0
+        start = time.monotonic()
+        throttled = False
+        while (wait := await bucket.take()) > 0:
+            throttled = True
+            await asyncio.sleep(wait)
+        waited = time.monotonic() - start if throttled else 0.0
+        self.metrics.incr("acquired")
+        self.metrics.incr(f"acquired.{host}")
+        if throttled:
+            self.metrics.incr("throttled")
+            self.metrics.incr(f"throttled.{host}")
+        self.metrics.observe("wait_seconds", waited)
+        return waited
+
+
+def create_rate_limiter(
+    limits: dict[str, tuple[float, int]], redis_uri: Optional[str] = None
+) -> RateLimiter:
+    redis_client = None
+    if redis_uri:
+        import redis.asyncio
+
+        redis_client = redis.asyncio.from_url(redis_uri)
+    return RateLimiter(limits, redis_client=redis_client)
@@ -0,0 +1,176 @@
+import logging
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
+
+from src.tools.constants import CACHE_WARMER_CONCURRENCY, CACHE_WARMER_JITTER
+from src.tools.metrics import get_metrics
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class WarmSnapshot:
+    value: Any
+    fetched_at: float
+    """Wall-clock time the refresh that produced ``value`` finished."""
+
+    @property
+    def age(self) -> float:
+        return time.time() - self.fetched_at
+
+
+@dataclass
+class WarmJob:
+    name: str
+    refresh: Callable[[], Any]
+    interval: float
+    max_age: float
+    """Snapshots older than this are not served; callers fall back to a live fetch."""
+    next_run: float = 0.0
+    running: bool = False
+    consecutive_failures: int = 0
+
+
+class CacheWarmer:
+    """Background refresher for feed-style tool results shared by every user.
+
+    Jobs are registered by the tool modules and run on a small thread pool
+    (at most ``concurrency`` refreshes at a time) on jittered schedules, so
+    that replicas and jobs do not refresh in lock-step. Tools read the latest
+    snapshot with ``get`` and only crawl on the request path when there is no
+    snapshot young enough. Nothing runs until ``start`` is called.
+
+    Metrics (``cache_warmer``): ``runs``/``failures`` per job, the
+    ``lag_seconds`` between a job's scheduled and actual start, the
+    ``age_seconds`` (staleness) of every snapshot, and a ``healthy`` gauge
+    that drops to 0 when the scheduler has died, a job keeps failing, or a
+    job's snapshot has gone past its ``max_age``.
+    """
+
+    max_consecutive_failures = 3
+
+    def __init__(self, concurrency: int = CACHE_WARMER_CONCURRENCY, jitter: float = CACHE_WARMER_JITTER):
+        self.concurrency = concurrency
+        self.jitter = jitter
+        self.metrics = get_metrics("cache_warmer")
+        self._jobs: dict[str, WarmJob] = {}
+        self._snapshots: dict[str, WarmSnapshot] = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._pool: Optional[ThreadPoolExecutor] = None
+
+    def register(self, name: str, refresh: Callable[[], Any], interval: float, max_age: Optional[float] = None) -> None:
+        with self._lock:
+            self._jobs[name] = WarmJob(name, refresh, interval, max_age or 3 * interval)
+
+    def get(self, name: str) -> Optional[WarmSnapshot]:
+        """The latest snapshot for job ``name``, or ``None`` if there is none young enough."""
+        with self._lock:
+            snapshot = self._snapshots.get(name)
+            job = self._jobs.get(name)
+        if snapshot is None or job is None:
+            self.metrics.incr("misses")
+            return None
+        if snapshot.age > job.max_age:
+            self.metrics.incr("stale")
+            return None
+        self.metrics.incr("hits")
+        return snapshot
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        with self._lock:
+            if self.running:
+                return
+            self._stopped.clear()
+            now = time.monotonic()
+            for job in self._jobs.values():
+                # Spread the first refreshes out instead of crawling everything at start-up.
+                job.next_run = now + random.uniform(0, self.jitter * job.interval)
+            self._pool = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="cache-warmer")
+            self._thread = threading.Thread(target=self._schedule, name="cache-warmer", daemon=True)
+            self._thread.start()
+        self.metrics.set("healthy", 1)
+
+    def stop(self) -> None:
+        self._stopped.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+        self.metrics.set("healthy", 0)
+
+    def _schedule(self) -> None:
+        while not self._stopped.is_set():
+            now = time.monotonic()
+            with self._lock:
+                due = [job for job in self._jobs.values() if not job.running and job.next_run <= now]
+                for job in due:
+                    job.running = True
+                    self.metrics.observe("lag_seconds", now - job.next_run)
+                    self.metrics.set(f"lag_seconds.{job.name}", now - job.next_run)
+                next_wake = min(
+                    (job.next_run for job in self._jobs.values() if not job.running), default=now + 1.0
+                )
+            for job in due:
+                self._pool.submit(self._run, job)
+            self._report_staleness()
+            self._wake.wait(max(0.0, min(next_wake - time.monotonic(), 1.0)))
+            self._wake.clear()
+
+    def _run(self, job: WarmJob) -> None:
+        start = time.monotonic()
+        try:
+            value = job.refresh()
+        except Exception as e:
+            job.consecutive_failures += 1
+            self.metrics.incr("failures")
+            self.metrics.incr(f"failures.{job.name}")
+            logger.warning(f"Cache warmer job {job.name} failed: {e}")
+        else:
+            job.consecutive_failures = 0
+            with self._lock:
+                self._snapshots[job.name] = WarmSnapshot(value, time.time())
+            self.metrics.incr("runs")
+            self.metrics.incr(f"runs.{job.name}")
+        finally:
+            self.metrics.observe(f"duration_seconds.{job.name}", time.monotonic() - start)
+            self.metrics.set(f"consecutive_failures.{job.name}", job.consecutive_failures)
+            with self._lock:
+                spread = self.jitter * job.interval
+                job.next_run = time.monotonic() + job.interval + random.uniform(-spread, spread)
+                job.running = False
+            self._wake.set()
+
+    def _report_staleness(self) -> None:
+        healthy = self.running
+        with self._lock:
+            jobs = list(self._jobs.values())
+            snapshots = dict(self._snapshots)
+        for job in jobs:
+            healthy = healthy and job.consecutive_failures < self.max_consecutive_failures
+            snapshot = snapshots.get(job.name)
+            if snapshot is None:
+                continue
+            self.metrics.set(f"age_seconds.{job.name}", snapshot.age)
+            healthy = healthy and snapshot.age <= job.max_age
+        self.metrics.set("healthy", int(healthy))
+
+    def stats(self) -> dict[str, Any]:
+        self._report_staleness()
+        return {"running": self.running, "jobs": sorted(self._jobs), **self.metrics.snapshot()}
+
+
+cache_warmer = CacheWarmer()
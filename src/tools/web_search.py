@@ -1,3 +1,268 @@
-from langchain_tavily import TavilySearch
+import asyncio
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Literal, Optional, Protocol
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
 
-web_search_tool = TavilySearch(max_results=3)
\ No newline at end of file
+from langchain_core.tools import BaseTool, tool
+from pydantic import BaseModel, Field
+
+from src.tools.http import http_client
+from src.tools.lazy import LazyTool
+from src.tools.metrics import get_metrics
+
+
+class WebSearchInput(BaseModel):
+    """The TavilySearch arguments exposed to the model, declared here so that
+    ``langchain_tavily`` (and aiohttp) are only imported on the first search."""
+    query: str = Field(description="Search query to look up")
+    include_domains: Optional[list[str]] = Field(
+        default=None,
+        description="Only return results from these domains, e.g. when the user asks for a specific website or organisation.",
+    )
+    exclude_domains: Optional[list[str]] = Field(
+        default=None,
+        description="Never return results from these domains.",
+    )
+    search_depth: Optional[Literal["basic", "advanced"]] = Field(
+        default=None,
+        description='"basic" (default) for simple queries, "advanced" for complex or specialised ones.',
+    )
+    time_range: Optional[Literal["day", "week", "month", "year"]] = Field(
+        default=None,
+        description="Only return content from this period; set it only when the user mentions a time period.",
+    )
+    topic: Optional[Literal["general", "news", "finance"]] = Field(
+        default=None,
+        description='Search category: "general" (default), "news" for current events, "finance" for financial data.',
+    )
+
+
+def _load_tavily_search() -> BaseTool:
+    from langchain_tavily import TavilySearch
+
+    return TavilySearch(max_results=3)
+
+
+web_search_tool = LazyTool(
+    _load_tavily_search,
+    name="tavily_search",
+    description=(
+        "A search engine optimized for comprehensive, accurate, and trusted results. "
+        "Useful for when you need to answer questions about current events. "
+        "Input should be a search query."
+    ),
+    args_schema=WebSearchInput,
+)
+
+
+MAX_QUERIES = 8
+SEARCH_CONCURRENCY = 4
+SEARCH_TIMEOUT = 30.0
+SEARCH_CACHE_TTL = 900
+SEARCH_CACHE_MAX_ENTRIES = 512
+TRACKING_PARAMS = re.compile(r"^(utm_.*|gclid|fbclid|mc_cid|mc_eid|ref|ref_src)$")
+
+
+class SearchBackend(Protocol):
+    async def search(self, query: str, max_results: int) -> list[dict[str, Any]]:
+        """Results as dicts with at least ``url``, ``title`` and ``content`` (and optionally ``score``)."""
+        ...
+
+
+class TavilyBackend:
+    def __init__(self, search_tool: LazyTool = web_search_tool):
+        self.search_tool = search_tool
+
+    async def search(self, query: str, max_results: int) -> list[dict[str, Any]]:
+        tavily = self.search_tool.load()
+        response = await tavily.api_wrapper.raw_results_async(
+            query=query,
+            max_results=max_results,
+            search_depth=tavily.search_depth or "basic",
+        )
+        return response.get("results", [])
+
+
+def normalize_query(query: str) -> str:
+    return " ".join(query.lower().split())
+
+
+def normalize_url(url: str) -> str:
+    """Canonical form of ``url`` for de-duplication: lower-case host without ``www.``,
+    no fragment, tracking parameters or trailing slash, and sorted query parameters."""
+    parts = urlsplit(url.strip())
+    host = (parts.hostname or "").lower().removeprefix("www.")
+    if parts.port and parts.port not in (80, 443):
+        host = f"{host}:{parts.port}"
+    params = sorted(
+        (key, value)
+        for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not TRACKING_PARAMS.match(key.lower())
+    )
+    path = parts.path.rstrip("/") or "/"
+    return urlunsplit(("https" if parts.scheme in ("http", "https") else parts.scheme, host, path, urlencode(params), ""))
+
+
+class SearchCache:
+    """In-process TTL + LRU cache of search results per normalised query."""
+
+    def __init__(self, ttl: float = SEARCH_CACHE_TTL, max_entries: int = SEARCH_CACHE_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: OrderedDict[tuple[str, int], tuple[float, list[dict[str, Any]]]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple[str, int]) -> Optional[list[dict[str, Any]]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if time.monotonic() - entry[0] > self.ttl:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key: tuple[str, int], results: list[dict[str, Any]]) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic(), results)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+class MultiSearch:
+    """Runs several queries at once against a pluggable ``SearchBackend``.
+
+    Queries are normalised (case, whitespace) and de-duplicated before they
+    are sent, results are cached per normalised query, and results found by
+    several queries are merged by normalised URL, keeping the best score.
+    """
+
+    def __init__(
+        self,
+        backend: SearchBackend,
+        cache: Optional[SearchCache] = None,
+        concurrency: int = SEARCH_CONCURRENCY,
+    ):
+        self.backend = backend
+        self.cache = cache if cache is not None else SearchCache()
+        self.concurrency = concurrency
+        self.metrics = get_metrics("web_search")
+
+    async def _search_one(
+        self, query: str, max_results: int, semaphore: asyncio.Semaphore
+    ) -> list[dict[str, Any]]:
+        key = (normalize_query(query), max_results)
+        cached = self.cache.get(key)
+        if cached is not None:
+            self.metrics.incr("hits")
+            return cached
+        self.metrics.incr("misses")
+        async with semaphore:
+            results = await self.backend.search(query, max_results)
+        self.cache.set(key, results)
+        return results
+
+    async def asearch(
+        self, queries: list[str], max_results: int
+    ) -> tuple[list[dict[str, Any]], dict[str, str]]:
+        """Merged results for all ``queries`` plus the error message of each failed query."""
+        by_key: dict[str, str] = {}
+        for query in queries:
+            if query.strip():
+                by_key.setdefault(normalize_query(query), query)
+        unique = list(by_key.values())
+        semaphore = asyncio.Semaphore(self.concurrency)
+        outcomes = await asyncio.gather(
+            *(self._search_one(query, max_results, semaphore) for query in unique),
+            return_exceptions=True,
+        )
+        merged: dict[str, dict[str, Any]] = {}
+        errors: dict[str, str] = {}
+        for query, outcome in zip(unique, outcomes):
+            if isinstance(outcome, BaseException):
+                self.metrics.incr("errors")
+                errors[query] = str(outcome) or type(outcome).__name__
+                continue
+            for result in outcome:
+                url = result.get("url")
+                if not url:
+                    continue
+                key = normalize_url(url)
+                if key in merged:
+                    self.metrics.incr("duplicates")
+                    record = merged[key]
+                    record["queries"].append(query)
+                    if (result.get("score") or 0) > (record.get("score") or 0):
+                        record.update(
+                            {k: result[k] for k in ("title", "content", "score") if k in result}
+                        )
+                else:
+                    merged[key] = {
+                        "title": result.get("title", ""),
+                        "url": url,
+                        "content": result.get("content", ""),
+                        "score": result.get("score"),
+                        "queries": [query],
+                    }
+        ranked = sorted(
+            merged.values(), key=lambda r: (len(r["queries"]), r.get("score") or 0), reverse=True
+        )
+        return ranked, errors
+
+
+multi_search = MultiSearch(TavilyBackend())
+
+
+def set_search_backend(backend: SearchBackend) -> None:
+    """Swap the backend behind ``multi_web_search`` (e.g. a local fake for benchmarks) and reset its cache."""
+    global multi_search
+    multi_search = MultiSearch(backend)
+
+
+@tool("multi_web_search")
+def multi_web_search(queries: list[str], max_results_per_query: int = 3) -> dict[str, Any]:
+    """Search the web for several queries at once.
+    Use this instead of several separate web searches when you have more than one question,
+    e.g. one query per research objective. Results found by several queries are returned once.
+
+    Args:
+    queries : list[str]
+        The search queries to run (at most 8).
+    max_results_per_query : int
+        The maximum number of results per query (default: 3).
+
+    Returns:
+    dict[str, Any]
+        A dictionary containing the de-duplicated results, each with the queries that found it, or an error message.
+    """
+    if not queries:
+        return {
+            "query": queries,
+            "error": "Missing required argument: queries"
+        }
+    if len(queries) > MAX_QUERIES:
+        return {
+            "query": queries,
+            "error": f"Too many queries: at most {MAX_QUERIES} per call"
+        }
+    try:
+        results, errors = http_client.run(
+            multi_search.asearch(queries, max(1, max_results_per_query)), timeout=SEARCH_TIMEOUT
+        )
+        result: dict[str, Any] = {
+            "query": queries,
+            "results": results
+        }
+        if errors:
+            result["errors"] = errors
+        return result
+    except Exception as e:
+        return {
+            "query": queries,
+            "error": str(e) or type(e).__name__
+        }
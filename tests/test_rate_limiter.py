@@ -0,0 +1,67 @@
+import asyncio
+
+import pytest
+
+from src.tools.utils import RateLimiter, RedisTokenBucket
+
+fakeredis = pytest.importorskip("fakeredis")
+pytest.importorskip("lupa")  # fakeredis needs it to run the Lua script
+
+HOST = "example.com"
+
+
+def redis_client(server: "fakeredis.FakeServer") -> "fakeredis.FakeAsyncRedis":
+    return fakeredis.FakeAsyncRedis(server=server)
+
+
+def test_burst_then_refill():
+    async def run():
+        bucket = RedisTokenBucket(redis_client(fakeredis.FakeServer()), "tools:ratelimit:test", rate=10, burst=3)
+        burst = [await bucket.take() for _ in range(3)]
+        wait = await bucket.take()
+        await asyncio.sleep(0.25)
+        refilled = await bucket.take()
+        return burst, wait, refilled
+
+    burst, wait, refilled = asyncio.run(run())
+    assert burst == [0.0, 0.0, 0.0]
+    assert 0 < wait <= 0.1
+    assert refilled == 0.0
+
+
+def test_limiters_share_one_bucket():
+    async def run():
+        server = fakeredis.FakeServer()
+        first = RateLimiter({HOST: (20, 2)}, redis_client=redis_client(server))
+        second = RateLimiter({HOST: (20, 2)}, redis_client=redis_client(server))
+        waits = [await first.acquire(HOST), await first.acquire(HOST)]
+        waits.append(await second.acquire(HOST))
+        return waits
+
+    first_wait, second_wait, shared_wait = asyncio.run(run())
+    assert first_wait == second_wait == 0.0
+    # The second limiter draws from the bucket the first one emptied.
+    assert shared_wait > 0
+
+
+def test_hosts_without_limit_are_not_throttled():
+    async def run():
+        limiter = RateLimiter({HOST: (1, 1)}, redis_client=redis_client(fakeredis.FakeServer()))
+        return [await limiter.acquire("other.example.com") for _ in range(5)]
+
+    assert asyncio.run(run()) == [0.0] * 5
+
+
+def test_falls_back_to_local_bucket_when_redis_fails(caplog):
+    async def run():
+        server = fakeredis.FakeServer()
+        server.connected = False
+        limiter = RateLimiter({HOST: (20, 2)}, redis_client=redis_client(server))
+        return [await limiter.acquire(HOST) for _ in range(3)]
+
+    with caplog.at_level("WARNING"):
+        first_wait, second_wait, third_wait = asyncio.run(run())
+    assert "using local bucket" in caplog.text
+    assert first_wait == second_wait == 0.0
+    # The local bucket still enforces the limit.
+    assert third_wait > 0
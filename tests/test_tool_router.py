@@ -0,0 +1,57 @@
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+
+from src.agent.config import Configuration
+from src.agent.tool_router import ALWAYS_AVAILABLE, DOCUMENT_TOOL, TOOL_GROUPS, route_tools, tool_router
+from src.tools import agent_tool_kit
+
+
+def names(tools) -> set[str]:
+    return {tool.name for tool in tools}
+
+
+def group_tools(*groups: str) -> set[str]:
+    return {name for group in groups for name in TOOL_GROUPS[group][0]}
+
+
+def test_unmatched_prompt_falls_back_to_the_full_kit():
+    assert tool_router.select("Who wrote Pride and Prejudice?") == agent_tool_kit
+    assert tool_router.select("How is NVDA doing?") == agent_tool_kit
+
+
+def test_words_sharing_a_prefix_with_a_keyword_do_not_match():
+    assert tool_router.matched_groups("I shared the marketing plan with the team") == []
+    assert tool_router.select("I shared the marketing plan with the team") == agent_tool_kit
+
+
+def test_generic_time_words_do_not_match():
+    text = "What is the current weather today? Give me the latest forecast."
+    assert tool_router.matched_groups(text) == []
+    assert tool_router.select(text) == agent_tool_kit
+
+
+def test_keywords_select_their_group():
+    markets = names(tool_router.select("Compare the volatility of AAPL and MSFT stocks"))
+    assert markets == set(ALWAYS_AVAILABLE) | group_tools("markets")
+
+    papers = names(tool_router.select("Summarise this week's arXiv papers on diffusion"))
+    assert papers == set(ALWAYS_AVAILABLE) | group_tools("papers")
+
+
+def test_follow_up_keeps_the_groups_already_used():
+    messages = [
+        HumanMessage(content="How are Apple shares doing?"),
+        AIMessage(content="", tool_calls=[{"name": "fetch_stock_fundamentals", "args": {"symbol": "AAPL"}, "id": "1"}]),
+        ToolMessage(content="...", tool_call_id="1"),
+        HumanMessage(content="And MSFT?"),
+    ]
+    assert group_tools("markets") <= names(tool_router.select("And MSFT?", messages))
+
+
+def test_document_handle_adds_lookup_document():
+    messages = [ToolMessage(content="Document handle: doc_0123456789ab", tool_call_id="1")]
+    assert DOCUMENT_TOOL in names(tool_router.select("What does section 3 say?", messages))
+
+
+def test_no_text_or_routing_off_binds_the_full_kit():
+    assert tool_router.select("") == agent_tool_kit
+    assert route_tools(Configuration(tool_routing="off"), "Who wrote Pride and Prejudice?") == agent_tool_kit